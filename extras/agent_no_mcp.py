@@ -9,6 +9,7 @@ from semantic_kernel.contents import ChatHistory
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatPromptExecutionSettings
 from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
 import asyncio
+from agent_timing import PhaseTimer
 
 # Configuration for the mocked REST API
 REST_API_BASE_URL = "http://127.0.0.1:5000"
@@ -68,6 +69,8 @@ class MockRestApiPlugin:
         return json.dumps(response.json())
 
 async def main(prompt: str):
+    # Phase timings for the benchmark runner in demo.py (AGENT_TIMINGS=1)
+    timer = PhaseTimer()
     kernel = sk.Kernel()
 
     azure_openai_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -122,10 +125,13 @@ async def main(prompt: str):
     )
 
 
-    result = await kernel.invoke(chat_function, arguments=arguments)
+    timer.instrument(kernel)
+    with timer.phase("invoke"):
+        result = await kernel.invoke(chat_function, arguments=arguments)
     # read only the text part of the result
     chunk = result.get_inner_content()
     print(f"Response: {result}")
+    timer.report()
 
     
 
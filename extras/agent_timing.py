@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+# Per-phase timings for the agent scripts, collected by the benchmark runner in demo.py
+#
+# With AGENT_TIMINGS=1 an agent prints one "AGENT_TIMINGS {...}" line to stderr
+# before it exits: the wall-clock time main() started (the runner subtracts its
+# spawn time to get process start-up and imports), the MCP handshake, time spent
+# in tool calls and the remaining model time of the turn.
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+ENABLED = os.getenv("AGENT_TIMINGS", "0").lower() in ("1", "true", "yes")
+PREFIX = "AGENT_TIMINGS "
+
+
+class PhaseTimer:
+    """Accumulates named phase durations for one agent run."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.phases = {}
+        self.tool_calls = 0
+
+    def add(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def instrument(self, kernel):
+        """Time every tool call the model makes through `kernel`."""
+        async def time_tool_call(context, next):
+            start = time.perf_counter()
+            try:
+                await next(context)
+            finally:
+                self.add("tools", time.perf_counter() - start)
+                self.tool_calls += 1
+
+        kernel.add_filter("auto_function_invocation", time_tool_call)
+
+    def report(self):
+        if not ENABLED:
+            return
+        phases = dict(self.phases)
+        # The model's share of the turn is whatever the tool calls did not take
+        if "invoke" in phases:
+            phases["llm"] = max(0.0, phases.pop("invoke") - phases.get("tools", 0.0))
+        record = {"started_at": self.started_at, "tool_calls": self.tool_calls,
+                  **{name: round(seconds, 4) for name, seconds in phases.items()}}
+        print(PREFIX + json.dumps(record), file=sys.stderr, flush=True)
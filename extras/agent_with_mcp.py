@@ -2,12 +2,15 @@ import semantic_kernel as sk
 import semantic_kernel.connectors.ai.open_ai as sk_oai
 import os
 import sys
-from semantic_kernel.connectors.mcp import MCPStdioPlugin
 from semantic_kernel.functions import KernelArguments
 from semantic_kernel.contents import ChatHistory
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatPromptExecutionSettings
 from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
 import asyncio
+from agent_timing import PhaseTimer
+
+import src_path  # puts src/ on sys.path
+from mcp_connect import connect_mcp_plugin
 
 # Configuration for the mocked REST API
 REST_API_BASE_URL = "http://127.0.0.1:5000"
@@ -16,6 +19,8 @@ from dotenv import load_dotenv
 load_dotenv()
 
 async def main(prompt: str):
+    # Phase timings for the benchmark runner in demo.py (AGENT_TIMINGS=1)
+    timer = PhaseTimer()
     kernel = sk.Kernel()
 
     azure_openai_endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
@@ -45,48 +50,51 @@ async def main(prompt: str):
     # Find the correct path to the MCP server script
     mcp_server_path = "src/mcp_server.py"
 
-    mcp_plugin = MCPStdioPlugin(
-            name="APIMCPServer",
-            command="python",
-            args=[mcp_server_path]  # Use absolute path to our MCP server script
-        )
-        
-        # It's important to start the plugin process
-    await mcp_plugin.__aenter__()
+    # Attach to a pooled server when MCP_SERVER_URLS is set (src/mcp_server_pool.py),
+    # otherwise start our own over stdio
+    mcp_connection = connect_mcp_plugin("APIMCPServer", mcp_server_path)
+    with timer.phase("mcp_handshake"):
+        mcp_plugin = await mcp_connection.__aenter__()
 
-    kernel.add_plugin(mcp_plugin, "APIMCPServer")
+    try:
+        kernel.add_plugin(mcp_plugin, "APIMCPServer")
 
-    # Create a semantic function to answer questions using the plugin
-    chat_function = kernel.add_function(
-        plugin_name="chat",
-        function_name="respond",
-        prompt="""
+        # Create a semantic function to answer questions using the plugin
+        chat_function = kernel.add_function(
+            plugin_name="chat",
+            function_name="respond",
+            prompt="""
         You are a helpful assistant that can answer questions about products and orders.
         Use the available tools to get information. If you need to create an order, ask for confirmation.
         
         User: {{$input}}
         Assistant: """
-    )
+        )
 
-    history = ChatHistory()
-    # Add the user message to history
-    history.add_user_message(prompt)
+        history = ChatHistory()
+        # Add the user message to history
+        history.add_user_message(prompt)
 
-    # Create the completion service request settings
-    settings = OpenAIChatPromptExecutionSettings(function_choice_behavior=FunctionChoiceBehavior.Auto())
+        # Create the completion service request settings
+        settings = OpenAIChatPromptExecutionSettings(function_choice_behavior=FunctionChoiceBehavior.Auto())
 
-    # Prepare arguments with history and settings
-    arguments = KernelArguments(
-        settings=settings,
-        chat_history=history,
-        input=prompt,
-    )
+        # Prepare arguments with history and settings
+        arguments = KernelArguments(
+            settings=settings,
+            input=prompt,
+        )
 
 
-    result = await kernel.invoke(chat_function, arguments=arguments)
-    # read only the text part of the result
-    
-    print(f"Response: {result}")
+        timer.instrument(kernel)
+        with timer.phase("invoke"):
+            result = await kernel.invoke(chat_function, arguments=arguments)
+        # read only the text part of the result
+
+        print(f"Response: {result}")
+    finally:
+        # Disconnect from this task; left to garbage collection the plugin fails on exit
+        await mcp_connection.__aexit__(None, None, None)
+        timer.report()
 
     
 
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# Benchmark bulk_insert (COPY and batched VALUES) against one execute_query per row.
+#
+# Loads the same customerdata-shaped rows into a scratch table through each
+# path of pgsql_mcp_server.py and reports rows/s. Needs the same DB_* settings
+# as the server; the scratch table is dropped afterwards.
+#
+# Usage: python extras/benchmark_bulk_insert.py [--rows 20000] [--row-by-row 2000]
+
+import argparse
+import time
+
+import pgsql_mcp_server as server
+
+TABLE = "bulk_insert_benchmark"
+COLUMNS = ["customer_id", "card_blocked", "payment_due", "card_type", "credit_card_no"]
+CARD_TYPES = ("visa", "mastercard", "amex")
+
+
+def make_rows(count, offset=0):
+    return [
+        [offset + i, i % 7 == 0, round(i % 1000 * 1.37, 2), CARD_TYPES[i % 3], str(4000000000000000 + i)]
+        for i in range(count)
+    ]
+
+
+def reset_table():
+    server.execute_query(f"DROP TABLE IF EXISTS {TABLE}")
+    server.execute_query(f"CREATE TABLE {TABLE} (customer_id integer PRIMARY KEY, card_blocked boolean, "
+                         "payment_due numeric(10,2), card_type text, credit_card_no text)")
+
+
+def row_by_row(rows):
+    insert = f"INSERT INTO {TABLE} ({', '.join(COLUMNS)}) VALUES (%s, %s, %s, %s, %s)"
+    start = time.perf_counter()
+    for row in rows:
+        server.execute_query(insert, row)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk_insert against row-by-row inserts.")
+    parser.add_argument("--rows", type=int, default=20000, help="rows loaded by each bulk method")
+    parser.add_argument("--row-by-row", type=int, default=2000, help="rows inserted one call at a time")
+    args = parser.parse_args()
+
+    print(f"{'path':<22} {'rows':>7} {'seconds':>8} {'rows/s':>9}")
+    reset_table()
+    elapsed = row_by_row(make_rows(args.row_by_row))
+    baseline = args.row_by_row / elapsed
+    print(f"{'execute_query per row':<22} {args.row_by_row:>7} {elapsed:>8.2f} {baseline:>9.0f}")
+    for method in ("values", "copy"):
+        reset_table()
+        result = server.bulk_insert(TABLE, rows=make_rows(args.rows), columns=COLUMNS, method=method)
+        rate = result["rows"] / result["seconds"]
+        print(f"{'bulk_insert ' + method:<22} {result['rows']:>7} {result['seconds']:>8.2f} {rate:>9.0f}"
+              f"  ({rate / baseline:.0f}x)")
+    server.execute_query(f"DROP TABLE {TABLE}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# Benchmark pgsql_mcp_server.py in sync vs async MCP_SERVER_MODE, and check cancellation.
+#
+# Drives the server over stdio: a batch of slow queries (pg_sleep) is sent
+# together with one quick query, as an agent issuing parallel tool calls would.
+# In sync mode everything queues behind the slow queries; in async mode they
+# overlap up to DB_THREADS. The cancellation check starts a long query, cancels
+# the call from the client and looks for the query in pg_stat_activity.
+# Needs the same DB_* settings as the server.
+#
+# Usage: python extras/benchmark_pg_async.py [--slow 8] [--sleep 0.5]
+
+import argparse
+import asyncio
+import os
+import pathlib
+import sys
+import time
+
+import mcp.types as types
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+EXTRAS_DIR = pathlib.Path(__file__).parent
+LONG_QUERY = "SELECT pg_sleep(20) AS cancel_check"
+ACTIVE_QUERY = ("SELECT count(*) AS running FROM pg_stat_activity "
+                "WHERE query LIKE '%%pg_sleep(20) AS cancel_check%%' AND pid <> pg_backend_pid()")
+
+
+async def timed_call(session, query):
+    start = time.perf_counter()
+    result = await session.call_tool("execute_query", {"query": query})
+    if result.isError:
+        raise RuntimeError(result.content)
+    return time.perf_counter() - start
+
+
+async def running_long_queries(session):
+    result = await session.call_tool("execute_query", {"query": ACTIVE_QUERY, "format": "columnar"})
+    return int(result.content[0].text.split("[[", 1)[1].split("]", 1)[0])
+
+
+async def check_cancel(session):
+    # Send the call, then a notifications/cancelled for its request id, as a client aborting would
+    request_id = session._request_id
+    call = asyncio.create_task(session.call_tool("execute_query", {"query": LONG_QUERY}))
+    await asyncio.sleep(1.0)
+    running_before = await running_long_queries(session)
+    await session.send_notification(types.ClientNotification(types.CancelledNotification(
+        params=types.CancelledNotificationParams(requestId=request_id, reason="benchmark"))))
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(call, 30)
+    except Exception:
+        pass
+    answered = time.perf_counter() - start
+    return running_before, await running_long_queries(session), answered
+
+
+async def bench_mode(mode, slow, sleep):
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(EXTRAS_DIR / "pgsql_mcp_server.py")],
+        env={**os.environ, "MCP_SERVER_MODE": mode},
+        cwd=str(EXTRAS_DIR),
+    )
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            await timed_call(session, "SELECT 1")  # open the pool
+            start = time.perf_counter()
+            quick = asyncio.create_task(timed_call(session, "SELECT 1"))
+            slow_calls = [timed_call(session, f"SELECT pg_sleep({sleep})") for _ in range(slow)]
+            await asyncio.gather(quick, *slow_calls)
+            batch = time.perf_counter() - start
+            cancel = await check_cancel(session) if mode == "async" else None
+    return {"quick_ms": quick.result() * 1000, "batch_ms": batch * 1000, "cancel": cancel}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark pgsql_mcp_server.py in sync vs async mode and check cancellation.")
+    parser.add_argument("--slow", type=int, default=8, help="slow queries sent together with the quick one")
+    parser.add_argument("--sleep", type=float, default=0.5, help="seconds each slow query sleeps")
+    args = parser.parse_args()
+
+    report = {mode: await bench_mode(mode, args.slow, args.sleep) for mode in ("sync", "async")}
+
+    print(f"{'mode':<6} {'quick call ms':>14} {'whole batch ms':>15}")
+    for mode, row in report.items():
+        print(f"{mode:<6} {row['quick_ms']:>14.1f} {row['batch_ms']:>15.1f}")
+    before, after, answered = report["async"]["cancel"]
+    print(f"cancel: {before} long query running before, {after} after; "
+          f"call answered {answered * 1000:.0f} ms after the cancel")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# Benchmark dict-per-row vs columnar results of execute_query in pgsql_mcp_server.py.
+#
+# For a tall query (many rows of customerdata) and a wide one (many numeric and
+# date columns), times the tool body (fetch + conversion) and the encoding
+# FastMCP applies to its return value, and reports the size of the text the
+# model would receive.
+# Needs the same DB_* settings as the server.
+#
+# Usage: python extras/benchmark_result_format.py [--rows 20000] [--rounds 3]
+
+import argparse
+import time
+
+from mcp.server.fastmcp.utilities.func_metadata import _convert_to_content
+
+from pg_columnar import FORMATS, cursor_factory, format_rows
+from pgsql_mcp_server import connect_db
+
+
+def wide_query(columns):
+    # Mix of the types that need conversion (numeric, date) and ones that do not
+    select = ", ".join(
+        f"(i * {n} %% 1000)::numeric(10,2) AS amount_{n}" if n % 3 == 0 else
+        f"DATE '2024-01-01' + (i + {n}) %% 365 AS day_{n}" if n % 3 == 1 else
+        f"i * {n} AS count_{n}"
+        for n in range(columns)
+    )
+    return f"SELECT {select} FROM generate_series(1, %s) AS i"
+
+
+def run(conn, query, params, layout):
+    start = time.perf_counter()
+    with conn.cursor(cursor_factory=cursor_factory(layout)) as cursor:
+        cursor.execute(query, params)
+        result = format_rows(cursor.description, cursor.fetchall(), layout)
+    fetched = time.perf_counter()
+    content = _convert_to_content(result)
+    done = time.perf_counter()
+    conn.rollback()
+    return fetched - start, done - fetched, sum(len(block.text) for block in content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark execute_query result formats.")
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--wide-columns", type=int, default=30)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [
+        (f"tall: customerdata x {args.rows}", "SELECT * FROM customerdata LIMIT %s", (args.rows,)),
+        (f"wide: {args.wide_columns} columns x {args.rows // 4}", wide_query(args.wide_columns), (args.rows // 4,)),
+    ]
+    conn = connect_db()
+    print(f"{'case':<30} {'format':<9} {'tool ms':>9} {'FastMCP ms':>10} {'total ms':>9} {'KiB':>8} {'size':>6}")
+    for name, query, params in cases:
+        baseline_size = None
+        for layout in FORMATS:
+            timings = [run(conn, query, params, layout) for _ in range(args.rounds)]
+            fetch, encode, size = min(timings, key=lambda t: t[0] + t[1])
+            baseline_size = baseline_size or size
+            print(f"{name:<30} {layout:<9} {fetch * 1000:>9.1f} {encode * 1000:>10.1f} "
+                  f"{(fetch + encode) * 1000:>9.1f} {size / 1024:>8.0f} {size / baseline_size:>5.0%}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,93 +1,434 @@
+#!/usr/bin/env python3
+# Runs the agents against the mock REST API, as a demo or as a benchmark.
+#
+# Without options each demo prompt goes through agent_no_mcp.py and then
+# agent_with_mcp.py, printing their output. As a benchmark, prompts come from a
+# scenario file and run with the given concurrency and repetitions. Per-phase
+# timings are reported for each run: process spawn, MCP handshake, LLM and tool
+# calls. --report writes JSON or CSV, and --fake-llm swaps Azure OpenAI for
+# fake_llm_server.py so the benchmark runs offline.
+#
+# Usage: python extras/demo.py [--fake-llm] [--scenarios FILE] [--repeat 3] [--concurrency 4]
+#                              [--agents no_mcp with_mcp] [--report results.json|results.csv] [--quiet]
+
+import argparse
 import asyncio
-import subprocess
+import anyio
+import collections
+import csv
+import json
+import sys
+import tempfile
 import time
 import os
+import requests
 from dotenv import load_dotenv
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+from agent_timing import PREFIX as AGENT_TIMINGS_PREFIX
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Ensure Azure OpenAI credentials are set
+# Azure OpenAI credentials for the agents (checked in main(); not needed with --fake-llm)
 AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
 AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 AZURE_OPENAI_DEPLOYMENT_NAME = os.getenv("AZURE_OPENAI_DEPLOYMENT_NAME")
 
-if not all([AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, AZURE_OPENAI_DEPLOYMENT_NAME]):
-    print("Error: AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, and AZURE_OPENAI_DEPLOYMENT_NAME environment variables must be set.")
-    print("Please set them in your .env file or environment variables.")
-    exit(1)
-
-# Paths to the scripts
+# Paths to the scripts (relative to the repository root, where the demo is run from)
 REST_API_SCRIPT = "src/mock_rest_api.py"
-MCP_SERVER_SCRIPT = "src/mcp_rest_server.py"
-AGENT_NO_MCP_SCRIPT = "src/agent_no_mcp.py"
-AGENT_WITH_MCP_SCRIPT = "src/agent_with_mcp.py"
+MCP_SERVER_SCRIPT = "src/mcp_server.py"
+AGENT_NO_MCP_SCRIPT = "extras/agent_no_mcp.py"
+AGENT_WITH_MCP_SCRIPT = "extras/agent_with_mcp.py"
+FAKE_LLM_SCRIPT = "extras/fake_llm_server.py"
+MCP_POOL_SCRIPT = "src/mcp_server_pool.py"
+DEFAULT_SCENARIOS = "extras/agent_scenarios.json"
+
+AGENTS = {"no_mcp": AGENT_NO_MCP_SCRIPT, "with_mcp": AGENT_WITH_MCP_SCRIPT}
+
+# Phases of one agent run; "other" is the rest of the wall time (kernel setup, exit)
+PHASES = ("spawn", "mcp_handshake", "llm", "tools", "other")
+RUN_FIELDS = ("agent", "scenario", "repetition", "ok", "returncode", "total", *PHASES, "tool_calls")
+
+# Local stand-in for Azure OpenAI used by --fake-llm
+FAKE_LLM_PORT = int(os.getenv("FAKE_LLM_PORT", "5100"))
+FAKE_LLM_URL = f"https://127.0.0.1:{FAKE_LLM_PORT}"
+
+# Shared MCP servers used by --mcp-pool (see mcp_server_pool.py)
+MCP_POOL_BASE_PORT = int(os.getenv("MCP_POOL_BASE_PORT", "8100"))
+MCP_POOL_STATUS_URL = f"http://127.0.0.1:{os.getenv('MCP_POOL_STATUS_PORT', '8099')}"
+
+# Readiness probing: services count as started once they answer, not after a fixed sleep
+REST_API_BASE_URL = os.getenv("REST_API_BASE_URL", "http://127.0.0.1:5000")
+READY_TIMEOUT = float(os.getenv("DEMO_READY_TIMEOUT", "30"))       # seconds per service
+PROBE_INITIAL_DELAY = 0.05                                          # doubled after each failed probe
+PROBE_MAX_DELAY = 1.0
+STDERR_LINES = 40                                                   # child stderr kept for error reports
+
+class ServiceNotReady(Exception):
+    """A service exited or did not answer its readiness probe in time."""
+
+    def __init__(self, name, reason, stderr=""):
+        self.name = name
+        self.stderr = stderr
+        super().__init__(f"{name} {reason}")
+
+# Running stderr readers (asyncio only keeps weak references to tasks)
+_background = set()
+
+async def capture_stderr(stream, lines):
+    # Drain the pipe so a chatty child never blocks, keeping the last lines for error reports
+    async for line in stream:
+        lines.append(line.decode(errors="replace").rstrip())
+
+def healthy(url, verify=True):
+    try:
+        return requests.get(url, timeout=0.5, verify=verify).ok
+    except OSError:
+        # Connection refused, or the fake LLM's certificate is not written yet
+        return False
+
+async def start_http_service(name, args, health_url, cwd=None, env=None, verify=True):
+    """Start a server process and poll its health URL with backoff; returns (process, seconds to ready)."""
+    start = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, *args,
+        cwd=cwd,
+        env={**os.environ, **(env or {})},
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stderr = collections.deque(maxlen=STDERR_LINES)
+    reader = asyncio.create_task(capture_stderr(process.stderr, stderr))
+    _background.add(reader)
+    reader.add_done_callback(_background.discard)
+    delay = PROBE_INITIAL_DELAY
+    try:
+        while not await asyncio.to_thread(healthy, health_url, verify):
+            if process.returncode is not None:
+                await reader
+                raise ServiceNotReady(name, f"exited with code {process.returncode}", "\n".join(stderr))
+            if time.perf_counter() - start > READY_TIMEOUT:
+                raise ServiceNotReady(name, f"not healthy after {READY_TIMEOUT:.0f}s", "\n".join(stderr))
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, PROBE_MAX_DELAY)
+    except BaseException:
+        await stop_process(process)
+        raise
+    return process, time.perf_counter() - start
+
+def stock_needed(scenarios, runs):
+    """Stock the create_order scenarios take over `runs` runs each, per product id."""
+    needed = collections.Counter()
+    for scenario in scenarios:
+        if scenario.get("tool") == "create_order":
+            arguments = scenario["arguments"]
+            needed[str(arguments["product_id"])] += int(arguments["quantity"]) * runs
+    return needed
+
+def start_rest_api(restock=None):
+    port = REST_API_BASE_URL.rsplit(":", 1)[-1]
+    # Top up the stock the orders will take, so the last repetition places its order like the first
+    code = "from mock_rest_api import app, store\n"
+    for product_id, quantity in (restock or {}).items():
+        code += (f"product = store.get_product({product_id!r})\n"
+                 f"if product: store.set_stock({product_id!r}, product['stock'] + {quantity})\n")
+    # Run the app without the debug reloader so terminate() really stops it
+    code += f"app.run(port={port}, threaded=True)"
+    return start_http_service("Mock REST API", ["-c", code], f"{REST_API_BASE_URL}/health",
+                              cwd=os.path.dirname(REST_API_SCRIPT) or ".")
+
+def start_fake_llm(tls_dir, scenarios):
+    env = {"FAKE_LLM_PORT": str(FAKE_LLM_PORT), "FAKE_LLM_TLS_DIR": tls_dir, "FAKE_LLM_SCENARIOS": scenarios}
+    return start_http_service("Fake LLM", [FAKE_LLM_SCRIPT], f"{FAKE_LLM_URL}/health", env=env,
+                              verify=os.path.join(tls_dir, "cert.pem"))
+
+def start_mcp_pool(workers):
+    # /ready answers 200 once every worker has passed an MCP handshake
+    args = [MCP_POOL_SCRIPT, "--workers", str(workers), "--base-port", str(MCP_POOL_BASE_PORT)]
+    return start_http_service("MCP server pool", args, f"{MCP_POOL_STATUS_URL}/ready")
+
+def mcp_pool_urls(workers):
+    return ",".join(f"http://127.0.0.1:{MCP_POOL_BASE_PORT + i}/mcp" for i in range(workers))
+
+def fake_llm_env(tls_dir):
+    # What the agents need to talk to the fake LLM instead of Azure OpenAI
+    return {
+        "AZURE_OPENAI_ENDPOINT": FAKE_LLM_URL,
+        "AZURE_OPENAI_API_KEY": "fake-key",
+        "AZURE_OPENAI_DEPLOYMENT_NAME": "fake-llm",
+        "MODEL_DEPLOYMENT_NAME": "fake-llm",
+        "SSL_CERT_FILE": os.path.join(tls_dir, "cert.pem"),
+    }
 
-async def run_agent_interaction(agent_script: str, prompt: str):
-    print(f"\n--- Running {agent_script} with prompt: '{prompt}' ---")
-    env = os.environ.copy()
-    env["AZURE_OPENAI_ENDPOINT"] = AZURE_OPENAI_ENDPOINT
-    env["AZURE_OPENAI_API_KEY"] = AZURE_OPENAI_API_KEY
-    env["AZURE_OPENAI_DEPLOYMENT_NAME"] = AZURE_OPENAI_DEPLOYMENT_NAME
+def fake_llm_stats(tls_dir):
+    return requests.get(f"{FAKE_LLM_URL}/stats", timeout=5, verify=os.path.join(tls_dir, "cert.pem")).json()
 
+async def run_mcp_server(ready, stop):
+    """Spawn the MCP server over stdio, complete the initialize handshake and keep the session until `stop`.
+
+    `ready` receives (tools, seconds to ready), or ServiceNotReady with the server's stderr.
+    """
+    start = time.perf_counter()
+    params = StdioServerParameters(command=sys.executable, args=[MCP_SERVER_SCRIPT], env=dict(os.environ))
+    # The server's stderr goes to a file so it can be shown if the handshake fails
+    with tempfile.TemporaryFile(mode="w+") as errlog:
+        try:
+            async with stdio_client(params, errlog=errlog) as (read, write):
+                async with ClientSession(read, write) as session:
+                    with anyio.fail_after(READY_TIMEOUT):
+                        await session.initialize()
+                        tools = await session.list_tools()
+                    ready.set_result((tools.tools, time.perf_counter() - start))
+                    await stop.wait()
+        except Exception as e:
+            if ready.done():
+                raise
+            errlog.seek(0)
+            reason = f"did not complete the MCP handshake ({str(e) or type(e).__name__})"
+            ready.set_exception(ServiceNotReady("MCP server", reason, errlog.read().strip()[-4000:]))
+
+async def stop_process(process):
+    if process.returncode is None:
+        process.terminate()
+        await process.wait()
+
+class Services:
+    """The running demo services, started together by start()."""
+
+    def __init__(self, fake_llm_tls_dir=None, scenarios=DEFAULT_SCENARIOS, mcp_pool=0, restock=None):
+        self.fake_llm_tls_dir = fake_llm_tls_dir
+        self.scenarios = scenarios
+        self.mcp_pool = mcp_pool
+        self.restock = restock
+        self.processes = []
+        self._mcp_stop = asyncio.Event()
+        self._mcp_ready = None
+        self._mcp_task = None
+
+    async def start(self):
+        # All start in parallel; the first failure stops the others instead of waiting them out
+        mcp_ready = self._mcp_ready = asyncio.get_running_loop().create_future()
+        self._mcp_task = asyncio.create_task(run_mcp_server(mcp_ready, self._mcp_stop))
+        http = {"Mock REST API": asyncio.create_task(start_rest_api(self.restock))}
+        if self.fake_llm_tls_dir:
+            http["Fake LLM"] = asyncio.create_task(start_fake_llm(self.fake_llm_tls_dir, self.scenarios))
+        if self.mcp_pool:
+            http["MCP server pool"] = asyncio.create_task(start_mcp_pool(self.mcp_pool))
+        done, pending = await asyncio.wait({*http.values(), mcp_ready}, return_when=asyncio.FIRST_EXCEPTION)
+        failed = [future for future in done if future.exception()]
+        if failed:
+            for task in http.values():
+                task.cancel()
+            await asyncio.gather(*http.values(), return_exceptions=True)
+            self.processes = [task.result()[0] for task in http.values()
+                              if not task.cancelled() and not task.exception()]
+            await self.stop()
+            raise failed[0].exception()
+        for name, task in http.items():
+            process, seconds = task.result()
+            self.processes.append(process)
+            print(f"{name} ready in {seconds:.2f}s")
+        tools, mcp_seconds = mcp_ready.result()
+        print(f"MCP server ready in {mcp_seconds:.2f}s ({len(tools)} tools)")
+
+    async def stop(self):
+        if self._mcp_task:
+            self._mcp_stop.set()  # ends the MCP session, which stops the server
+            if not self._mcp_ready.done():
+                self._mcp_task.cancel()  # still in the handshake
+            await asyncio.gather(self._mcp_task, return_exceptions=True)
+        for process in self.processes:
+            await stop_process(process)
+
+def parse_timings(stderr):
+    # Split the agent's AGENT_TIMINGS line (see agent_timing.py) from the rest of its stderr
+    timings, lines = None, []
+    for line in stderr.splitlines():
+        if line.startswith(AGENT_TIMINGS_PREFIX):
+            timings = json.loads(line[len(AGENT_TIMINGS_PREFIX):])
+        else:
+            lines.append(line)
+    return timings, "\n".join(lines).strip()
+
+async def run_agent_interaction(agent_script: str, prompt: str, env=None, echo=True):
+    """Run one prompt through a fresh agent process; returns the run's timings in seconds."""
+    if echo:
+        print(f"\n--- Running {agent_script} with prompt: '{prompt}' ---")
+    spawned_at = time.time()
+    start = time.perf_counter()
     process = await asyncio.create_subprocess_exec(
-        "python",
+        sys.executable,
         agent_script,
         prompt,
         stdout=asyncio.subprocess.PIPE,
         stderr=asyncio.subprocess.PIPE,
-        env=env
+        env={**os.environ, **(env or {}), "AGENT_TIMINGS": "1"}
     )
     stdout, stderr = await process.communicate()
+    total = time.perf_counter() - start
+    timings, stderr = parse_timings(stderr.decode(errors="replace"))
 
-    if stdout:
-        print(f"STDOUT:\n{stdout.decode().strip()}")
-    if stderr:
-        print(f"STDERR:\n{stderr.decode().strip()}")
+    if echo:
+        if stdout:
+            print(f"STDOUT:\n{stdout.decode().strip()}")
+        if stderr:
+            print(f"STDERR:\n{stderr}")
     if process.returncode != 0:
-        print(f"Error: {agent_script} exited with code {process.returncode}")
+        print(f"Error: {agent_script} exited with code {process.returncode}", file=sys.stderr)
 
-async def main():
-    # Start the mocked REST API server
-    print(f"Starting Mock REST API server ({REST_API_SCRIPT})...")
-    rest_api_process = subprocess.Popen(["python", REST_API_SCRIPT], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    time.sleep(3) # Give the server some time to start
-    print("Mock REST API server started.")
-
-    # Start the MCP server
-    print(f"Starting MCP server ({MCP_SERVER_SCRIPT})...")
-    mcp_server_process = subprocess.Popen(["python", MCP_SERVER_SCRIPT], stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-    time.sleep(3) # Give the server some time to start
-    print("MCP server started.")
+    run = {"ok": process.returncode == 0, "returncode": process.returncode, "total": total}
+    if timings:
+        run["spawn"] = max(0.0, timings["started_at"] - spawned_at)  # interpreter start and imports
+        for phase in ("mcp_handshake", "llm", "tools"):
+            run[phase] = timings.get(phase, 0.0)
+        run["other"] = max(0.0, total - sum(run[phase] for phase in PHASES[:-1]))
+        run["tool_calls"] = timings["tool_calls"]
+    return run
 
-    try:
-        prompts = [
-            "List all products.",
-            "What is the price of product with ID 1?",
-            "Create an order for product ID 2 with quantity 5.",
-            "List all orders."
-        ]
+async def run_benchmark(agents, scenarios, repeat, concurrency, env=None, echo=True, stats=None):
+    """Every scenario `repeat` times per agent, `concurrency` runs at a time; agents run one after another."""
+    runs, llm_usage = [], {}
+    semaphore = asyncio.Semaphore(concurrency)
 
-        print("\n==================================================")
-        print("DEMO: Agent without MCP")
-        print("==================================================")
-        for prompt in prompts:
-            await run_agent_interaction(AGENT_NO_MCP_SCRIPT, prompt)
+    async def one(agent, scenario, repetition):
+        async with semaphore:
+            run = await run_agent_interaction(AGENTS[agent], scenario["prompt"], env, echo)
+        return {"agent": agent, "scenario": scenario["name"], "repetition": repetition, **run}
 
+    for agent in agents:
         print("\n==================================================")
-        print("DEMO: Agent with MCP")
+        print(f"{'BENCHMARK' if repeat > 1 or concurrency > 1 else 'DEMO'}: {AGENTS[agent]}")
         print("==================================================")
-        for prompt in prompts:
-            await run_agent_interaction(AGENT_WITH_MCP_SCRIPT, prompt)
+        before = stats() if stats else None
+        runs += await asyncio.gather(*(one(agent, scenario, repetition)
+                                       for repetition in range(repeat) for scenario in scenarios))
+        if stats:
+            after = stats()
+            llm_usage[agent] = {key: after[key] - before[key] for key in after}
+    return runs, llm_usage
 
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(runs):
+    """Per agent and scenario (and per agent over all scenarios): run counts and timings in seconds."""
+    groups = collections.defaultdict(list)
+    for run in runs:
+        groups[(run["agent"], run["scenario"])].append(run)
+        groups[(run["agent"], "all")].append(run)
+    agents = list(dict.fromkeys(run["agent"] for run in runs))
+    summary = []
+    # Scenarios in run order with each agent's "all" row last
+    for (agent, scenario), group in sorted(groups.items(), key=lambda item: (agents.index(item[0][0]), item[0][1] == "all")):
+        ok = [run for run in group if run["ok"]]
+        timed = [run for run in ok if "spawn" in run]
+        totals = [run["total"] for run in ok]
+        row = {"agent": agent, "scenario": scenario, "runs": len(group), "failed": len(group) - len(ok),
+               "total_p50": percentile(totals, 50) if totals else None,
+               "total_p95": percentile(totals, 95) if totals else None}
+        for phase in PHASES:
+            row[phase] = sum(run[phase] for run in timed) / len(timed) if timed else None
+        row["tool_calls"] = sum(run["tool_calls"] for run in timed) / len(timed) if timed else None
+        summary.append(row)
+    return summary
+
+def print_summary(summary):
+    columns = ("total_p50", "total_p95", *PHASES)
+    print(f"\n{'agent':<9} {'scenario':<16} {'runs':>4} {'fail':>4} " + " ".join(f"{c:>13}" for c in columns))
+    for row in summary:
+        values = " ".join(f"{row[c]:>13.3f}" if row[c] is not None else f"{'-':>13}" for c in columns)
+        print(f"{row['agent']:<9} {row['scenario']:<16} {row['runs']:>4} {row['failed']:>4} {values}")
+
+def write_report(path, config, runs, summary, llm_usage):
+    # .csv gets one row per run; anything else gets the full JSON report
+    if path.endswith(".csv"):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=RUN_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(runs)
+    else:
+        with open(path, "w") as f:
+            json.dump({"config": config, "summary": summary, "runs": runs, "fake_llm": llm_usage}, f, indent=2)
+    print(f"Report written to {path}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the agents as a demo or as a benchmark.")
+    parser.add_argument("--scenarios", default=DEFAULT_SCENARIOS,
+                        help="JSON list of {name, prompt[, tool, arguments]} scenarios")
+    parser.add_argument("--agents", nargs="+", choices=sorted(AGENTS), default=["no_mcp", "with_mcp"])
+    parser.add_argument("--repeat", type=int, default=1, help="runs of each scenario per agent")
+    parser.add_argument("--concurrency", type=int, default=1, help="agent processes running at once")
+    parser.add_argument("--report", help="write the results to this .json or .csv file")
+    parser.add_argument("--fake-llm", action="store_true",
+                        help="answer with fake_llm_server.py instead of Azure OpenAI")
+    parser.add_argument("--quiet", action="store_true", help="do not print each agent's output")
+    parser.add_argument("--mcp-pool", type=int, default=0, metavar="N",
+                        help="run N shared MCP servers over HTTP instead of one per agent run")
+    args = parser.parse_args()
+    # A semaphore of 0 would never let a run start
+    for option in ("repeat", "concurrency"):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option} must be at least 1")
+    return args
+
+async def main():
+    args = parse_args()
+    with open(args.scenarios) as f:
+        scenarios = json.load(f)
+
+    tls_dir = tempfile.TemporaryDirectory() if args.fake_llm else None
+    if tls_dir:
+        agent_env = fake_llm_env(tls_dir.name)
+    elif all([AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, AZURE_OPENAI_DEPLOYMENT_NAME]):
+        agent_env = {"AZURE_OPENAI_ENDPOINT": AZURE_OPENAI_ENDPOINT,
+                     "AZURE_OPENAI_API_KEY": AZURE_OPENAI_API_KEY,
+                     "AZURE_OPENAI_DEPLOYMENT_NAME": AZURE_OPENAI_DEPLOYMENT_NAME,
+                     "MODEL_DEPLOYMENT_NAME": os.getenv("MODEL_DEPLOYMENT_NAME", AZURE_OPENAI_DEPLOYMENT_NAME)}
+    else:
+        print("Error: AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_API_KEY, and AZURE_OPENAI_DEPLOYMENT_NAME environment variables must be set.")
+        print("Please set them in your .env file or environment variables, or run with --fake-llm.")
+        sys.exit(1)
+
+    # Start the services together and wait until each one answers
+    print(f"Starting Mock REST API server ({REST_API_SCRIPT}) and MCP server ({MCP_SERVER_SCRIPT})"
+          f"{f' and fake LLM ({FAKE_LLM_SCRIPT})' if tls_dir else ''}...")
+    restock = stock_needed(scenarios, args.repeat * len(args.agents))
+    services = Services(tls_dir.name if tls_dir else None, args.scenarios, args.mcp_pool, restock)
+    if args.mcp_pool:
+        agent_env["MCP_SERVER_URLS"] = mcp_pool_urls(args.mcp_pool)
+    start = time.perf_counter()
+    try:
+        await services.start()
+    except ServiceNotReady as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if e.stderr:
+            print(f"--- {e.name} stderr ---\n{e.stderr}", file=sys.stderr)
+        sys.exit(1)
+    print(f"All services ready in {time.perf_counter() - start:.2f}s.")
+
+    try:
+        stats = (lambda: fake_llm_stats(tls_dir.name)) if tls_dir else None
+        runs, llm_usage = await run_benchmark(args.agents, scenarios, args.repeat, args.concurrency,
+                                              agent_env, echo=not args.quiet, stats=stats)
     finally:
         # Shut down the servers
         print("\nShutting down servers...")
-        rest_api_process.terminate()
-        mcp_server_process.terminate()
-        rest_api_process.wait()
-        mcp_server_process.wait()
+        await services.stop()
+        if tls_dir:
+            tls_dir.cleanup()
         print("Servers shut down.")
 
+    summary = summarize(runs)
+    print_summary(summary)
+    for agent, usage in llm_usage.items():
+        print(f"{agent}: {usage['requests']} LLM requests, ~{usage['prompt_tokens']} prompt tokens")
+    if args.report:
+        config = {"scenarios": args.scenarios, "agents": args.agents, "repeat": args.repeat,
+                  "concurrency": args.concurrency, "fake_llm": args.fake_llm, "mcp_pool": args.mcp_pool}
+        write_report(args.report, config, runs, summary, llm_usage)
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# Local stand-in for the Azure OpenAI chat-completions API, so the agent
+# benchmark in demo.py runs offline and without model-time noise.
+#
+# Answers are scripted from the scenario file: when the conversation contains a
+# scenario's prompt and the request offers a tool named like the scenario's
+# "tool", the first reply is that tool call; once a tool result is in the
+# conversation the reply is a short final answer. Every reply takes
+# FAKE_LLM_LATENCY_MS, standing in for model time.
+#
+# Semantic Kernel only accepts https Azure endpoints, so with FAKE_LLM_TLS_DIR set
+# the server creates a throwaway self-signed certificate there (openssl CLI) and
+# serves https; clients trust it with SSL_CERT_FILE=<FAKE_LLM_TLS_DIR>/cert.pem.
+#
+# Usage: FAKE_LLM_SCENARIOS=extras/agent_scenarios.json python extras/fake_llm_server.py
+
+import json
+import os
+import subprocess
+import threading
+import time
+import uuid
+
+from flask import Flask, jsonify, request
+
+FAKE_LLM_PORT = int(os.getenv("FAKE_LLM_PORT", "5100"))
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "300"))
+FAKE_LLM_TLS_DIR = os.getenv("FAKE_LLM_TLS_DIR")
+FAKE_LLM_SCENARIOS = os.getenv("FAKE_LLM_SCENARIOS", os.path.join(os.path.dirname(__file__), "agent_scenarios.json"))
+
+app = Flask(__name__)
+
+with open(FAKE_LLM_SCENARIOS) as f:
+    SCENARIOS = json.load(f)
+
+# Totals since start, for comparing how much context each agent sends
+_stats_lock = threading.Lock()
+_stats = {"requests": 0, "tool_calls": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+
+def estimate_tokens(value):
+    # Roughly four characters per token is close enough for comparisons
+    return max(1, len(value) // 4)
+
+
+def message_text(message):
+    content = message.get("content") or ""
+    if isinstance(content, list):
+        # Content parts: [{"type": "text", "text": ...}, ...]
+        content = " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content
+
+
+def find_scenario(messages):
+    text = " ".join(message_text(m) for m in messages if m.get("role") in ("system", "user"))
+    # Longest prompt first, so a prompt that contains another one still wins
+    for scenario in sorted(SCENARIOS, key=lambda s: len(s["prompt"]), reverse=True):
+        if scenario["prompt"] in text:
+            return scenario
+    return None
+
+
+def find_tool(tools, wanted):
+    # Semantic Kernel names tools "<plugin>-<function>"
+    for tool in tools:
+        name = tool.get("function", {}).get("name", "")
+        if name == wanted or name.endswith(f"-{wanted}"):
+            return name
+    return None
+
+
+def reply(message, finish_reason, prompt_tokens):
+    completion_tokens = estimate_tokens(json.dumps(message))
+    with _stats_lock:
+        _stats["requests"] += 1
+        _stats["tool_calls"] += len(message.get("tool_calls", ()))
+        _stats["prompt_tokens"] += prompt_tokens
+        _stats["completion_tokens"] += completion_tokens
+    return jsonify({
+        "id": f"chatcmpl-{uuid.uuid4().hex}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": "fake-llm",
+        "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                  "total_tokens": prompt_tokens + completion_tokens},
+    })
+
+
+@app.route('/openai/deployments/<deployment>/chat/completions', methods=['POST'])
+@app.route('/v1/chat/completions', methods=['POST'])
+@app.route('/chat/completions', methods=['POST'])
+def chat_completions(deployment=None):
+    body = request.get_json()
+    if body.get("stream"):
+        return jsonify({"error": {"message": "streaming is not supported by the fake server"}}), 400
+    messages = body.get("messages", [])
+    prompt_tokens = estimate_tokens(json.dumps(messages) + json.dumps(body.get("tools", [])))
+    time.sleep(FAKE_LLM_LATENCY_MS / 1000.0)
+
+    scenario = find_scenario(messages)
+    tool_results = [m for m in messages if m.get("role") == "tool"]
+    if scenario and scenario.get("tool") and not tool_results:
+        name = find_tool(body.get("tools") or [], scenario["tool"])
+        if name:
+            call = {"id": f"call_{uuid.uuid4().hex[:12]}", "type": "function",
+                    "function": {"name": name, "arguments": json.dumps(scenario.get("arguments", {}))}}
+            return reply({"role": "assistant", "content": None, "tool_calls": [call]}, "tool_calls", prompt_tokens)
+
+    if tool_results:
+        result = message_text(tool_results[-1])
+        content = f"Here is what I found ({len(result)} characters of tool output): {result[:200]}"
+    else:
+        content = scenario.get("answer", "I can help with products and orders.") if scenario else \
+            "I can help with products and orders."
+    return reply({"role": "assistant", "content": content}, "stop", prompt_tokens)
+
+
+@app.route('/health', methods=['GET'])
+def health():
+    return jsonify({"status": "ok"})
+
+
+@app.route('/stats', methods=['GET'])
+def stats():
+    with _stats_lock:
+        return jsonify(dict(_stats))
+
+
+def self_signed_certificate(directory):
+    """(cert, key) paths for 127.0.0.1 and localhost, created on first use."""
+    cert, key = os.path.join(directory, "cert.pem"), os.path.join(directory, "key.pem")
+    if not os.path.exists(cert):
+        os.makedirs(directory, exist_ok=True)
+        subprocess.run(["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+                        "-keyout", key, "-out", cert, "-subj", "/CN=127.0.0.1",
+                        "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost"],
+                       check=True, capture_output=True)
+    return cert, key
+
+
+if __name__ == '__main__':
+    ssl_context = self_signed_certificate(FAKE_LLM_TLS_DIR) if FAKE_LLM_TLS_DIR else None
+    app.run(port=FAKE_LLM_PORT, threaded=True, ssl_context=ssl_context)
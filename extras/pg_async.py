@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+# Async execution mode for pgsql_mcp_server.py (MCP_SERVER_MODE=async)
+#
+# psycopg2 blocks, and a sync FastMCP tool runs on the event loop, so one slow
+# query stalls every other tool call. In async mode each database tool runs on
+# a worker thread instead, bounded by a capacity limiter, so calls overlap up
+# to the limit. When the client cancels a call (or goes away) the query is
+# stopped server-side with connection.cancel() rather than left running.
+# A connection is only cancelled while the call still has it checked out, so a
+# late cancel never reaches a connection that went back to the pool.
+
+import functools
+import os
+import threading
+from contextlib import contextmanager
+
+import anyio
+import anyio.to_thread
+
+from pg_pool import POOL_MAX_SIZE
+
+# Tool calls running at once; more than the pool size would only queue for connections
+DB_THREADS = int(os.getenv("DB_THREADS", str(POOL_MAX_SIZE)))
+# Seconds a cancelled call may take to stop before the thread is abandoned
+CANCEL_GRACE = float(os.getenv("DB_CANCEL_GRACE_SECONDS", "5"))
+
+_local = threading.local()
+
+
+class QueryCancelled(Exception):
+    """The client cancelled the tool call before its query started."""
+
+
+class _Call:
+    # One tool call on a worker thread and the connections it is using
+    def __init__(self):
+        self.connections = []
+        self.cancelled = False
+        self.finished = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self, func, args, kwargs):
+        _local.call = self
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.call = None
+            with self._lock:
+                self.connections.clear()
+            self.finished.set()
+
+    def track(self, conn):
+        with self._lock:
+            cancelled = self.cancelled
+            if not cancelled:
+                self.connections.append(conn)
+        if cancelled:
+            raise QueryCancelled("Tool call cancelled by the client")
+
+    def untrack(self, conn):
+        with self._lock:
+            self.connections = [c for c in self.connections if c is not conn]
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            connections = list(self.connections)
+        for conn in connections:
+            try:
+                # Asks the server to stop the running statement; safe from another thread
+                conn.cancel()
+            except Exception:
+                pass
+
+
+@contextmanager
+def tracking(conn):
+    """Register `conn` with the tool call running on this thread for the block, so cancellation reaches it.
+
+    Leave the block before the connection goes back to its pool. A no-op outside async mode.
+    """
+    call = getattr(_local, "call", None)
+    if call is None:
+        yield conn
+        return
+    call.track(conn)
+    try:
+        yield conn
+    finally:
+        call.untrack(conn)
+
+
+class ThreadOffload:
+    """Wraps blocking tool functions into coroutines that run on bounded worker threads."""
+
+    def __init__(self, threads=DB_THREADS, cancel_grace=CANCEL_GRACE):
+        self.threads = threads
+        self.cancel_grace = cancel_grace
+        self._limiter = None
+        self._counters = dict.fromkeys(("calls", "cancelled"), 0)
+
+    @property
+    def limiter(self):
+        # Created on first use, inside the event loop that serves the tools
+        if self._limiter is None:
+            self._limiter = anyio.CapacityLimiter(self.threads)
+        return self._limiter
+
+    async def run(self, func, *args, **kwargs):
+        call = _Call()
+        async with self.limiter:
+            self._counters["calls"] += 1
+            try:
+                # Abandoning lets the cancellation through to us; the thread is then
+                # stopped by cancelling its query and awaited below
+                return await anyio.to_thread.run_sync(call.run, func, args, kwargs, abandon_on_cancel=True)
+            except anyio.get_cancelled_exc_class():
+                self._counters["cancelled"] += 1
+                call.cancel()
+                with anyio.CancelScope(shield=True):
+                    # Hold the limiter slot until the thread has returned its connection
+                    await anyio.to_thread.run_sync(call.finished.wait, self.cancel_grace)
+                raise
+
+    def wrap(self, func):
+        """An async function with the signature and docstring of `func`, run through run()."""
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.run(func, *args, **kwargs)
+        return wrapper
+
+    def stats(self):
+        limiter = self._limiter
+        return {
+            **self._counters,
+            "threads": self.threads,
+            "running": limiter.borrowed_tokens if limiter else 0,
+            "waiting": limiter.statistics().tasks_waiting if limiter else 0,
+        }
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# Bulk loading for pgsql_mcp_server.py: many rows in one transaction through
+# COPY ... FROM STDIN or batched INSERT ... VALUES (psycopg2 execute_values).
+
+import csv
+import io
+import json
+import os
+import time
+
+from psycopg2 import sql
+from psycopg2.extras import Json, execute_values
+
+from pg_sql import name_parts
+
+# Bulk load configuration (override through the environment)
+BULK_MAX_ROWS = int(os.getenv("DB_BULK_MAX_ROWS", "100000"))      # rows accepted by one bulk_insert call
+BULK_PAGE_SIZE = int(os.getenv("DB_BULK_PAGE_SIZE", "1000"))      # rows per INSERT for method="values"
+
+METHODS = ("copy", "values")
+
+
+def table_identifier(table):
+    # "schema.table" or "table", read as SQL would (lower-case unless double-quoted);
+    # each part is then quoted so the name cannot inject SQL
+    return sql.Identifier(*name_parts(table))
+
+
+def rows_from_input(rows=None, columns=None, csv_text=None, ndjson=None):
+    """Normalize the accepted inputs to (columns, list of value lists)."""
+    given = [value is not None for value in (rows, csv_text, ndjson)]
+    if sum(given) != 1:
+        raise ValueError("Pass exactly one of rows, csv_text or ndjson")
+    if csv_text is not None:
+        reader = csv.reader(io.StringIO(csv_text))
+        header = next(reader, None)
+        if header is None:
+            raise ValueError("csv_text is empty; the first line must name the columns")
+        # An empty CSV field means NULL, quoted or not; copy_csv applies the same rule
+        return columns or header, [[value if value != "" else None for value in row] for row in reader if row]
+    if ndjson is not None:
+        rows = [json.loads(line) for line in ndjson.splitlines() if line.strip()]
+    if not rows:
+        return columns or [], []
+    if isinstance(rows[0], dict):
+        columns = columns or list(rows[0])
+        return columns, [[row.get(column) for column in columns] for row in rows]
+    if not columns:
+        raise ValueError("columns are required when rows are lists")
+    return columns, [list(row) for row in rows]
+
+
+def _copy_value(value):
+    # COPY text format: \N is NULL; backslash, tab, newline and CR are escaped
+    if value is None:
+        return "\\N"
+    if isinstance(value, (dict, list)):
+        value = json.dumps(value)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        value = "\\x" + bytes(value).hex()
+    else:
+        value = str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def copy_rows(cursor, table, columns, rows):
+    buffer = io.StringIO()
+    buffer.writelines("\t".join(map(_copy_value, row)) + "\n" for row in rows)
+    buffer.seek(0)
+    statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        table_identifier(table), sql.SQL(", ").join(map(sql.Identifier, columns)))
+    cursor.copy_expert(statement.as_string(cursor), buffer)
+
+
+def copy_csv(cursor, table, csv_text, columns=None):
+    # The caller's CSV goes to COPY untouched; the header row names the columns.
+    # COPY reads a quoted "" as an empty string; FORCE_NULL makes it NULL as in
+    # rows_from_input, so both methods load the same values
+    header = next(csv.reader(io.StringIO(csv_text)))
+    names = sql.SQL(", ").join(map(sql.Identifier, columns or header))
+    statement = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv, HEADER true, FORCE_NULL ({}))").format(
+        table_identifier(table), names, names)
+    cursor.copy_expert(statement.as_string(cursor), io.StringIO(csv_text))
+
+
+def insert_values(cursor, table, columns, rows, page_size=BULK_PAGE_SIZE):
+    statement = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+        table_identifier(table), sql.SQL(", ").join(map(sql.Identifier, columns)))
+    adapted = [[Json(value) if isinstance(value, (dict, list)) else value for value in row] for row in rows]
+    execute_values(cursor, statement.as_string(cursor), adapted, page_size=page_size)
+
+
+def bulk_load(conn, table, rows=None, columns=None, csv_text=None, ndjson=None, method="copy",
+              max_rows=BULK_MAX_ROWS):
+    """Load the rows into `table` in a single transaction and report count and timing."""
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}; use one of {', '.join(METHODS)}")
+    start = time.perf_counter()
+    columns, values = rows_from_input(rows, columns, csv_text, ndjson)
+    if len(values) > max_rows:
+        raise ValueError(f"At most {max_rows} rows per call; split the load into several calls")
+    if values:
+        with conn.cursor() as cursor:
+            if method == "copy" and csv_text is not None:
+                copy_csv(cursor, table, csv_text, columns)
+            elif method == "copy":
+                copy_rows(cursor, table, columns, values)
+            else:
+                insert_values(cursor, table, columns, values)
+        conn.commit()
+    elapsed = time.perf_counter() - start
+    return {
+        "table": table,
+        "rows": len(values),
+        "method": method,
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(len(values) / elapsed) if values and elapsed else 0,
+    }
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+# Compact columnar encoding of query results for pgsql_mcp_server.py
+#
+# A list of RealDictCursor rows repeats every column name in every row. Here the
+# names are sent once, followed by plain value rows ("columnar") or one array
+# per column ("columns"). Values that JSON cannot carry (Decimal, dates, bytea)
+# are converted once per column, picked from the column's type OID, instead of
+# being inspected value by value.
+
+import base64
+
+import pydantic_core
+from psycopg2.extras import RealDictCursor
+
+FORMATS = ("rows", "columnar", "columns")
+
+NUMERIC_OID = 1700
+BYTEA_OID = 17
+UUID_OID = 2950
+INTERVAL_OID = 1186
+DATE_TIME_OIDS = (1082, 1083, 1114, 1184, 1266)  # date, time, timestamp, timestamptz, timetz
+
+
+def _isoformat(value):
+    return value.isoformat()
+
+
+def _base64(value):
+    return base64.b64encode(bytes(value)).decode("ascii")
+
+
+CONVERTERS = {
+    # str keeps the exact value; a float would round amounts such as payment_due
+    NUMERIC_OID: str,
+    BYTEA_OID: _base64,
+    UUID_OID: str,
+    INTERVAL_OID: str,
+    **dict.fromkeys(DATE_TIME_OIDS, _isoformat),
+}
+
+
+def check_format(layout):
+    if layout not in FORMATS:
+        raise ValueError(f"Unknown result format {layout!r}; use one of {', '.join(FORMATS)}")
+    return layout
+
+
+def cursor_factory(layout):
+    # Only the dict-per-row format needs RealDictCursor; the others read plain tuples
+    return RealDictCursor if layout == "rows" else None
+
+
+def convert_column(values, converter):
+    return [None if value is None else converter(value) for value in values]
+
+
+def encode(description, rows, layout="columnar"):
+    """Encode tuple rows from a cursor with `description` in the given layout.
+
+    "columnar" -> {"columns": [...], "rows": [[...], ...]}
+    "columns"  -> {"columns": [...], "data": [[column 1 values], [column 2 values], ...]}
+    """
+    names = [column.name for column in description]
+    converters = [CONVERTERS.get(column.type_code) for column in description]
+    if layout == "columns" or any(converters):
+        columns = [list(column) for column in zip(*rows)] if rows else [[] for _ in names]
+        for i, converter in enumerate(converters):
+            if converter:
+                columns[i] = convert_column(columns[i], converter)
+        if layout == "columns":
+            return {"columns": names, "data": columns, "row_count": len(rows)}
+        rows = list(zip(*columns))
+    return {"columns": names, "rows": rows, "row_count": len(rows)}
+
+
+def compact_json(result):
+    # FastMCP indents dict results, which puts every value of a columnar result on its own line
+    return pydantic_core.to_json(result, fallback=str).decode()
+
+
+def format_rows(description, rows, layout, **extra):
+    """Tool result for `layout`: RealDictCursor rows unchanged, tuples as compact columnar JSON text.
+
+    `extra` fields (such as truncated) turn a "rows" result into {"rows": [...], "row_count": n, ...}
+    and are added next to the columns of the other layouts.
+    """
+    if layout == "rows":
+        return {"rows": rows, "row_count": len(rows), **extra} if extra else rows
+    return compact_json({**encode(description, rows, layout), **extra})
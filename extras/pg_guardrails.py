@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# Pre-execution guardrails for model-generated SQL in pgsql_mcp_server.py
+#
+# Before a statement runs it gets a per-transaction statement_timeout, reads
+# without a LIMIT get a default one (and say so in the result when it cut rows),
+# and a plain EXPLAIN (no execution) rejects plans whose estimated cost is above
+# a threshold. Only single statements are accepted: EXPLAIN would plan the first
+# one and run the rest. Rejections are raised as QueryRejected, whose message is
+# JSON telling the model how to narrow the query.
+
+import json
+import os
+import re
+
+import psycopg2.errors
+
+from pg_sql import READ, classify, code_only, normalize, statements
+
+# Guardrail configuration (override through the environment; 0 disables a check)
+DEFAULT_LIMIT = int(os.getenv("DB_QUERY_DEFAULT_LIMIT", "1000"))          # added to reads without LIMIT
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "30000"))  # per call, via SET LOCAL
+MAX_QUERY_COST = float(os.getenv("DB_MAX_QUERY_COST", "1000000"))        # planner cost units
+
+LIMITABLE = ("select", "with", "values", "table")
+EXPLAINABLE = ("select", "with", "values", "table", "insert", "update", "delete", "merge")
+
+# Estimated rows above which a sequential scan or sort is worth pointing out
+LARGE_ROWS = 100000
+
+
+class QueryRejected(Exception):
+    """A guardrail stopped the query; `details` says why and how to narrow it."""
+
+    def __init__(self, details):
+        self.details = details
+        super().__init__(json.dumps(details))
+
+
+def first_word(query):
+    words = statements(query)
+    return words[0][0] if words else ""
+
+
+# Names (dotted names as one token) and any other single character, outside literals and comments
+_CLAUSE_TOKEN = re.compile(r'(?:[A-Za-z_][\w$]*|"(?:[^"]|"")*")(?:\.(?:[A-Za-z_][\w$]*|"(?:[^"]|"")*"))*|\S')
+# What follows the LIMIT keyword: a count, ALL, NULL, a parameter ($1, %s, :n) or a subquery
+_LIMIT_ARGUMENT = set("0123456789$%:(") | {"all", "null"}
+
+
+def has_top_level_limit(query):
+    """True when the outermost query has a LIMIT or FETCH FIRST/NEXT clause (not a column named so)."""
+    words = _CLAUSE_TOKEN.findall(code_only(query).lower())
+    depth = 0
+    for i, token in enumerate(words):
+        following = words[i + 1] if i + 1 < len(words) else None
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token == "limit" and following in _LIMIT_ARGUMENT:
+            return True
+        elif depth == 0 and token == "fetch" and following in ("first", "next"):
+            return True
+    return False
+
+
+def add_default_limit(query, limit=DEFAULT_LIMIT):
+    """Return (query, row_limit): a single read without a LIMIT gets one, else row_limit is None.
+
+    The LIMIT asks for one row more than `limit`, so the caller can tell a result
+    that was cut off (see truncation) from one that happens to have `limit` rows.
+    Statements that start like a read but write (WITH ... INSERT, SELECT ... INTO,
+    SELECT ... FOR UPDATE) are left alone: a LIMIT would cut what they write.
+    """
+    if not limit or len(statements(query)) != 1 or first_word(query) not in LIMITABLE:
+        return query, None
+    if classify(query) != READ:
+        return query, None
+    if has_top_level_limit(query):
+        return query, None
+    # normalize() drops comments, so a trailing "-- ..." cannot swallow the LIMIT
+    text = normalize(query)
+    if text.endswith(";"):
+        text = text[:-1].rstrip()
+    return f"{text} LIMIT {int(limit) + 1}", int(limit)
+
+
+def truncation(row_limit):
+    """Fields added to a result that the default LIMIT cut off."""
+    return {
+        "truncated": True,
+        "row_limit": row_limit,
+        "hint": f"Only the first {row_limit} rows were returned. Add a LIMIT or a narrower WHERE, "
+                "aggregate in SQL, or use stream_query to read every row",
+    }
+
+
+def check_single_statement(query):
+    if len(statements(query)) != 1:
+        raise QueryRejected({
+            "error": "query_rejected",
+            "reason": "multiple_statements",
+            "hints": ["Send one SQL statement per call"],
+        })
+
+
+def set_statement_timeout(cursor, timeout_ms=STATEMENT_TIMEOUT_MS):
+    if timeout_ms:
+        # SET LOCAL ends with the transaction, so pooled connections do not keep it
+        cursor.execute("SET LOCAL statement_timeout = %s", (int(timeout_ms),))
+
+
+def _walk(plan):
+    yield plan
+    for child in plan.get("Plans", ()):
+        yield from _walk(child)
+
+
+def plan_hints(plan):
+    """Suggestions for narrowing the query, read off the expensive parts of the plan."""
+    hints = []
+    for node in _walk(plan):
+        node_type = node.get("Node Type", "")
+        rows = node.get("Plan Rows", 0)
+        if node_type == "Seq Scan" and rows >= LARGE_ROWS:
+            hints.append(f"Filter {node.get('Relation Name')} with a selective WHERE condition "
+                         f"(about {rows} rows are scanned), ideally on an indexed column")
+        elif node_type == "Nested Loop" and not node.get("Join Filter") and rows >= LARGE_ROWS and not any(
+                child.get("Index Cond") or child.get("Recheck Cond") for child in _walk(node)):
+            hints.append(f"The join produces about {rows} rows with no join condition; "
+                         "add a condition relating the joined tables")
+        elif node_type in ("Sort", "Incremental Sort") and rows >= LARGE_ROWS:
+            hints.append(f"Sorting about {rows} rows; add a LIMIT or a filter before ORDER BY")
+    hints.append("Aggregate in SQL (COUNT, SUM, GROUP BY) instead of fetching rows, "
+                 "or use stream_query to page through a large result")
+    return list(dict.fromkeys(hints))
+
+
+def check_cost(cursor, query, params=None, max_cost=MAX_QUERY_COST):
+    """Plan the statement with EXPLAIN and raise QueryRejected if it is too expensive."""
+    check_single_statement(query)
+    if not max_cost or first_word(query) not in EXPLAINABLE:
+        return None
+    cursor.execute(f"EXPLAIN (FORMAT JSON) {query}", params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    plan = plan[0]["Plan"]
+    cost = plan.get("Total Cost", 0)
+    if cost > max_cost:
+        raise QueryRejected({
+            "error": "query_rejected",
+            "reason": "estimated_cost_too_high",
+            "estimated_cost": cost,
+            "max_cost": max_cost,
+            "estimated_rows": plan.get("Plan Rows"),
+            "hints": plan_hints(plan),
+        })
+    return cost
+
+
+def timeout_error(timeout_ms=STATEMENT_TIMEOUT_MS):
+    return QueryRejected({
+        "error": "query_rejected",
+        "reason": "statement_timeout",
+        "timeout_ms": timeout_ms,
+        "hints": ["Add selective WHERE conditions or a LIMIT",
+                  "Aggregate in SQL instead of fetching rows, or use stream_query for large results"],
+    })
+
+
+def guard(cursor, query, params=None, timeout_ms=STATEMENT_TIMEOUT_MS, max_cost=MAX_QUERY_COST):
+    """Run the pre-execution checks on a fresh transaction; returns the estimated cost."""
+    set_statement_timeout(cursor, timeout_ms)
+    try:
+        return check_cost(cursor, query, params, max_cost)
+    except psycopg2.errors.QueryCanceled:
+        raise timeout_error(timeout_ms) from None
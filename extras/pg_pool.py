@@ -0,0 +1,244 @@
+#!/usr/bin/env python3
+# Bounded, thread-safe database connection pool for pgsql_mcp_server.py
+#
+# The pool takes a `connect` callable, so it works with psycopg2 or, in
+# test_pg_pool.py, a stand-in. Nothing is opened until the first checkout.
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Pool configuration (override through the environment)
+POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", "1"))          # connections kept open once the pool is in use
+POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", "8"))          # hard cap on open connections
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))         # seconds to wait for a free connection
+POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", "300"))      # close extra connections idle this long
+POOL_CHECK_AFTER = float(os.getenv("DB_POOL_CHECK_AFTER", "5"))  # ping connections idle this long before reuse
+
+
+class PoolTimeout(Exception):
+    """No connection became free within the pool timeout."""
+
+
+class PoolClosed(Exception):
+    """The pool was closed."""
+
+
+def is_closed(conn):
+    # psycopg2 sets `closed` to non-zero once the connection is gone; sqlite3 has no such flag
+    return bool(getattr(conn, "closed", 0))
+
+
+class ConnectionPool:
+    """Hands out connections between `min_size` and `max_size`, checking their health.
+
+    Connections that sat idle for longer than `check_after` seconds are pinged
+    before reuse and replaced when the ping fails, so a restarted database or a
+    dropped socket costs one reconnect instead of a failed tool call. Extra
+    connections idle for `max_idle` seconds are closed.
+    """
+
+    def __init__(
+        self,
+        connect,
+        min_size=POOL_MIN_SIZE,
+        max_size=POOL_MAX_SIZE,
+        timeout=POOL_TIMEOUT,
+        max_idle=POOL_MAX_IDLE,
+        check_after=POOL_CHECK_AFTER,
+        ping_query="SELECT 1",
+    ):
+        if not 0 <= min_size <= max_size or max_size < 1:
+            raise ValueError("Pool sizes must satisfy 0 <= min_size <= max_size and max_size >= 1")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self.check_after = check_after
+        self.ping_query = ping_query
+
+        self._cond = threading.Condition()
+        # (connection, last returned) pairs, oldest first; checkouts take the newest
+        self._idle = []
+        self._size = 0
+        self._started = False
+        self._closed = False
+        self._counters = dict.fromkeys(
+            ("checkouts", "waits", "timeouts", "created", "closed", "connect_errors", "health_check_failures"), 0)
+        self._wait_time = 0.0
+
+    def _open(self):
+        try:
+            conn = self._connect()
+        except Exception:
+            with self._cond:
+                self._size -= 1
+                self._counters["connect_errors"] += 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._counters["created"] += 1
+        return conn
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+        with self._cond:
+            self._size -= 1
+            self._counters["closed"] += 1
+            self._cond.notify()
+
+    def _ping(self, conn):
+        if is_closed(conn):
+            return False
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self.ping_query)
+            cursor.fetchall()
+            cursor.close()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _expired_idle(self, now):
+        # Caller holds the lock; the oldest idle connections go first, down to min_size
+        expired = []
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.max_idle:
+            expired.append(self._idle.pop(0)[0])
+            self._size -= 1
+            self._counters["closed"] += 1
+        return expired
+
+    def _fill(self):
+        # Open the min_size connections in the background after the first checkout
+        while True:
+            with self._cond:
+                if self._closed or self._size >= self.min_size:
+                    return
+                self._size += 1
+            try:
+                conn = self._open()
+            except Exception:
+                return
+            self.putconn(conn)
+
+    def getconn(self):
+        """Check out a healthy connection, waiting up to `timeout` seconds for a free one."""
+        deadline = time.monotonic() + self.timeout
+        conn = None
+        with self._cond:
+            if self._closed:
+                raise PoolClosed("Connection pool is closed")
+            if not self._started:
+                self._started = True
+                threading.Thread(target=self._fill, name="db-pool-fill", daemon=True).start()
+            expired = self._expired_idle(time.monotonic())
+            waited = False
+            wait_start = time.monotonic()
+            while True:
+                if self._idle:
+                    conn, last_used = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(f"No database connection free after {self.timeout:.1f}s "
+                                      f"({self.max_size} in use)")
+                if not waited:
+                    waited = True
+                    self._counters["waits"] += 1
+                self._cond.wait(remaining)
+                if self._closed:
+                    raise PoolClosed("Connection pool is closed")
+            self._counters["checkouts"] += 1
+            if waited:
+                self._wait_time += time.monotonic() - wait_start
+        for stale in expired:
+            try:
+                stale.close()
+            except Exception:
+                pass
+
+        if conn is None:
+            return self._open()
+        if time.monotonic() - last_used > self.check_after and not self._ping(conn):
+            # Reconnect in place: the slot stays reserved for this caller, so no
+            # waiter is woken for it (_open gives it back if the reconnect fails)
+            try:
+                conn.close()
+            except Exception:
+                pass
+            with self._cond:
+                self._counters["health_check_failures"] += 1
+                self._counters["closed"] += 1
+            return self._open()
+        return conn
+
+    def putconn(self, conn, discard=False):
+        """Return a connection; broken ones (or `discard=True`) are closed instead of reused."""
+        if not discard and not is_closed(conn):
+            try:
+                # Never hand out a connection that is still inside a transaction
+                conn.rollback()
+            except Exception:
+                discard = True
+        if discard or is_closed(conn):
+            self._discard(conn)
+            return
+        with self._cond:
+            if self._closed:
+                self._size -= 1
+                self._counters["closed"] += 1
+                conn.close()
+                return
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self):
+        """`with pool.connection() as conn:` checks a connection out and always returns it."""
+        conn = self.getconn()
+        try:
+            yield conn
+        finally:
+            self.putconn(conn)
+
+    def stats(self):
+        with self._cond:
+            return {
+                **self._counters,
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "wait_time_ms": round(self._wait_time * 1000, 1),
+                "config": {
+                    "min_size": self.min_size,
+                    "max_size": self.max_size,
+                    "timeout": self.timeout,
+                    "max_idle": self.max_idle,
+                    "check_after": self.check_after,
+                },
+            }
+
+    def close(self):
+        """Close idle connections now and the checked-out ones as they come back."""
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._counters["closed"] += len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
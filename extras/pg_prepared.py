@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# Per-connection prepared-statement cache for pgsql_mcp_server.py
+#
+# psycopg2 interpolates parameters on the client, so PostgreSQL parses and
+# plans every execute_query call from scratch. Parameterized statements are
+# turned into PREPARE ... AS <sql with $1..$n> once per connection and then run
+# with EXECUTE, which skips the parse/plan work on every repeat.
+#
+# Off by default: PREPARE leaves $n untyped, so PostgreSQL infers parameter types
+# from the statement rather than from the interpolated literals. Where nothing
+# constrains a parameter the result type changes (SELECT %s with an int returns
+# text). Enable it with DB_PREPARED_CACHE_SIZE for queries whose parameters are
+# compared with columns or cast explicitly (WHERE id = %s, %s::int).
+
+import os
+import re
+import threading
+import weakref
+from collections import OrderedDict
+
+import psycopg2
+import psycopg2.errors
+
+from pg_sql import segments
+
+# Prepared statements kept per connection (0, the default, disables the cache; 64 is a good size)
+PREPARED_CACHE_SIZE = int(os.getenv("DB_PREPARED_CACHE_SIZE", "0"))
+
+PREPARABLE = ("select", "insert", "update", "delete", "with", "values")
+_PLACEHOLDER = re.compile(r"(%%|%s|%\(\w+\)s|%|;)")
+
+
+def parametrize(query):
+    """Normalize `query` and turn psycopg2 placeholders into $n ones.
+
+    Returns (text, names) where `names` lists the %(name)s keys in $n order, or
+    is None for positional %s placeholders. Returns None when the statement can
+    not be prepared: several statements, a placeholder we do not understand, or
+    one inside a literal or comment (psycopg2 substitutes those, PREPARE cannot).
+    Whitespace outside literals is collapsed and comments are dropped, so queries
+    that differ only in layout share one prepared statement.
+    """
+    out = []
+    names = []
+    positional = 0
+    ended = False
+    for kind, text in segments(query):
+        if kind in ("space", "comment"):
+            if kind == "comment" and "%" in text.replace("%%", ""):
+                return None
+            if out and out[-1] != " ":
+                out.append(" ")
+            continue
+        if ended:
+            # Only a trailing semicolon is allowed; PREPARE takes a single statement
+            return None
+        if kind != "code":
+            if "%" in text.replace("%%", ""):
+                return None
+            out.append(text.replace("%%", "%"))
+            continue
+        for piece in _PLACEHOLDER.split(text):
+            if ended and piece:
+                return None
+            if piece == "%%":
+                out.append("%")
+            elif piece == "%s":
+                positional += 1
+                out.append(f"${positional}")
+            elif piece.startswith("%("):
+                name = piece[2:-2]
+                if name not in names:
+                    names.append(name)
+                out.append(f"${names.index(name) + 1}")
+            elif piece == "%":
+                return None
+            elif piece == ";":
+                ended = True
+            else:
+                out.append(piece)
+    if positional and names:
+        return None
+    text = "".join(out).strip()
+    if text.split(" ", 1)[0].lower() not in PREPARABLE:
+        return None
+    return text, (names if names else None)
+
+
+class PreparedStatementCache:
+    """LRU of prepared statements per connection, keyed by normalized SQL text."""
+
+    def __init__(self, max_size=PREPARED_CACHE_SIZE):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # Entries disappear with their connection when the pool drops it
+        self._statements = weakref.WeakKeyDictionary()
+        self._parsed = OrderedDict()  # query text -> parametrize() result, shared by all connections
+        self._sequence = 0
+        self._counters = dict.fromkeys(("hits", "misses", "evictions", "prepare_errors", "reprepared", "unprepared"), 0)
+
+    def _parse(self, query):
+        with self._lock:
+            if query in self._parsed:
+                self._parsed.move_to_end(query)
+                return self._parsed[query]
+        parsed = parametrize(query)
+        with self._lock:
+            self._parsed[query] = parsed
+            if len(self._parsed) > max(self.max_size * 4, 256):
+                self._parsed.popitem(last=False)
+        return parsed
+
+    def execute(self, cursor, query, params=None):
+        """cursor.execute(query, params), through a prepared statement where possible."""
+        parsed = self._parse(query) if self.max_size and params else None
+        if parsed is None:
+            with self._lock:
+                self._counters["unprepared"] += 1
+            return cursor.execute(query, params)
+        text, names = parsed
+        if names is not None:
+            values = [params[name] for name in names]
+        else:
+            values = list(params)
+
+        conn = cursor.connection
+        with self._lock:
+            statements = self._statements.setdefault(conn, OrderedDict())
+            name = statements.get(text)
+            if name:
+                statements.move_to_end(text)
+                self._counters["hits"] += 1
+            else:
+                self._counters["misses"] += 1
+
+        if not name:
+            name = self._prepare(cursor, statements, query, text)
+            if not name:
+                return cursor.execute(query, params)
+        placeholders = ", ".join(["%s"] * len(values))
+        try:
+            # The savepoint, sent in the same round trip, lets a failed EXECUTE be
+            # retried without aborting the caller's transaction
+            return cursor.execute(f"SAVEPOINT mcp_execute; EXECUTE {name} ({placeholders})", values)
+        except psycopg2.errors.FeatureNotSupported:
+            # "cached plan must not change result type": DDL changed the columns under
+            # the statement. Drop it, prepare it afresh and retry once.
+            cursor.execute(f"ROLLBACK TO SAVEPOINT mcp_execute; DEALLOCATE {name}")
+            with self._lock:
+                if statements.get(text) == name:
+                    del statements[text]
+                self._counters["reprepared"] += 1
+        name = self._prepare(cursor, statements, query, text)
+        if not name:
+            return cursor.execute(query, params)
+        return cursor.execute(f"EXECUTE {name} ({placeholders})", values)
+
+    def _prepare(self, cursor, statements, query, text):
+        with self._lock:
+            self._sequence += 1
+            name = f"mcp_stmt_{self._sequence}"
+        # A failed PREPARE must not abort the caller's transaction
+        cursor.execute("SAVEPOINT mcp_prepare")
+        try:
+            cursor.execute(f"PREPARE {name} AS {text}")
+        except psycopg2.Error:
+            cursor.execute("ROLLBACK TO SAVEPOINT mcp_prepare")
+            with self._lock:
+                self._counters["prepare_errors"] += 1
+                self._parsed[query] = None
+            return None
+        cursor.execute("RELEASE SAVEPOINT mcp_prepare")
+
+        evicted = []
+        with self._lock:
+            statements[text] = name
+            while len(statements) > self.max_size:
+                evicted.append(statements.popitem(last=False)[1])
+                self._counters["evictions"] += 1
+        for old in evicted:
+            # Prepared statements live for the whole session, so free the server-side memory
+            cursor.execute(f"DEALLOCATE {old}")
+        return name
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+                "prepared": sum(len(statements) for statements in self._statements.values()),
+                "connections": len(self._statements),
+                "max_per_connection": self.max_size,
+            }
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+# Result cache for read-only execute_query calls in pgsql_mcp_server.py
+#
+# Entries are keyed by the normalized SQL text, the parameters and the result
+# format, expire after a TTL and are evicted least recently used first once the
+# cache holds more than its byte budget. Each entry remembers the tables its
+# query read, so a write to a table drops exactly the entries that read it.
+# A read that was already running when a write invalidated one of its tables
+# may have seen the old rows, so its result is not stored: every invalidation
+# bumps a generation, and store() takes the one read before the query ran.
+# Only writes that go through this server invalidate entries; the TTL bounds
+# staleness from every other database client. A write to a view's base tables
+# does not name the view, so the server does not cache reads of views.
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import pydantic_core
+
+from pg_sql import normalize
+
+# Result cache configuration (override through the environment)
+RESULT_CACHE_MAX_BYTES = int(os.getenv("DB_RESULT_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+# Off unless a TTL is set (e.g. 60): writes made by other database clients are not seen
+RESULT_CACHE_TTL = float(os.getenv("DB_RESULT_CACHE_TTL", "0"))
+
+
+def result_size(value):
+    # The encoded size is what the cached result costs once it is sent anyway
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    return len(pydantic_core.to_json(value, fallback=str))
+
+
+class QueryResultCache:
+    """Byte-bounded TTL + LRU cache of query results with table-level invalidation."""
+
+    def __init__(self, max_bytes=RESULT_CACHE_MAX_BYTES, ttl=RESULT_CACHE_TTL):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = max_bytes > 0 and ttl > 0
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, size, tables, value)
+        self._by_table = {}             # table -> keys of the entries that read it
+        self._bytes = 0
+        self._generation = 0            # bumped by every invalidate()
+        self._invalidated_at = {}       # table -> generation of its last invalidation
+        self._flushed_at = 0            # generation of the last invalidate(None)
+        self._counters = dict.fromkeys(
+            ("hits", "misses", "expired", "stores", "evictions", "invalidations", "too_large",
+             "stale_stores"), 0)
+
+    @staticmethod
+    def key(query, params, layout):
+        return normalize(query), json.dumps(params, sort_keys=True, default=str), layout
+
+    def _remove(self, key):
+        # Caller holds the lock
+        _, size, tables, _ = self._entries.pop(key)
+        self._bytes -= size
+        for table in tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def lookup(self, key):
+        """Return (True, value) for a fresh entry, else (False, None)."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self._counters["hits"] += 1
+                    return True, entry[3]
+                self._remove(key)
+                self._counters["expired"] += 1
+            self._counters["misses"] += 1
+            return False, None
+
+    def generation(self):
+        """Stamp to take before running a query whose result will be passed to store()."""
+        with self._lock:
+            return self._generation
+
+    def store(self, key, value, tables, generation):
+        size = result_size(value)
+        with self._lock:
+            # One of the tables was written while the query ran; the result may predate the write
+            if self._flushed_at > generation or any(
+                    self._invalidated_at.get(table, 0) > generation for table in tables):
+                self._counters["stale_stores"] += 1
+                return
+            # A single result larger than a quarter of the budget would flush everything else
+            if size > self.max_bytes // 4:
+                self._counters["too_large"] += 1
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, size, frozenset(tables), value)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            self._counters["stores"] += 1
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._counters["evictions"] += 1
+
+    def invalidate(self, tables=None):
+        """Drop the entries that read any of `tables`, or everything when tables is None."""
+        with self._lock:
+            self._generation += 1
+            if tables is None:
+                self._flushed_at = self._generation
+                self._invalidated_at.clear()
+                stale = list(self._entries)
+            else:
+                for table in tables:
+                    self._invalidated_at[table] = self._generation
+                stale = {key for table in tables for key in self._by_table.get(table, ())}
+            for key in stale:
+                self._remove(key)
+            self._counters["invalidations"] += len(stale)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._counters["hits"] + self._counters["misses"]
+            return {
+                **self._counters,
+                "hit_rate": round(self._counters["hits"] / lookups, 3) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+            }
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# Read/write routing for pgsql_mcp_server.py
+#
+# Reads go to a pool of read replicas (round-robin or least-loaded), DML and
+# DDL go to the primary. Each replica's replication lag is sampled every few
+# seconds on a background thread, so a slow or dead replica never holds up a
+# read; a replica that lags too far behind or cannot be reached is skipped,
+# and reads fall back to the primary when no replica is usable (as they do
+# until the first sample is in). Right after a write, reads stay on the primary
+# for a moment so the caller sees its own change. That pin is global, not per
+# client: any write sends every read to the primary for the window. Over stdio
+# the server has a single client, so these are its own writes; a server shared
+# by several clients over HTTP pins them all.
+#
+# With DB_REPLICA_HOSTS unset every statement goes to the primary, as before.
+
+import os
+import sys
+import threading
+import time
+
+from pg_sql import READ
+
+# Routing configuration (override through the environment)
+REPLICA_HOSTS = os.getenv("DB_REPLICA_HOSTS", "")                               # "host[:port],host[:port]"
+REPLICA_POLICY = os.getenv("DB_REPLICA_POLICY", "round_robin")                  # or "least_loaded"
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG_SECONDS", "5"))           # 0 disables the lag check
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))     # seconds between lag samples
+READ_AFTER_WRITE = float(os.getenv("DB_READ_AFTER_WRITE_SECONDS", "5"))         # reads pinned to the primary
+
+POLICIES = ("round_robin", "least_loaded")
+
+# Zero when the replica has replayed everything it received, otherwise the age of
+# the last replayed transaction. A primary listed as a replica reports zero.
+LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() IS NOT DISTINCT FROM pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END
+"""
+
+
+def parse_hosts(value, default_port=None):
+    """"db1:5433, db2" -> [("db1", "5433"), ("db2", default_port)]"""
+    hosts = []
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        host, _, port = item.rpartition(":")
+        if not host or not port.isdigit():
+            host, port = item, default_port
+        hosts.append((host, port))
+    return hosts
+
+
+class Replica:
+    def __init__(self, name, pool):
+        self.name = name
+        self.pool = pool
+        self.lag = None
+        self.healthy = True
+        self.checked_at = None
+        self.reads = 0
+        self.error = None
+
+
+class ReadWriteRouter:
+    """Picks the pool a statement runs on: the primary, or a replica for reads."""
+
+    def __init__(self, primary, replicas=(), policy=REPLICA_POLICY, max_lag=REPLICA_MAX_LAG,
+                 check_interval=REPLICA_CHECK_INTERVAL, read_after_write=READ_AFTER_WRITE):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown replica policy {policy!r}; use one of {', '.join(POLICIES)}")
+        self.primary = primary
+        # `replicas` is a list of (name, pool) pairs
+        self.replicas = [Replica(name, pool) for name, pool in replicas]
+        self.policy = policy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.read_after_write = read_after_write
+        self._lock = threading.Lock()
+        self._monitoring = False
+        self._stopping = threading.Event()
+        self._next = 0
+        self._last_write = None  # global read-after-write pin (see the module notes)
+        self._counters = dict.fromkeys(
+            ("writes", "replica_reads", "primary_reads", "fallbacks", "pinned_reads", "replica_errors"), 0)
+
+    def _check(self, replica):
+        try:
+            with replica.pool.connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(LAG_QUERY)
+                    lag = float(cursor.fetchone()[0])
+            healthy, error = True, None
+        except Exception as e:
+            lag, healthy, error = None, False, str(e).strip()
+            print(f"❌ Replica {replica.name} check failed: {error}", file=sys.stderr)
+        with self._lock:
+            replica.lag, replica.healthy, replica.error = lag, healthy, error
+            replica.checked_at = time.monotonic()
+
+    def _monitor(self, replica):
+        # One thread per replica, so a replica that takes DB_CONNECT_TIMEOUT to fail
+        # only delays its own next sample
+        while not self._stopping.is_set():
+            self._check(replica)
+            self._stopping.wait(self.check_interval)
+
+    def _start_monitors(self):
+        # Started by the first read, like the pool's fill thread
+        with self._lock:
+            if self._monitoring:
+                return
+            self._monitoring = True
+        for replica in self.replicas:
+            threading.Thread(target=self._monitor, args=(replica,), name=f"db-replica-{replica.name}",
+                             daemon=True).start()
+
+    def _usable(self, replica):
+        if not replica.healthy or replica.checked_at is None:
+            return False
+        return not self.max_lag or (replica.lag is not None and replica.lag <= self.max_lag)
+
+    def reader(self):
+        """The pool the next read should use."""
+        if not self.replicas:
+            with self._lock:
+                self._counters["primary_reads"] += 1
+            return self.primary
+        self._start_monitors()
+        with self._lock:
+            if self._last_write is not None and time.monotonic() - self._last_write < self.read_after_write:
+                self._counters["pinned_reads"] += 1
+                self._counters["primary_reads"] += 1
+                return self.primary
+            candidates = [r for r in self.replicas if self._usable(r)]
+            if not candidates:
+                self._counters["fallbacks"] += 1
+                self._counters["primary_reads"] += 1
+                return self.primary
+            if self.policy == "least_loaded":
+                # Fewest checked-out connections; ties go to the replica that served fewer reads
+                chosen = min(candidates, key=lambda r: (r.pool.stats()["in_use"], r.reads))
+            else:
+                chosen = candidates[self._next % len(candidates)]
+                self._next += 1
+            chosen.reads += 1
+            self._counters["replica_reads"] += 1
+            return chosen.pool
+
+    def pool_for(self, kind):
+        """Primary for WRITE and DDL, a replica (or the primary as fallback) for READ."""
+        if kind == READ:
+            return self.reader()
+        with self._lock:
+            self._counters["writes"] += 1
+        return self.primary
+
+    def wrote(self):
+        # Called after a write commits; starts the read-after-write window for every reader
+        with self._lock:
+            self._last_write = time.monotonic()
+
+    def failed(self, pool, error):
+        """Take the replica behind `pool` out of rotation until its next lag check."""
+        with self._lock:
+            for replica in self.replicas:
+                if replica.pool is pool:
+                    replica.healthy, replica.error = False, str(error).strip()
+                    replica.checked_at = time.monotonic()
+                    self._counters["replica_errors"] += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                **self._counters,
+                "policy": self.policy,
+                "max_lag_seconds": self.max_lag,
+                "replicas": [{
+                    "name": r.name,
+                    "healthy": r.healthy,
+                    "lag_seconds": None if r.lag is None else round(r.lag, 3),
+                    "reads": r.reads,
+                    "in_use": r.pool.stats()["in_use"],
+                    **({"error": r.error} if r.error else {}),
+                } for r in self.replicas],
+            }
+
+    def close(self):
+        self._stopping.set()
+        for replica in self.replicas:
+            replica.pool.close()
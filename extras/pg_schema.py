@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+# Cached catalog snapshot behind the describe_schema tool of pgsql_mcp_server.py
+#
+# Two catalog queries describe every user table, view and index; the compact
+# result is kept until DDL runs through the server or the TTL expires, so the
+# model gets the schema from one cheap call instead of probing the catalog.
+
+import os
+import re
+import threading
+import time
+
+# Seconds a snapshot is served before it is re-read (DDL made elsewhere shows up after this)
+SCHEMA_TTL = float(os.getenv("DB_SCHEMA_TTL", "300"))
+
+USER_SCHEMAS = "n.nspname NOT IN ('pg_catalog', 'information_schema') AND n.nspname NOT LIKE 'pg_toast%'"
+
+COLUMNS_QUERY = f"""
+SELECT n.nspname, c.relname, c.relkind, c.reltuples::bigint,
+       a.attname, format_type(a.atttypid, a.atttypmod), a.attnotnull
+FROM pg_class c
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+WHERE c.relkind IN ('r', 'p', 'v', 'm', 'f') AND {USER_SCHEMAS}
+ORDER BY n.nspname, c.relname, a.attnum
+"""
+
+INDEXES_QUERY = f"""
+SELECT n.nspname, t.relname, i.relname, ix.indisprimary, pg_get_indexdef(ix.indexrelid)
+FROM pg_index ix
+JOIN pg_class i ON i.oid = ix.indexrelid
+JOIN pg_class t ON t.oid = ix.indrelid
+JOIN pg_namespace n ON n.oid = t.relnamespace
+WHERE {USER_SCHEMAS}
+ORDER BY n.nspname, t.relname, i.relname
+"""
+
+KINDS = {"r": "table", "p": "table", "v": "view", "m": "materialized view", "f": "foreign table"}
+_INDEX_DEF = re.compile(r"^CREATE (UNIQUE )?INDEX .*? USING (\w+) (.*)$")
+
+
+def table_name(schema, name):
+    return name if schema == "public" else f"{schema}.{name}"
+
+
+def describe_index(name, primary, definition):
+    # "CREATE UNIQUE INDEX x ON public.t USING btree (a) WHERE b" -> "x: unique btree (a) WHERE b"
+    match = _INDEX_DEF.match(definition)
+    if not match:
+        return f"{name}: {definition}"
+    unique, method, rest = match.groups()
+    label = "primary key" if primary else "unique" if unique else ""
+    return f"{name}: {' '.join(part for part in (label, method, rest) if part)}"
+
+
+def read_snapshot(conn):
+    tables = {}
+    with conn.cursor() as cursor:
+        cursor.execute(COLUMNS_QUERY)
+        for schema, name, kind, approx_rows, column, column_type, not_null in cursor.fetchall():
+            key = table_name(schema, name)
+            table = tables.setdefault(key, {
+                "name": key,
+                "kind": KINDS[kind],
+                # reltuples is -1 until the table is first vacuumed or analyzed
+                "approx_rows": approx_rows if kind != "v" and approx_rows >= 0 else None,
+                "columns": [],
+                "indexes": [],
+            })
+            table["columns"].append(f"{column} {column_type}{' not null' if not_null else ''}")
+        cursor.execute(INDEXES_QUERY)
+        for schema, name, index, primary, definition in cursor.fetchall():
+            table = tables.get(table_name(schema, name))
+            if table is not None:
+                table["indexes"].append(describe_index(index, primary, definition))
+    conn.rollback()
+    for table in tables.values():
+        if table["kind"] == "view" or not table["indexes"]:
+            del table["indexes"]
+        if table["approx_rows"] is None:
+            del table["approx_rows"]
+    return list(tables.values())
+
+
+class SchemaCache:
+    """Catalog snapshot shared by all tool calls, refreshed on DDL or after `ttl` seconds."""
+
+    def __init__(self, pool, ttl=SCHEMA_TTL):
+        self.pool = pool
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tables = None
+        self._loaded_at = 0.0
+        self._loaded_version = 0
+        self._version = 0
+        self._counters = dict.fromkeys(("hits", "refreshes", "invalidations"), 0)
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+            self._counters["invalidations"] += 1
+
+    def snapshot(self, refresh=False):
+        with self._lock:
+            fresh = (self._tables is not None and time.monotonic() - self._loaded_at < self.ttl
+                     and self._loaded_version == self._version)
+            if fresh and not refresh:
+                self._counters["hits"] += 1
+                return self._tables, time.monotonic() - self._loaded_at
+            version = self._version
+        # Read outside the lock; concurrent refreshes are harmless and rare
+        with self.pool.connection() as conn:
+            tables = read_snapshot(conn)
+        with self._lock:
+            self._tables = tables
+            self._loaded_at = time.monotonic()
+            self._loaded_version = version
+            self._counters["refreshes"] += 1
+        return tables, 0.0
+
+    def views(self):
+        """Names of the views, schema dropped as pg_sql.tables() reports them."""
+        tables, _ = self.snapshot()
+        return {t["name"].rsplit(".", 1)[-1] for t in tables if t["kind"] == "view"}
+
+    def describe(self, table=None, refresh=False):
+        """Compact schema description, optionally limited to tables whose name contains `table`."""
+        tables, age = self.snapshot(refresh)
+        if table:
+            tables = [t for t in tables if table.lower() in t["name"].lower()]
+        return {"tables": tables, "snapshot_age_seconds": round(age, 1)}
+
+    def stats(self):
+        with self._lock:
+            return {**self._counters, "tables": len(self._tables or ()), "ttl": self.ttl}
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+# Lightweight SQL scanning for pgsql_mcp_server.py: statement classification and
+# the tables a statement touches. Not a parser; it only has to be right about
+# literals, quoted identifiers and comments so keywords inside them are ignored.
+
+import re
+
+READ = "read"      # SELECT and friends without side effects
+WRITE = "write"    # DML, locking reads, anything else that changes data
+DDL = "ddl"        # schema changes
+
+# Statements starting with anything else count as writes
+READ_KEYWORDS = {"select", "with", "values", "table", "show", "explain"}
+DDL_KEYWORDS = {"create", "alter", "drop", "comment", "grant", "revoke", "security", "import"}
+
+# Functions whose result changes between identical calls; reads using them are not cacheable
+VOLATILE_FUNCTIONS = {"now", "random", "clock_timestamp", "statement_timestamp", "timeofday",
+                      "nextval", "currval", "lastval", "setval", "txid_current", "gen_random_uuid",
+                      "uuid_generate_v4", "pg_sleep", "current_timestamp", "current_time",
+                      "localtimestamp", "localtime", "current_date"}
+
+_DOLLAR_TAG = re.compile(r"\$([A-Za-z_]\w*)?\$")
+_WORD = re.compile(r'[A-Za-z_][\w$]*|"(?:[^"]|"")*"')
+
+
+def segments(query):
+    """Split SQL into (kind, text) pieces.
+
+    kind is "literal" ('...' or $tag$...$tag$), "identifier" ("..."), "comment",
+    "space" or "code". Joining every text gives back the query.
+    """
+    i, n = 0, len(query)
+    start = 0
+    while i < n:
+        ch = query[i]
+        if ch in "'\"":
+            end = i + 1
+            while end < n:
+                if query[end] == ch:
+                    if end + 1 < n and query[end + 1] == ch:
+                        end += 2
+                        continue
+                    break
+                end += 1
+            kind, end = ("literal" if ch == "'" else "identifier"), min(end + 1, n)
+        elif ch == "$" and (match := _DOLLAR_TAG.match(query, i)):
+            found = query.find(match.group(0), match.end())
+            kind, end = "literal", n if found < 0 else found + len(match.group(0))
+        elif query.startswith("--", i):
+            found = query.find("\n", i)
+            kind, end = "comment", n if found < 0 else found
+        elif query.startswith("/*", i):
+            found = query.find("*/", i + 2)
+            kind, end = "comment", n if found < 0 else found + 2
+        elif ch.isspace():
+            end = i
+            while end < n and query[end].isspace():
+                end += 1
+            kind = "space"
+        else:
+            i += 1
+            continue
+        if start < i:
+            yield "code", query[start:i]
+        yield kind, query[i:end]
+        i = start = end
+    if start < n:
+        yield "code", query[start:]
+
+
+def normalize(query):
+    """The query with comments dropped and whitespace outside literals collapsed."""
+    parts = []
+    for kind, text in segments(query):
+        if kind in ("comment", "space"):
+            if parts and parts[-1] != " ":
+                parts.append(" ")
+        else:
+            parts.append(text)
+    return "".join(parts).strip()
+
+
+def code_only(query):
+    """The query with literals blanked and comments removed, for keyword matching."""
+    parts = []
+    for kind, text in segments(query):
+        if kind == "literal":
+            parts.append("''")
+        elif kind in ("comment", "space"):
+            parts.append(" ")
+        else:
+            parts.append(text)
+    return "".join(parts)
+
+
+def statements(query):
+    """Lower-cased word lists of each statement in `query` (quoted identifiers kept as-is)."""
+    result, words = [], []
+    for kind, text in segments(query):
+        if kind == "identifier":
+            words.append(text)  # may contain ";"
+        elif kind == "code":
+            for i, piece in enumerate(text.split(";")):
+                if i and words:
+                    result.append(words)
+                    words = []
+                words.extend(word if word.startswith('"') else word.lower() for word in _WORD.findall(piece))
+    if words:
+        result.append(words)
+    return result
+
+
+def _statement_kind(words):
+    first = words[0]
+    if first in DDL_KEYWORDS:
+        return DDL
+    if first in READ_KEYWORDS:
+        if first == "explain" and "analyze" in words[1:3]:
+            # EXPLAIN ANALYZE runs the statement it explains
+            return _statement_kind(words[words.index("analyze") + 1:] or ["select"])
+        if any(word in ("insert", "update", "delete", "merge") for word in words[1:]):
+            # Data-modifying CTE, or SELECT ... FOR UPDATE
+            return WRITE
+        if "into" in words and first in ("select", "with"):
+            return DDL   # SELECT ... INTO creates a table
+        if any(word in ("share", "nowait") for word in words) and "for" in words:
+            return WRITE  # FOR SHARE / FOR KEY SHARE take row locks
+        return READ
+    return WRITE
+
+
+def classify(query):
+    """READ, WRITE or DDL for the most invasive statement in `query`."""
+    kinds = {_statement_kind(words) for words in statements(query)}
+    for kind in (DDL, WRITE, READ):
+        if kind in kinds:
+            return kind
+    return WRITE
+
+
+def is_cacheable(query):
+    """Read-only and free of functions whose result changes from call to call."""
+    if classify(query) != READ:
+        return False
+    return not any(word in VOLATILE_FUNCTIONS for words in statements(query) for word in words)
+
+
+# Words after which the next name (or comma-separated names) is a table
+_TABLE_INTRO = {"from", "join", "into", "update", "table", "truncate", "lock", "using", "copy"}
+_LISTS = {"from", "using", "table", "truncate", "lock"}
+_SKIP = {"only", "if", "not", "exists", "lateral", "table"}
+# Words that follow a table name and are not an alias (or that end the name list)
+_NOT_NAMES = {"select", "values", "with", "set", "where", "join", "inner", "left", "right", "full",
+              "cross", "natural", "on", "using", "group", "order", "limit", "offset", "having",
+              "window", "union", "intersect", "except", "for", "returning", "default", "as",
+              "fetch", "tablesample", "add", "drop", "alter", "rename", "owner", "in", "from",
+              "do", "cascade", "restrict", "to", "stdin", "stdout", "(", ")", ",", ";"}
+_TOKEN = re.compile(r'(?:[A-Za-z_][\w$]*|"(?:[^"]|"")*")(?:\.(?:[A-Za-z_][\w$]*|"(?:[^"]|"")*"))*|[(),;]')
+
+
+def name_parts(name):
+    """'Sales."Q1".Orders' -> ["sales", "Q1", "orders"]: the parts of a qualified name as PostgreSQL reads them."""
+    parts = []
+    position = 0
+    while True:
+        match = _WORD.match(name, position)
+        if not match:
+            raise ValueError(f"Invalid name {name!r}; quote parts that are not plain identifiers")
+        token = match.group()
+        parts.append(token[1:-1].replace('""', '"') if token.startswith('"') else token.lower())
+        position = match.end()
+        if position == len(name):
+            return parts
+        if name[position] != ".":
+            raise ValueError(f"Invalid name {name!r}; quote parts that are not plain identifiers")
+        position += 1
+
+
+def _name(token):
+    # Drop the schema; quoted names keep their case
+    token = token.rsplit(".", 1)[-1]
+    return token[1:-1].replace('""', '"') if token.startswith('"') else token
+
+
+def _skip_parens(tokens, j):
+    # Index after the parenthesized group starting at tokens[j], or j when there is none
+    if j >= len(tokens) or tokens[j] != "(":
+        return j
+    depth = 0
+    while j < len(tokens):
+        depth += {"(": 1, ")": -1}.get(tokens[j], 0)
+        j += 1
+        if depth == 0:
+            break
+    return j
+
+
+def tables(query):
+    """Names of the tables a statement reads or writes (schema dropped, lower-case unless quoted)."""
+    tokens = [token if '"' in token else token.lower() for token in _TOKEN.findall(code_only(query))]
+    found = set()
+    for i, intro in enumerate(tokens):
+        if intro not in _TABLE_INTRO:
+            continue
+        j = i + 1
+        while True:
+            while j < len(tokens) and tokens[j] in _SKIP:
+                j += 1
+            if j >= len(tokens) or tokens[j] in _NOT_NAMES:
+                break
+            name = tokens[j]
+            j += 1
+            if j < len(tokens) and tokens[j] == "(" and intro in ("from", "join", "using"):
+                # A function call such as generate_series(...), not a table; tables after it still count
+                j = _skip_parens(tokens, j)
+            else:
+                found.add(_name(name))
+            if intro not in _LISTS:
+                break
+            # FROM a, b x, c AS y(col, ...): step over an optional alias, then continue after a comma
+            if j < len(tokens) and tokens[j] == "as":
+                j += 1
+            if j < len(tokens) and tokens[j] not in _NOT_NAMES:
+                j = _skip_parens(tokens, j + 1)
+            if j < len(tokens) and tokens[j] == ",":
+                j += 1
+                continue
+            break
+    return found
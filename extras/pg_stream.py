@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# Paged reads through PostgreSQL server-side (named) cursors for pgsql_mcp_server.py
+#
+# A stream keeps its pooled connection and read-only transaction open between
+# tool calls, and every call fetches at most one page with FETCH FORWARD, so
+# the server never holds more than a page of rows no matter how big the table is.
+
+import os
+import threading
+import time
+import uuid
+from contextlib import nullcontext
+
+from pg_columnar import compact_json, cursor_factory, encode
+
+# Streaming configuration (override through the environment)
+STREAM_PAGE_SIZE = int(os.getenv("DB_STREAM_PAGE_SIZE", "500"))        # rows per page unless the caller asks
+STREAM_MAX_PAGE_SIZE = int(os.getenv("DB_STREAM_MAX_PAGE_SIZE", "5000"))
+STREAM_MAX_ROWS = int(os.getenv("DB_STREAM_MAX_ROWS", "50000"))        # hard cap on rows returned per stream
+STREAM_MAX_OPEN = int(os.getenv("DB_STREAM_MAX_OPEN", "4"))            # each open stream holds a pool connection
+STREAM_IDLE_TIMEOUT = float(os.getenv("DB_STREAM_IDLE_TIMEOUT", "120"))
+
+
+class StreamError(Exception):
+    """A stream token is unknown or expired, or no stream slot is free."""
+
+
+class _Stream:
+    def __init__(self, token, pool, conn, cursor, page_size, layout):
+        self.token = token
+        self.pool = pool
+        self.conn = conn
+        self.cursor = cursor
+        self.page_size = page_size
+        self.layout = layout
+        self.rows_sent = 0
+        # Row read ahead to detect the end of the result without an extra round trip
+        self.lookahead = []
+        self.last_used = time.monotonic()
+
+
+class StreamRegistry:
+    """Open named-cursor streams keyed by their continuation token."""
+
+    def __init__(self, pool, page_size=STREAM_PAGE_SIZE, max_rows=STREAM_MAX_ROWS,
+                 max_open=STREAM_MAX_OPEN, idle_timeout=STREAM_IDLE_TIMEOUT, prepare=None, reader=None,
+                 track=nullcontext):
+        self.pool = pool
+        # Optional reader() returning the pool a new stream reads from (a replica, say)
+        self.reader = reader
+        # Optional check run as prepare(cursor, query, params) before the cursor is declared
+        self.prepare = prepare
+        # Context manager entered as track(conn) around each statement and fetch of a stream,
+        # so the tool call running it can cancel it (pg_async.tracking)
+        self.track = track
+        self.page_size = page_size
+        self.max_rows = max_rows
+        self.max_open = max_open
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._streams = {}
+        self._expired = 0
+
+    def _release(self, stream):
+        try:
+            stream.cursor.close()
+        except Exception:
+            pass
+        # putconn rolls the read-only transaction back, or drops a broken connection
+        stream.pool.putconn(stream.conn)
+
+    def _sweep(self):
+        # Abandoned streams would otherwise pin their connections forever
+        now = time.monotonic()
+        with self._lock:
+            # None marks a slot whose stream is being opened or fetched right now
+            stale = [s for s in self._streams.values() if s is not None and now - s.last_used > self.idle_timeout]
+            for stream in stale:
+                del self._streams[stream.token]
+            self._expired += len(stale)
+        for stream in stale:
+            self._release(stream)
+
+    def open(self, query, params=None, page_size=None, layout="rows"):
+        """Declare a server-side cursor for `query` and return its first page."""
+        self._sweep()
+        # Clamped to [1, max]: FETCH FORWARD with a negative count would read backwards
+        page_size = max(1, min(page_size or self.page_size, STREAM_MAX_PAGE_SIZE))
+        with self._lock:
+            if len(self._streams) >= self.max_open:
+                raise StreamError(f"{self.max_open} streams are already open; read them to the end "
+                                  "or close them with close_stream before starting another")
+            # Reserve the slot before checking out a connection
+            token = f"stream_{uuid.uuid4().hex}"
+            self._streams[token] = None
+        try:
+            pool = self.reader() if self.reader else self.pool
+            conn = pool.getconn()
+        except Exception:
+            with self._lock:
+                del self._streams[token]
+            raise
+        try:
+            with self.track(conn):
+                with conn.cursor() as setup:
+                    # Streams are for reads; a write in a long-lived transaction would hold locks
+                    setup.execute("SET TRANSACTION READ ONLY")
+                    if self.prepare:
+                        self.prepare(setup, query, params)
+                # The token doubles as the cursor name
+                cursor = conn.cursor(name=token, cursor_factory=cursor_factory(layout))
+                cursor.execute(query, params)
+        except Exception:
+            with self._lock:
+                del self._streams[token]
+            pool.putconn(conn)
+            raise
+        stream = _Stream(token, pool, conn, cursor, page_size, layout)
+        with self._lock:
+            self._streams[token] = stream
+        return self._next_page(stream)
+
+    def fetch(self, token):
+        """Return the next page of an open stream."""
+        self._sweep()
+        with self._lock:
+            stream = self._streams.get(token)
+            if stream is None:
+                raise StreamError("Unknown or expired stream token; run stream_query again")
+            # Take it out while fetching so a concurrent call with the same token cannot interleave
+            self._streams[token] = None
+        return self._next_page(stream)
+
+    def close(self, token):
+        with self._lock:
+            if self._streams.get(token) is None:
+                return False
+            stream = self._streams.pop(token)
+        self._release(stream)
+        return True
+
+    def _next_page(self, stream):
+        limit = min(stream.page_size, self.max_rows - stream.rows_sent)
+        try:
+            # Ask for one extra row so the last page is recognised without another round trip
+            with self.track(stream.conn):
+                rows = stream.lookahead + stream.cursor.fetchmany(limit + 1 - len(stream.lookahead))
+        except Exception:
+            with self._lock:
+                self._streams.pop(stream.token, None)
+            self._release(stream)
+            raise
+        description = stream.cursor.description
+        more = len(rows) > limit
+        rows, stream.lookahead = rows[:limit], rows[limit:]
+        stream.rows_sent += len(rows)
+        truncated = more and stream.rows_sent >= self.max_rows
+        if more and not truncated:
+            stream.last_used = time.monotonic()
+            with self._lock:
+                self._streams[stream.token] = stream
+            next_token = stream.token
+        else:
+            with self._lock:
+                self._streams.pop(stream.token, None)
+            self._release(stream)
+            next_token = None
+        if stream.layout != "rows":
+            # {"columns": [...], "rows" or "data": [...], "row_count": n}
+            return compact_json({**encode(description, rows, stream.layout),
+                                 "rows_sent": stream.rows_sent, "next_token": next_token, "truncated": truncated})
+        return {
+            "rows": rows,
+            "row_count": len(rows),
+            "rows_sent": stream.rows_sent,
+            "next_token": next_token,
+            "truncated": truncated,
+        }
+
+    def stats(self):
+        with self._lock:
+            return {"open": len(self._streams), "expired": self._expired, "max_open": self.max_open,
+                    "page_size": self.page_size, "max_rows": self.max_rows}
+
+    def close_all(self):
+        with self._lock:
+            streams = [s for s in self._streams.values() if s is not None]
+            self._streams.clear()
+        for stream in streams:
+            self._release(stream)
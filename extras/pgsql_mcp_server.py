@@ -3,66 +3,241 @@
 
 from mcp.server.fastmcp import FastMCP
 import psycopg2, os, json, sys
-from psycopg2.extras import RealDictCursor
+import psycopg2.errors
 from decimal import Decimal
+from functools import partial
 from dotenv import load_dotenv
+from pg_async import ThreadOffload, tracking
+from pg_bulk import bulk_load
+from pg_columnar import check_format, compact_json, cursor_factory, format_rows
+from pg_guardrails import add_default_limit, guard, set_statement_timeout, timeout_error, truncation
+from pg_pool import ConnectionPool
+from pg_prepared import PreparedStatementCache
+from pg_result_cache import QueryResultCache
+from pg_router import REPLICA_HOSTS, ReadWriteRouter, parse_hosts
+from pg_schema import SchemaCache
+from pg_sql import DDL, READ, WRITE, classify, is_cacheable, name_parts, tables
+from pg_stream import StreamRegistry
+
+import src_path  # puts src/ on sys.path
+from mcp_transport import run_server
 
 load_dotenv()
 
 # Connect to the PostgreSQL database
-def connect_db():
+# (host and port default to DB_HOST / DB_PORT; replicas pass their own)
+def connect_db(host=None, port=None):
     try:
         conn = psycopg2.connect(
             dbname=os.getenv("DB_NAME"),
             user=os.getenv("DB_USER"),
             password=os.getenv("DB_PASSWORD"),
-            host=os.getenv("DB_HOST"),
-            port=os.getenv("DB_PORT")
+            host=host or os.getenv("DB_HOST"),
+            port=port or os.getenv("DB_PORT"),
+            connect_timeout=int(os.getenv("DB_CONNECT_TIMEOUT", "5"))
         )
         return conn
     except Exception as e:
-        print(f"❌ Database connection error: {e}")
+        # stdout carries the MCP protocol, so diagnostics go to stderr
+        print(f"❌ Database connection error: {e}", file=sys.stderr)
         raise e
 
 # Instantiate an MCP server instance with a name
 mcp = FastMCP("PGSQLMCPServer")
 
-# Connect to the database
-db_conn = connect_db()
+# MCP_SERVER_MODE=async runs the database tools on worker threads (DB_THREADS at a
+# time) so a slow query does not hold up other tool calls, and cancels the query
+# when the client cancels the call (see pg_async.py)
+ASYNC_MODE = os.getenv("MCP_SERVER_MODE", "sync").lower() == "async"
+offload = ThreadOffload()
+
+def db_tool(func):
+    # Register `func` as a tool, as a coroutine in async mode; `func` itself stays a plain function
+    mcp.tool()(offload.wrap(func) if ASYNC_MODE else func)
+    return func
+
+# Connections are opened on the first query, so the server starts even while the
+# database is unreachable (sized via DB_POOL_* env vars, see pg_pool.py)
+pool = ConnectionPool(connect_db)
+
+# Reads go to the replicas in DB_REPLICA_HOSTS when set, writes and DDL to the
+# primary (policy, lag threshold and read-after-write window: see pg_router.py)
+router = ReadWriteRouter(pool, [
+    (f"{host}:{port}", ConnectionPool(partial(connect_db, host, port)))
+    for host, port in parse_hosts(REPLICA_HOSTS, os.getenv("DB_PORT"))
+])
+
+# Parameterized statements prepared once per connection (opt-in with DB_PREPARED_CACHE_SIZE, see pg_prepared.py)
+statements = PreparedStatementCache()
+
+# Results of read-only queries, dropped when a write touches their tables
+# (off by default; enable with DB_RESULT_CACHE_TTL, size with DB_RESULT_CACHE_MAX_BYTES)
+results = QueryResultCache()
+
+# Catalog snapshot for describe_schema, re-read after DDL or DB_SCHEMA_TTL seconds
+schema = SchemaCache(pool)
+
+# Open server-side cursors for stream_query, keyed by continuation token (DB_STREAM_* env vars)
+# (each statement and page fetch is tracked, so cancelling stream_query or fetch_more stops it)
+streams = StreamRegistry(pool, prepare=guard, reader=router.reader, track=tracking)
 
-# Ensure the database connection is established before starting the server
-if not db_conn:
-    print("❌ Could not connect to the database. Exiting.")
-    sys.exit(1)
-else:
-    print("✅ Database connection established.")
 
+# Result layout unless the caller picks one: "rows" (a dict per row), "columnar"
+# (column names once plus value rows) or "columns" (one array per column)
+RESULT_FORMAT = check_format(os.getenv("DB_RESULT_FORMAT", "rows"))
 
-# Ensure the database connection is closed when the server stops
+# Ensure the database connections are closed when the server stops
 
 def close_db_connection():
-    if db_conn:
-        db_conn.close()
-        print("✅ Database connection closed.")
-    else:
-        print("⚠️ No database connection to close.")
+    streams.close_all()
+    router.close()
+    pool.close()
+    print("✅ Database connections closed.", file=sys.stderr)
+
+def run_query(target, query, params, format, row_limit=None):
+    # One guarded statement on a connection from `target`, committed; returns the formatted rows.
+    # `row_limit` is set when add_default_limit added the LIMIT (which fetches one row more)
+    # Tracked so a cancelled tool call stops the query, until the connection goes back to the pool
+    with target.connection() as conn, tracking(conn):
+        with conn.cursor() as guard_cursor:
+            # Statement timeout and EXPLAIN cost check (see pg_guardrails.py)
+            guard(guard_cursor, query, params)
+        with conn.cursor(cursor_factory=cursor_factory(format)) as cursor:
+            try:
+                statements.execute(cursor, query, params)
+            except psycopg2.errors.QueryCanceled:
+                raise timeout_error() from None
+            rows = None
+            if cursor.description:  # If the query returns rows
+                fetched = cursor.fetchall()
+                if row_limit is not None and len(fetched) > row_limit:
+                    rows = format_rows(cursor.description, fetched[:row_limit], format, **truncation(row_limit))
+                else:
+                    rows = format_rows(cursor.description, fetched, format)
+        conn.commit()  # Commit writes, including INSERT ... RETURNING
+    return rows
 
 # Define a tool function using a decorator
 
-@mcp.tool()
-def execute_query(query, params=None):
-    """Execute a SQL query and return the result."""
+@db_tool
+def execute_query(query, params=None, format: str = RESULT_FORMAT):
+    """Execute a SQL query and return the result.
+
+    `format` is "rows" (a dict per row), "columnar" (column names once plus value
+    rows) or "columns" (one array per column); the last two are much smaller for
+    large results. Reads without a LIMIT return at most DB_QUERY_DEFAULT_LIMIT
+    rows; when that cuts the result it comes back as {"rows": ..., "truncated": true}
+    (or with "truncated" next to the columns). One statement per call; queries the
+    planner estimates to be too expensive are rejected with hints on how to narrow them.
+    """
     try:
-        with db_conn.cursor(cursor_factory=RealDictCursor) as cursor:
-            cursor.execute(query, params)
-            if cursor.description:  # If the query returns rows
-                return cursor.fetchall()
-            
-            db_conn.commit()  # Commit if it's an insert/update/delete
+        check_format(format)
+        query, row_limit = add_default_limit(query)
+        kind = classify(query)
+        cache_key = None
+        if results.enabled and kind == READ and is_cacheable(query):
+            read_tables = tables(query)
+            # Writes to a view's base tables would not invalidate it
+            if not read_tables & schema.views():
+                cache_key = results.key(query, params, format)
+                found, rows = results.lookup(cache_key)
+                if found:
+                    return rows
+                generation = results.generation()
+        target = router.pool_for(kind)
+        try:
+            rows = run_query(target, query, params, format, row_limit)
+        except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
+            # A replica that dropped the connection (no SQLSTATE) is retried on the primary;
+            # reads are safe to repeat
+            if target is pool or getattr(e, "pgcode", None):
+                raise
+            router.failed(target, e)
+            rows = run_query(pool, query, params, format, row_limit)
+        except psycopg2.errors.ReadOnlySqlTransaction:
+            # Classified as a read but it writes (a function with side effects, say)
+            if target is pool:
+                raise
+            rows = run_query(pool, query, params, format, row_limit)
+            kind, cache_key = WRITE, None
+        if kind != READ:
+            router.wrote()
+        if cache_key is not None and rows is not None:
+            results.store(cache_key, rows, read_tables, generation)
+        elif kind != READ:
+            # DDL, or a write whose tables we cannot tell, drops every cached result
+            written = tables(query) if kind == WRITE else None
+            results.invalidate(written or None)
+            if kind == DDL:
+                schema.invalidate()
+        return rows
+    except Exception as e:
+        print(f"❌ Query execution error: {e}", file=sys.stderr)
+        raise e
+
+@db_tool
+def describe_schema(table: str | None = None, refresh: bool = False):
+    """Describe the database: tables and views with their columns, types, indexes and approximate row counts.
+
+    Call this before writing queries. `table` limits the answer to tables whose
+    name contains it; `refresh` re-reads the catalog instead of using the snapshot.
+    """
+    return compact_json(schema.describe(table, refresh))
+
+@db_tool
+def bulk_insert(table: str, rows: list | None = None, columns: list[str] | None = None,
+                csv_text: str | None = None, ndjson: str | None = None, method: str = "copy"):
+    """Insert many rows into `table` in one transaction; much faster than one execute_query per row.
+
+    Pass exactly one of `rows` (objects, or lists together with `columns`),
+    `csv_text` (first line names the columns) or `ndjson` (one object per line).
+    `method` is "copy" (COPY FROM STDIN) or "values" (batched INSERT). `table` is
+    read as in SQL: lower-case unless double-quoted. An empty CSV field is NULL.
+    """
+    try:
+        with pool.connection() as conn, tracking(conn):
+            with conn.cursor() as cursor:
+                set_statement_timeout(cursor)
+            result = bulk_load(conn, table, rows, columns, csv_text, ndjson, method)
+        router.wrote()
+        # Cached results are keyed by table name as the pg_sql scanner reads it
+        results.invalidate({name_parts(table)[-1]})
+        return result
     except Exception as e:
-        print(f"❌ Query execution error: {e}")
+        print(f"❌ Bulk insert error: {e}", file=sys.stderr)
         raise e
 
+@db_tool
+def stream_query(query, params=None, page_size: int | None = None, format: str = RESULT_FORMAT):
+    """Run a SELECT through a server-side cursor and return its first page of rows.
+
+    Use this instead of execute_query for large results. While `next_token` is
+    not null, pass it to fetch_more for the next page; `truncated` means the
+    row cap was reached. `format` is as for execute_query.
+    """
+    try:
+        return streams.open(query, params, page_size, check_format(format))
+    except Exception as e:
+        print(f"❌ Query execution error: {e}", file=sys.stderr)
+        raise e
+
+@db_tool
+def fetch_more(token: str):
+    """Return the next page of a stream_query result."""
+    return streams.fetch(token)
+
+@db_tool
+def close_stream(token: str):
+    """Release a stream_query result that will not be read to the end."""
+    return {"closed": streams.close(token)}
+
+@mcp.tool()
+def get_pool_stats():
+    """Report database connection pool, replica routing, stream, prepared-statement and result cache usage for sizing."""
+    return {**pool.stats(), "routing": router.stats(), "streams": streams.stats(), "prepared_statements": statements.stats(),
+            "result_cache": results.stats(), "schema": schema.stats(),
+            **({"offload": offload.stats()} if ASYNC_MODE else {})}
+
 # @mcp.tool()
 # def get_customer_details(customer_id: int):
 #     """Get customer details by ID."""
@@ -84,5 +259,9 @@ if __name__ == "__main__":
     # This server will be launched automatically by the MCP stdio agent
     # You don't need to run this file directly - it will be spawned as a subprocess
     
-    # Run the MCP server using standard input/output transport
-    mcp.run(transport="stdio") 
\ No newline at end of file
+    # stdio by default; see src/mcp_transport.py for --transport streamable-http|sse.
+    # One process only: stream tokens, the read-after-write pin and the result cache are per process
+    try:
+        run_server(mcp, single_process="stream_query tokens, the read-after-write pin and the result cache")
+    finally:
+        close_db_connection() 
\ No newline at end of file
@@ -3,6 +3,9 @@
 
 from mcp.server.fastmcp import FastMCP
 
+import src_path  # puts src/ on sys.path
+from mcp_transport import run_server
+
 # Instantiate an MCP server instance with a name
 mcp = FastMCP("CalculatorServer")
 
@@ -40,5 +43,5 @@ if __name__ == "__main__":
     # This server will be launched automatically by the MCP stdio agent
     # You don't need to run this file directly - it will be spawned as a subprocess
     
-    # Run the MCP server using standard input/output transport
-    mcp.run(transport="stdio") 
\ No newline at end of file
+    # stdio by default; see src/mcp_transport.py for --transport streamable-http|sse
+    run_server(mcp)
\ No newline at end of file
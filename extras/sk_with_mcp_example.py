@@ -9,13 +9,15 @@ from dotenv import load_dotenv
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatPromptExecutionSettings
 from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
-from semantic_kernel.connectors.mcp import MCPStdioPlugin
-from semantic_kernel.contents import ChatHistory
 from semantic_kernel.contents.streaming_chat_message_content import StreamingChatMessageContent
 from semantic_kernel.contents.utils.author_role import AuthorRole
 from semantic_kernel.functions import KernelArguments
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 
+import src_path  # puts src/ on sys.path
+from mcp_connect import connect_mcp_plugin
+from chat_history_manager import ChatHistoryManager, chat_prompt_config
+
 async def main():
     # Load environment variables from .env file
     current_dir = pathlib.Path(__file__).parent
@@ -57,11 +59,8 @@ async def main():
     settings.function_choice_behavior = FunctionChoiceBehavior.Auto()
     
     # Configure and use the MCP plugin for our calculator using async context manager
-    async with MCPStdioPlugin(
-        name="CalcServer", 
-        command="python",
-        args=[str(mcp_server_path)]  # Use absolute path to our MCP server script
-    ) as mcp_plugin:
+    # With SIMPLE_MCP_SERVER_URLS set (see src/mcp_server_pool.py) this attaches to a running server instead
+    async with connect_mcp_plugin("CalcServer", mcp_server_path, "SIMPLE_MCP_SERVER_URLS") as mcp_plugin:
         # Register the MCP plugin with the kernel
         try:
             kernel.add_plugin(mcp_plugin, plugin_name="calculator")
@@ -69,18 +68,20 @@ async def main():
             print(f"Error: Could not register the MCP plugin: {str(e)}")
             sys.exit(1)
         
-        # Create a chat history with system instructions
-        history = ChatHistory()
-        history.add_system_message(
+        # Chat history with system instructions, compacted to a token budget each turn
+        # (CHAT_HISTORY_* env vars, see src/chat_history_manager.py)
+        history = ChatHistoryManager(
             "You are a math assistant. Use the calculator tools when needed to solve math problems. "
             "You have access to add_numbers, subtract_numbers, multiply_numbers, and divide_numbers functions."
         )
+        # Large tool results are cut to their key fields before the model reads them
+        history.trim_tool_results(kernel)
         
         # Define a simple chat function
         chat_function = kernel.add_function(
             plugin_name="chat",
-            function_name="respond", 
-            prompt="{{$chat_history}}"
+            function_name="respond",
+            prompt_template_config=chat_prompt_config()
         )
         
         print("\n┌────────────────────────────────────────────┐")
@@ -102,7 +103,7 @@ async def main():
             
             # Prepare arguments with history and settings
             arguments = KernelArguments(
-                chat_history=history,
+                chat_history=history.for_prompt(),
                 settings=settings
             )
             
@@ -125,6 +126,7 @@ async def main():
                 # Add the full response to history
                 full_response = "".join(str(chunk) for chunk in response_chunks)
                 history.add_assistant_message(full_response)
+                history.report()
                 
             except Exception as e:
                 print(f"\nError: {str(e)}")
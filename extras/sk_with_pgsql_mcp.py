@@ -9,13 +9,15 @@ from dotenv import load_dotenv
 from semantic_kernel import Kernel
 from semantic_kernel.connectors.ai.open_ai import OpenAIChatPromptExecutionSettings
 from semantic_kernel.connectors.ai.function_choice_behavior import FunctionChoiceBehavior
-from semantic_kernel.connectors.mcp import MCPStdioPlugin
-from semantic_kernel.contents import ChatHistory
 from semantic_kernel.contents.streaming_chat_message_content import StreamingChatMessageContent
 from semantic_kernel.contents.utils.author_role import AuthorRole
 from semantic_kernel.functions import KernelArguments
 from semantic_kernel.connectors.ai.open_ai import AzureChatCompletion
 
+import src_path  # puts src/ on sys.path
+from mcp_connect import connect_mcp_plugin
+from chat_history_manager import ChatHistoryManager, chat_prompt_config
+
 async def main():
     # Load environment variables from .env file
     current_dir = pathlib.Path(__file__).parent
@@ -57,11 +59,8 @@ async def main():
     settings.function_choice_behavior = FunctionChoiceBehavior.Auto()
     
     # Configure and use the MCP plugin for our calculator using async context manager
-    async with MCPStdioPlugin(
-        name="PGSQLMCPServer", 
-        command="python",
-        args=[str(mcp_server_path)]  # Use absolute path to our MCP server script
-    ) as mcp_plugin:
+    # With PGSQL_MCP_SERVER_URLS set (see src/mcp_server_pool.py) this attaches to a running server instead
+    async with connect_mcp_plugin("PGSQLMCPServer", mcp_server_path, "PGSQL_MCP_SERVER_URLS") as mcp_plugin:
         # Register the MCP plugin with the kernel
         try:
             kernel.add_plugin(mcp_plugin, plugin_name="customer_details")
@@ -69,22 +68,24 @@ async def main():
             print(f"Error: Could not register the MCP plugin: {str(e)}")
             sys.exit(1)
         
-        # Create a chat history with system instructions
-        history = ChatHistory()
-        history.add_system_message(
+        # Chat history with system instructions, compacted to a token budget each turn
+        # (CHAT_HISTORY_* env vars, see src/chat_history_manager.py)
+        history = ChatHistoryManager(
             "You are a highly skilled business analyst with extensive experience in writing SQL queries who has been tasked to query a set of tables from a database."
             "The database contains information about customers in the table customerdata. You must use customerdata table to answer questions about customers."
-            "The table customerdata has the following columns: customer_id, card_blocked, payment_due, card_type and credit_card_no."
+            "Call describe_schema once to learn the columns, types and indexes of customerdata before writing queries."
             "You have access to execute_query function which can execute SQL queries and return the result."
             "You must use the execute_query function to fetch data from the database."
             "Describe the customer details in words and do not return the raw data."
         )
+        # Large tool results are cut to their key fields before the model reads them
+        history.trim_tool_results(kernel)
         
         # Define a simple chat function
         chat_function = kernel.add_function(
             plugin_name="chat",
-            function_name="respond", 
-            prompt="{{$chat_history}}"
+            function_name="respond",
+            prompt_template_config=chat_prompt_config()
         )
         
         print("\n┌────────────────────────────────────────────┐")
@@ -106,7 +107,7 @@ async def main():
             
             # Prepare arguments with history and settings
             arguments = KernelArguments(
-                chat_history=history,
+                chat_history=history.for_prompt(),
                 settings=settings
             )
             
@@ -129,6 +130,7 @@ async def main():
                 # Add the full response to history
                 full_response = "".join(str(chunk) for chunk in response_chunks)
                 history.add_assistant_message(full_response)
+                history.report()
                 
             except Exception as e:
                 print(f"\nError: {str(e)}")
@@ -0,0 +1,11 @@
+#!/usr/bin/env python3
+# Importing this module makes the shared modules in src/ importable from extras/
+# (mcp_transport, mcp_connect, chat_history_manager, ...).
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
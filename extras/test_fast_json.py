@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# Tests that fast_json writes the same JSON with orjson as with the standard library.
+#
+#   python -m pytest extras/test_fast_json.py
+
+import dataclasses
+import datetime
+import decimal
+import json
+import unittest
+import uuid
+
+import src_path  # puts src/ on sys.path
+import fast_json
+from flask.json.provider import DefaultJSONProvider
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+VALUES = [
+    {"id": "1", "name": "Café", "price": 1200.5, "tags": ["a", None, True]},
+    {1: "int key", "nested": {2: [1, 2]}},
+    {"price": decimal.Decimal("19.99")},
+    {"when": datetime.datetime(2024, 1, 2, 3, 4, 5), "day": datetime.date(2024, 1, 2)},
+    {"id": uuid.UUID("12345678-1234-5678-1234-567812345678")},
+    {"point": Point(1, 2)},
+]
+
+
+def stdlib_dumps(obj, default=None):
+    # What FAST_JSON=0 (or no orjson) would write
+    return fast_json._stdlib_dumps(obj, default)
+
+
+@unittest.skipUnless(fast_json.BACKEND == "orjson", "orjson is not installed")
+class BackendsAgreeTest(unittest.TestCase):
+    def test_same_text_with_flask_default(self):
+        for value in VALUES:
+            with self.subTest(value=value):
+                self.assertEqual(fast_json.dumps(value, DefaultJSONProvider.default),
+                                 stdlib_dumps(value, DefaultJSONProvider.default))
+
+    def test_same_text_without_default(self):
+        for value in (VALUES[0], VALUES[1], VALUES[4]):
+            with self.subTest(value=value):
+                self.assertEqual(fast_json.dumps(value), stdlib_dumps(value))
+
+    def test_unknown_types_fail_on_both(self):
+        for value in (VALUES[2], VALUES[3], VALUES[5], {"x": object()}):
+            with self.subTest(value=value):
+                with self.assertRaises(TypeError):
+                    fast_json.dumps(value)
+                with self.assertRaises(TypeError):
+                    stdlib_dumps(value)
+
+
+class RoundTripTest(unittest.TestCase):
+    def test_compact_utf8(self):
+        self.assertEqual(fast_json.dumps({"a": [1, "é"]}), '{"a":[1,"é"]}'.encode("utf-8"))
+        self.assertEqual(fast_json.loads(b'{"a":[1,"\\u00e9"]}'), {"a": [1, "é"]})
+        self.assertEqual(json.loads(fast_json.dumps_str({"b": 2.5})), {"b": 2.5})
+
+
+if __name__ == "__main__":
+    unittest.main()
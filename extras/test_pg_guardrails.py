@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Tests for the pg_guardrails.py checks that run without a database: LIMIT detection,
+# the default LIMIT added to reads and the single-statement rule.
+#
+#   python -m pytest extras/test_pg_guardrails.py
+
+import unittest
+
+from pg_guardrails import QueryRejected, add_default_limit, check_single_statement, has_top_level_limit
+
+
+class HasTopLevelLimitTest(unittest.TestCase):
+    def test_limit_clauses(self):
+        cases = [
+            ("SELECT * FROM t LIMIT 5", True),
+            ("select * from t limit all", True),
+            ("SELECT * FROM t LIMIT %s", True),
+            ("SELECT * FROM t LIMIT $1 OFFSET 10", True),
+            ("SELECT * FROM t LIMIT (SELECT 5)", True),
+            ("SELECT * FROM t ORDER BY a FETCH FIRST 3 ROWS ONLY", True),
+            ("SELECT * FROM t OFFSET 5 FETCH NEXT 3 ROWS ONLY", True),
+            ("SELECT * FROM t", False),
+            # Only the outermost query counts
+            ("SELECT * FROM (SELECT * FROM t LIMIT 5) s", False),
+            ("WITH s AS (SELECT * FROM t LIMIT 5) SELECT * FROM s", False),
+            # Not clauses: a column, a literal, a quoted identifier, a comment
+            ("SELECT limit FROM t", False),
+            ("SELECT t.limit FROM t", False),
+            ("SELECT 'limit 5' FROM t", False),
+            ('SELECT "limit" FROM t', False),
+            ("SELECT * FROM t -- LIMIT 5", False),
+            ("SELECT * FROM t /* LIMIT 5 */", False),
+            ("SELECT fetch FROM t", False),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(has_top_level_limit(query), expected)
+
+
+class CheckSingleStatementTest(unittest.TestCase):
+    def test_one_statement(self):
+        for query in ("SELECT 1", "SELECT 1;", "SELECT ';'", 'SELECT * FROM "a;b"', "SELECT 1 -- ; DROP TABLE t"):
+            with self.subTest(query=query):
+                check_single_statement(query)
+
+    def test_several_statements_are_rejected(self):
+        for query in ("SELECT 1; SELECT 2", "SELECT 1; DROP TABLE t", "SELECT ';'; DELETE FROM t"):
+            with self.subTest(query=query):
+                with self.assertRaises(QueryRejected) as raised:
+                    check_single_statement(query)
+                self.assertEqual(raised.exception.details["reason"], "multiple_statements")
+
+
+class AddDefaultLimitTest(unittest.TestCase):
+    def test_reads_get_one_row_more_than_the_limit(self):
+        cases = [
+            ("SELECT * FROM t", "SELECT * FROM t LIMIT 11"),
+            ("select * from t;", "select * from t LIMIT 11"),
+            ("SELECT a FROM t -- all of them", "SELECT a FROM t LIMIT 11"),
+            ("SELECT a FROM t /* no limit */ ;", "SELECT a FROM t LIMIT 11"),
+            ("SELECT 'limit 5;' FROM t", "SELECT 'limit 5;' FROM t LIMIT 11"),
+            ('SELECT "limit" FROM "My Table"', 'SELECT "limit" FROM "My Table" LIMIT 11'),
+            ("WITH s AS (SELECT a FROM t) SELECT * FROM s", "WITH s AS (SELECT a FROM t) SELECT * FROM s LIMIT 11"),
+            ("VALUES (1), (2)", "VALUES (1), (2) LIMIT 11"),
+            ("TABLE t", "TABLE t LIMIT 11"),
+            # The LIMIT applies to the whole UNION
+            ("SELECT a FROM t UNION SELECT a FROM u", "SELECT a FROM t UNION SELECT a FROM u LIMIT 11"),
+            ("(SELECT a FROM t LIMIT 5) UNION ALL SELECT a FROM u",
+             "(SELECT a FROM t LIMIT 5) UNION ALL SELECT a FROM u LIMIT 11"),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(add_default_limit(query, 10), (expected, 10))
+
+    def test_statements_that_write_are_left_alone(self):
+        queries = [
+            "SELECT * INTO new_t FROM big",
+            "WITH s AS (SELECT * FROM a) INSERT INTO b SELECT * FROM s",
+            "WITH s AS (SELECT id FROM a) UPDATE b SET x = 1 WHERE id IN (SELECT id FROM s)",
+            "WITH s AS (SELECT id FROM a) DELETE FROM b WHERE id IN (SELECT id FROM s)",
+            "WITH moved AS (DELETE FROM a RETURNING *) SELECT * FROM moved",
+            "SELECT * FROM t FOR UPDATE",
+            "SELECT * FROM t FOR SHARE",
+            "INSERT INTO t SELECT * FROM u",
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual(add_default_limit(query, 10), (query, None))
+
+    def test_queries_with_a_limit_or_several_statements_are_left_alone(self):
+        queries = [
+            "SELECT * FROM t LIMIT 5",
+            "SELECT * FROM t LIMIT $1",
+            "SELECT * FROM t FETCH FIRST 5 ROWS ONLY",
+            "SELECT 1; SELECT 2",
+            "SHOW search_path",
+        ]
+        for query in queries:
+            with self.subTest(query=query):
+                self.assertEqual(add_default_limit(query, 10), (query, None))
+
+    def test_zero_disables_the_default_limit(self):
+        self.assertEqual(add_default_limit("SELECT * FROM t", 0), ("SELECT * FROM t", None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# Tests for pg_pool.ConnectionPool against an in-memory stand-in for a DB-API connection.
+#
+#   python -m pytest extras/test_pg_pool.py      (or: python -m unittest discover -s extras)
+
+import random
+import sys
+import threading
+import time
+import unittest
+
+from pg_pool import ConnectionPool, PoolTimeout
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query):
+        if self.conn.broken or self.conn.closed:
+            raise ConnectionError("server closed the connection unexpectedly")
+
+    def fetchall(self):
+        return [(1,)]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, server):
+        self.server = server
+        self.closed = 0
+        self.broken = False  # the socket died without the client noticing
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        if not self.closed:
+            self.closed = 1
+            self.server.disconnected()
+
+
+class FakeServer:
+    """Counts the connections open at once, as the database would."""
+
+    def __init__(self):
+        self.connects = 0
+        self.open = 0
+        self.peak = 0
+        self.down = False
+        self._lock = threading.Lock()
+
+    def connect(self):
+        if self.down:
+            raise ConnectionError("could not connect to server")
+        with self._lock:
+            self.connects += 1
+            self.open += 1
+            self.peak = max(self.peak, self.open)
+        return FakeConnection(self)
+
+    def disconnected(self):
+        with self._lock:
+            self.open -= 1
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeServer()
+
+    def make_pool(self, **options):
+        pool = ConnectionPool(self.server.connect, **options)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_does_not_connect_before_first_use(self):
+        self.make_pool(min_size=2)
+        self.assertEqual(self.server.connects, 0)
+
+    def test_concurrent_checkouts_share_at_most_max_size_connections(self):
+        pool = self.make_pool(min_size=2, max_size=4, timeout=5)
+
+        def worker():
+            for _ in range(50):
+                with pool.connection() as conn:
+                    conn.cursor().execute("SELECT 1")
+                    time.sleep(0.001)
+
+        threads = [threading.Thread(target=worker) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = pool.stats()
+        self.assertEqual(stats["checkouts"], 800)
+        self.assertLessEqual(stats["size"], 4)
+        self.assertLessEqual(self.server.peak, 4)
+
+    def test_broken_connection_is_replaced_on_checkout(self):
+        pool = self.make_pool(min_size=0, max_size=2, check_after=0)
+        with pool.connection() as conn:
+            first = conn
+        first.broken = True
+        with pool.connection() as conn:
+            self.assertIsNot(conn, first)
+        self.assertTrue(first.closed)
+        stats = pool.stats()
+        self.assertEqual(stats["health_check_failures"], 1)
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(self.server.open, 1)
+
+    def test_reconnect_keeps_the_slot_of_the_failed_connection(self):
+        # While a dead connection is replaced, a waiter must not take its slot
+        pool = self.make_pool(min_size=0, max_size=3, timeout=5, check_after=0)
+        rng = random.Random(7)
+        # Switch threads often so waiters get to run between the pool's critical sections
+        self.addCleanup(sys.setswitchinterval, sys.getswitchinterval())
+        sys.setswitchinterval(1e-6)
+
+        def worker():
+            for _ in range(200):
+                with pool.connection() as conn:
+                    if rng.random() < 0.3:
+                        conn.broken = True
+                    time.sleep(0.0005)
+
+        threads = [threading.Thread(target=worker) for _ in range(12)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreater(pool.stats()["health_check_failures"], 0)
+        self.assertLessEqual(self.server.peak, 3)
+        self.assertLessEqual(pool.stats()["size"], 3)
+
+    def test_failed_reconnect_gives_the_slot_back(self):
+        pool = self.make_pool(min_size=0, max_size=1, timeout=0.2, check_after=0)
+        with pool.connection() as conn:
+            conn.broken = True
+        self.server.down = True
+        with self.assertRaises(ConnectionError):
+            pool.getconn()
+        self.server.down = False
+        with pool.connection() as conn:
+            self.assertFalse(conn.broken)
+        self.assertEqual(pool.stats()["size"], 1)
+
+    def test_checkout_times_out_when_every_connection_is_in_use(self):
+        pool = self.make_pool(min_size=0, max_size=1, timeout=0.1)
+        with pool.connection():
+            with self.assertRaises(PoolTimeout):
+                pool.getconn()
+        self.assertEqual(pool.stats()["timeouts"], 1)
+
+    def test_idle_connections_are_closed_down_to_min_size(self):
+        pool = self.make_pool(min_size=1, max_size=4, max_idle=0.05)
+        held = [pool.getconn() for _ in range(3)]
+        for conn in held:
+            pool.putconn(conn)
+        time.sleep(0.1)
+        with pool.connection():
+            pass
+        self.assertEqual(pool.stats()["size"], 1)
+        self.assertEqual(self.server.open, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
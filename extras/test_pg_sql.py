@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+# Table-driven tests for the SQL scanner in pg_sql.py, which decides statement
+# routing, result cache keys and invalidation in pgsql_mcp_server.py.
+#
+#   python -m pytest extras/test_pg_sql.py
+
+import unittest
+
+from pg_sql import DDL, READ, WRITE, classify, is_cacheable, name_parts, normalize, statements, tables
+
+
+class StatementsTest(unittest.TestCase):
+    def test_statement_words(self):
+        cases = [
+            ("SELECT a FROM t", [["select", "a", "from", "t"]]),
+            ("SELECT a FROM t;", [["select", "a", "from", "t"]]),
+            ("SELECT a FROM t; DELETE FROM t", [["select", "a", "from", "t"], ["delete", "from", "t"]]),
+            # Semicolons in literals, quoted identifiers and comments do not end a statement
+            ("SELECT ';' FROM t", [["select", "from", "t"]]),
+            ("SELECT $$;$$, $x$ ; $x$ FROM t", [["select", "from", "t"]]),
+            ('SELECT * FROM "a;b"', [["select", "from", '"a;b"']]),
+            ("SELECT a FROM t -- ; DROP TABLE t", [["select", "a", "from", "t"]]),
+            ("SELECT a /* ; DELETE */ FROM t", [["select", "a", "from", "t"]]),
+            ('SELECT "Mixed" FROM T', [["select", '"Mixed"', "from", "t"]]),
+            ("  ;  ", []),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(statements(query), expected)
+
+    def test_normalize_drops_comments_and_keeps_literals(self):
+        self.assertEqual(normalize("SELECT  'a  b'\n  -- note\nFROM /* x */ t"), "SELECT 'a  b' FROM t")
+
+
+class ClassifyTest(unittest.TestCase):
+    def test_kinds(self):
+        cases = [
+            ("SELECT * FROM t", READ),
+            ("with s as (select 1) select * from s", READ),
+            ("VALUES (1)", READ),
+            ("TABLE t", READ),
+            ("SHOW search_path", READ),
+            ("EXPLAIN SELECT * FROM t", READ),
+            ("EXPLAIN ANALYZE DELETE FROM t", WRITE),
+            ("SELECT 'insert into t' FROM u", READ),
+            ('SELECT "update" FROM t', READ),
+            ("SELECT a FROM t -- then delete", READ),
+            ("INSERT INTO t VALUES (1)", WRITE),
+            ("UPDATE t SET a = 1", WRITE),
+            ("DELETE FROM t", WRITE),
+            ("WITH s AS (SELECT * FROM a) INSERT INTO b SELECT * FROM s", WRITE),
+            ("WITH s AS (DELETE FROM a RETURNING *) SELECT * FROM s", WRITE),
+            ("SELECT * FROM t FOR UPDATE", WRITE),
+            ("SELECT * FROM t FOR NO KEY UPDATE", WRITE),
+            ("SELECT * FROM t FOR SHARE", WRITE),
+            ("SELECT * FROM t FOR UPDATE NOWAIT", WRITE),
+            ("SELECT * INTO new_t FROM t", DDL),
+            ("CREATE TABLE t (a int)", DDL),
+            ("DROP TABLE t", DDL),
+            ("VACUUM t", WRITE),
+            ("SELECT 1; DELETE FROM t", WRITE),
+            ("SELECT 1; CREATE TABLE t (a int)", DDL),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(classify(query), expected)
+
+    def test_cacheable_reads(self):
+        cases = [
+            ("SELECT * FROM t", True),
+            ("SELECT now()", False),
+            ("SELECT * FROM t WHERE created < CURRENT_DATE", False),
+            ("SELECT 'now()' FROM t", True),
+            ("SELECT * FROM t FOR UPDATE", False),
+            ("SELECT * INTO n FROM t", False),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(is_cacheable(query), expected)
+
+
+class TablesTest(unittest.TestCase):
+    def test_tables(self):
+        cases = [
+            ("SELECT * FROM t", {"t"}),
+            ("SELECT * FROM Orders o JOIN public.items i ON i.id = o.item_id", {"orders", "items"}),
+            ('SELECT * FROM "Orders" JOIN sales."Line Items" USING (id)', {"Orders", "Line Items"}),
+            ("SELECT * FROM a, b x, c AS y", {"a", "b", "c"}),
+            ("SELECT * FROM generate_series(1, 3) g, t", {"t"}),
+            ("SELECT * FROM generate_series(1, 3) AS g(n) JOIN t ON t.id = g.n", {"t"}),
+            ("SELECT * FROM (SELECT * FROM inner_t) s", {"inner_t"}),
+            ("SELECT 'from fake' FROM t", {"t"}),
+            ("SELECT * FROM t -- JOIN hidden", {"t"}),
+            ("SELECT * FROM ONLY parent", {"parent"}),
+            ("INSERT INTO t (a) VALUES (1)", {"t"}),
+            ("UPDATE t SET a = 1 FROM u WHERE t.id = u.id", {"t", "u"}),
+            ("DELETE FROM t USING u WHERE t.id = u.id", {"t", "u"}),
+            ("TRUNCATE a, b", {"a", "b"}),
+            ("WITH s AS (SELECT * FROM a) INSERT INTO b SELECT * FROM s", {"a", "b", "s"}),
+            ("SELECT * INTO new_t FROM t", {"new_t", "t"}),
+            ("SELECT * FROM t FOR UPDATE", {"t"}),
+            ("CREATE TABLE IF NOT EXISTS t (a int)", {"t"}),
+            ("COPY t FROM STDIN", {"t"}),
+        ]
+        for query, expected in cases:
+            with self.subTest(query=query):
+                self.assertEqual(tables(query), expected)
+
+    def test_name_parts(self):
+        cases = [
+            ("orders", ["orders"]),
+            ("Sales.Orders", ["sales", "orders"]),
+            ('sales."Q1 Orders"', ["sales", "Q1 Orders"]),
+            ('"a""b"', ['a"b']),
+        ]
+        for name, expected in cases:
+            with self.subTest(name=name):
+                self.assertEqual(name_parts(name), expected)
+        for name in ("", "a b", "a.", "t; DROP TABLE x"):
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    name_parts(name)
+
+
+if __name__ == "__main__":
+    unittest.main()
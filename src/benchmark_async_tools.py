@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# Benchmark sync vs async MCP tool latency at 1, 8 and 64 concurrent calls.
+#
+# Starts mock_rest_api.py (unless one is already listening), then drives
+# mcp_server.py over stdio in each MCP_SERVER_MODE with batches of concurrent
+# get_product_by_id calls, exactly as an agent issuing parallel tool calls would.
+#
+# Usage: python src/benchmark_async_tools.py [--latency-ms 20] [--rounds 5]
+
+import argparse
+import asyncio
+import os
+import pathlib
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from http_client import REST_API_BASE_URL
+
+SRC_DIR = pathlib.Path(__file__).parent
+CONCURRENCY_LEVELS = (1, 8, 64)
+
+
+def api_is_up():
+    try:
+        return requests.get(f"{REST_API_BASE_URL}/products", timeout=0.5).ok
+    except requests.RequestException:
+        return False
+
+
+def start_mock_api(latency_ms):
+    port = REST_API_BASE_URL.rsplit(":", 1)[-1]
+    env = {**os.environ, "MOCK_API_LATENCY_MS": str(latency_ms)}
+    # Run the app without the debug reloader so terminate() really stops it
+    process = subprocess.Popen(
+        [sys.executable, "-c", f"from mock_rest_api import app; app.run(port={port}, threaded=True)"],
+        cwd=SRC_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while not api_is_up():
+        if time.monotonic() > deadline or process.poll() is not None:
+            process.terminate()
+            raise RuntimeError("mock_rest_api.py did not start")
+        time.sleep(0.1)
+    return process
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def timed_call(session, latencies):
+    start = time.perf_counter()
+    result = await session.call_tool("get_product_by_id", {"product_id": "1"})
+    latencies.append(time.perf_counter() - start)
+    if result.isError:
+        raise RuntimeError(result.content)
+
+
+async def bench_mode(mode, rounds):
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=[str(SRC_DIR / "mcp_server.py")],
+        env={**os.environ, "MCP_SERVER_MODE": mode},
+        cwd=str(SRC_DIR),
+    )
+    results = {}
+    async with stdio_client(params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            # Warm the connection pool so the first measured round is not an outlier
+            await timed_call(session, [])
+            for concurrency in CONCURRENCY_LEVELS:
+                latencies = []
+                start = time.perf_counter()
+                for _ in range(rounds):
+                    await asyncio.gather(*(timed_call(session, latencies) for _ in range(concurrency)))
+                elapsed = time.perf_counter() - start
+                results[concurrency] = {
+                    "p50_ms": percentile(latencies, 50) * 1000,
+                    "p99_ms": percentile(latencies, 99) * 1000,
+                    "mean_ms": statistics.mean(latencies) * 1000,
+                    "calls_per_s": len(latencies) / elapsed,
+                }
+    return results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark sync vs async MCP tool latency under concurrent calls.")
+    parser.add_argument("--latency-ms", type=float, default=20.0,
+                        help="artificial REST API latency when the benchmark starts the mock API")
+    parser.add_argument("--rounds", type=int, default=5, help="batches per concurrency level")
+    args = parser.parse_args()
+
+    api_process = None if api_is_up() else start_mock_api(args.latency_ms)
+    try:
+        report = {mode: await bench_mode(mode, args.rounds) for mode in ("sync", "async")}
+    finally:
+        if api_process:
+            api_process.terminate()
+            api_process.wait()
+
+    print(f"{'mode':<6} {'concurrency':>11} {'p50 ms':>9} {'p99 ms':>9} {'mean ms':>9} {'calls/s':>9}")
+    for mode, rows in report.items():
+        for concurrency, row in rows.items():
+            print(f"{mode:<6} {concurrency:>11} {row['p50_ms']:>9.1f} {row['p99_ms']:>9.1f} "
+                  f"{row['mean_ms']:>9.1f} {row['calls_per_s']:>9.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Microbenchmark of the JSON work done per tool call on large order lists.
+#
+# A list tool call encodes the orders in the REST API (jsonify), decodes them in
+# the MCP server (response.json()) and encodes them again as the tool result
+# (FastMCP). This compares three paths through those stages, in-process so only
+# serialization is measured:
+#   stdlib       Flask's default provider, json.loads, FastMCP re-encode
+#   fast         FastJSONProvider, fast_json.loads, FastMCP re-encode
+#   passthrough  FastJSONProvider, body text forwarded as the tool result (MCP_PASSTHROUGH=1)
+#
+# Usage: python src/benchmark_json.py [--sizes 1000 10000 100000] [--rounds 5]
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+from flask.json.provider import DefaultJSONProvider
+from mcp.server.fastmcp import FastMCP
+
+import fast_json
+from mock_rest_api import FastJSONProvider, app
+
+STATUSES = ("pending", "shipped", "delivered", "cancelled")
+
+# Tool results are encoded by FastMCP itself, through a tool that returns the value it is given
+_mcp = FastMCP("benchmark")
+_tool_value = {}
+_runner = asyncio.Runner()
+
+
+@_mcp.tool()
+def tool_result():
+    return _tool_value["value"]
+
+
+def to_content(value):
+    _tool_value["value"] = value
+    return _runner.run(_mcp.call_tool("tool_result", {}))
+
+
+def make_orders(count):
+    return [
+        {
+            "id": str(i),
+            "product_id": str(i % 500 + 1),
+            "product_name": f"Product {i % 500 + 1}",
+            "quantity": i % 5 + 1,
+            "total_price": round((i % 500 + 1) * 1.25 * (i % 5 + 1), 2),
+            "status": STATUSES[i % len(STATUSES)],
+        }
+        for i in range(count)
+    ]
+
+
+def stdlib_path(orders, provider):
+    body = provider.response(orders).get_data()
+    return to_content(json.loads(body)), len(body)
+
+
+def fast_path(orders, provider):
+    body = provider.response(orders).get_data()
+    return to_content(fast_json.loads(body)), len(body)
+
+
+def passthrough_path(orders, provider):
+    body = provider.response(orders).get_data()
+    return to_content(body.decode("utf-8")), len(body)
+
+
+def best_of(rounds, func, *args):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        content, body_size = func(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings), statistics.median(timings), body_size, sum(len(block.text) for block in content)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the JSON paths of a list tool call.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    paths = [
+        ("stdlib", stdlib_path, DefaultJSONProvider(app)),
+        ("fast", fast_path, FastJSONProvider(app)),
+        ("passthrough", passthrough_path, FastJSONProvider(app)),
+    ]
+    print(f"fast_json backend: {fast_json.BACKEND}")
+    print(f"{'orders':>8} {'path':<12} {'best ms':>9} {'median ms':>10} {'REST KiB':>9} {'result KiB':>11} {'speedup':>8}")
+    with app.app_context():
+        for size in args.sizes:
+            orders = make_orders(size)
+            baseline = None
+            for name, func, provider in paths:
+                best, median, body_size, result_size = best_of(args.rounds, func, orders, provider)
+                baseline = baseline or best
+                print(f"{size:>8} {name:<12} {best * 1000:>9.1f} {median * 1000:>10.1f} "
+                      f"{body_size / 1024:>9.0f} {result_size / 1024:>11.0f} {baseline / best:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
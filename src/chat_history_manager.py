@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# Token-budgeted chat history for the Semantic Kernel chat loops.
+#
+# Appending every message to a ChatHistory makes each turn's prompt larger than
+# the last, and with it latency and cost. ChatHistoryManager keeps the system
+# message and the most recent turns word for word and folds older turns into
+# one-line summaries until the prompt fits the token budget. Tool results are
+# cut down to their key fields, both as the model's tool calls return (through
+# an auto function invocation filter) and when they are added to the history.
+# After each turn it can report the prompt size next to what the full history
+# would have cost.
+#
+#   history = ChatHistoryManager("You are ...")
+#   history.trim_tool_results(kernel)
+#   chat_function = kernel.add_function("chat", function_name="respond", prompt_template_config=chat_prompt_config())
+#   history.add_user_message(user_input)
+#   arguments = KernelArguments(chat_history=history.for_prompt(), settings=settings)
+#   ...
+#   history.add_assistant_message(full_response)
+#   history.report()
+#
+# Summaries are extractive (the start of each message and the tools called), so
+# compaction costs no extra model call. Tokens are counted with tiktoken when it
+# is installed and estimated at four characters per token otherwise.
+
+import json
+import os
+import sys
+
+from semantic_kernel.contents import (ChatHistory, ChatMessageContent, FunctionCallContent,
+                                      FunctionResultContent)
+from semantic_kernel.contents.utils.author_role import AuthorRole
+from semantic_kernel.prompt_template import InputVariable, PromptTemplateConfig
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:  # optional dependency; get_encoding also needs the encoding file
+    _encoding = None
+
+MAX_TOKENS = int(os.getenv("CHAT_HISTORY_MAX_TOKENS", "3000"))            # prompt budget for the history
+KEEP_TURNS = int(os.getenv("CHAT_HISTORY_KEEP_TURNS", "4"))               # recent turns kept word for word
+TOOL_RESULT_CHARS = int(os.getenv("CHAT_HISTORY_TOOL_RESULT_CHARS", "1500"))
+TOOL_RESULT_ITEMS = int(os.getenv("CHAT_HISTORY_TOOL_RESULT_ITEMS", "5"))  # list items kept per tool result
+SUMMARY_CHARS = 160                                                        # per message in a turn summary
+SUMMARY_SHARE = 0.5                                                        # of the budget, at most, for summaries
+MESSAGE_OVERHEAD_TOKENS = 4                                                # role and separators
+STATS_ENABLED = os.getenv("CHAT_HISTORY_STATS", "1").lower() in ("1", "true", "yes")
+
+
+def chat_prompt_config():
+    """Prompt template "{{$chat_history}}" that renders the history as chat messages.
+
+    Without allow_dangerously_set_content the template refuses a ChatHistory value
+    (and a str() of it would reach the model as one escaped user message). The
+    history's own serialization escapes the message text.
+    """
+    return PromptTemplateConfig(
+        template="{{$chat_history}}",
+        input_variables=[InputVariable(name="chat_history", allow_dangerously_set_content=True)],
+    )
+
+
+def count_tokens(text):
+    if not text:
+        return 0
+    if _encoding:
+        return len(_encoding.encode(text))
+    return max(1, len(text) // 4)
+
+
+def message_tokens(message):
+    text = []
+    for item in message.items:
+        if isinstance(item, FunctionCallContent):
+            text.append(f"{item.name} {item.arguments}")
+        elif isinstance(item, FunctionResultContent):
+            text.append(str(item.result))
+        else:
+            text.append(str(item))
+    return MESSAGE_OVERHEAD_TOKENS + count_tokens(" ".join(text))
+
+
+def shorten(text, limit):
+    text = " ".join(str(text).split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+
+def key_fields(value, depth=0):
+    """Scalars as they are; long lists cut to their first items; containers below three levels counted."""
+    # Three levels covers {"products": [{"id": ..., "price": ...}]} and {"rows": [[...]]}
+    if isinstance(value, dict):
+        if depth >= 3:
+            return f"{{{len(value)} fields}}"
+        return {key: key_fields(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, list):
+        if depth >= 3:
+            return f"[{len(value)} items]"
+        items = [key_fields(item, depth + 1) for item in value[:TOOL_RESULT_ITEMS]]
+        if len(value) > TOOL_RESULT_ITEMS:
+            items.append(f"... {len(value) - TOOL_RESULT_ITEMS} more")
+        return items
+    if isinstance(value, str):
+        return shorten(value, SUMMARY_CHARS)
+    return value
+
+
+def result_text(result):
+    # MCP tools return a list of content items; the text is what the model gets
+    return "".join(str(part) for part in result) if isinstance(result, list) else str(result)
+
+
+def trim_tool_result(result):
+    """A compact version of a tool result: key fields of JSON results, then a character cap."""
+    text = result_text(result)
+    if len(text) <= TOOL_RESULT_CHARS:
+        return text
+    try:
+        text = json.dumps(key_fields(json.loads(text)), ensure_ascii=False, separators=(",", ":"))
+    except ValueError:
+        pass  # not JSON; only the cap applies
+    if len(text) > TOOL_RESULT_CHARS:
+        text = text[:TOOL_RESULT_CHARS] + f"... [{len(text) - TOOL_RESULT_CHARS} characters trimmed]"
+    return text
+
+
+class ChatHistoryManager:
+    """System message, summaries of older turns and the recent turns, within a token budget."""
+
+    def __init__(self, system_message, max_tokens=MAX_TOKENS, keep_turns=KEEP_TURNS):
+        self.system_message = system_message
+        self.max_tokens = max_tokens
+        self.keep_turns = max(1, keep_turns)
+        self.summaries = []       # one line per summarized turn, oldest first
+        self.turns = []           # recent turns, each a list of messages starting with the user's
+        self.turn_count = 0
+        self.full_tokens = MESSAGE_OVERHEAD_TOKENS + count_tokens(system_message)
+        self.trimmed_tool_results = 0
+        self.dropped_summaries = 0
+        self.last_stats = None
+
+    def add_message(self, message):
+        self.full_tokens += message_tokens(message)
+        if message.role == AuthorRole.TOOL:
+            message = self._trim(message)
+        if message.role == AuthorRole.USER:
+            self.turn_count += 1
+        if message.role == AuthorRole.USER or not self.turns:
+            self.turns.append([])
+        self.turns[-1].append(message)
+
+    def add_user_message(self, content):
+        self.add_message(ChatMessageContent(role=AuthorRole.USER, content=content))
+
+    def add_assistant_message(self, content):
+        self.add_message(ChatMessageContent(role=AuthorRole.ASSISTANT, content=content))
+
+    def _trim(self, message):
+        items = []
+        for item in message.items:
+            if isinstance(item, FunctionResultContent):
+                trimmed = trim_tool_result(item.result)
+                if trimmed != result_text(item.result):
+                    self.trimmed_tool_results += 1
+                    item = item.model_copy(update={"result": trimmed})
+            items.append(item)
+        return message.model_copy(update={"items": items})
+
+    def trim_tool_results(self, kernel):
+        """Trim the result of every tool call the model makes through `kernel` before the model reads it."""
+        async def trim_tool_call(context, next):
+            await next(context)
+            result = context.function_result
+            if result is None or result.value is None:
+                return
+            trimmed = trim_tool_result(result.value)
+            if trimmed != result_text(result.value):
+                self.trimmed_tool_results += 1
+                context.function_result = result.model_copy(update={"value": trimmed})
+
+        kernel.add_filter("auto_function_invocation", trim_tool_call)
+
+    def _summarize_oldest(self):
+        turn = self.turns.pop(0)
+        parts = []
+        tools = []
+        for message in turn:
+            for item in message.items:
+                if isinstance(item, FunctionCallContent):
+                    tools.append(item.name)
+            if message.role in (AuthorRole.USER, AuthorRole.ASSISTANT) and message.content:
+                parts.append(f"{message.role.value}: {shorten(message.content, SUMMARY_CHARS)}")
+        if tools:
+            parts.append(f"tools: {', '.join(dict.fromkeys(tools))}")
+        self.summaries.append("; ".join(parts))
+
+    def _summary_message(self):
+        if not self.summaries:
+            return None
+        lines = "\n".join(f"- {summary}" for summary in self.summaries)
+        return ChatMessageContent(role=AuthorRole.SYSTEM, content=f"Summary of the earlier conversation:\n{lines}")
+
+    def _messages(self):
+        messages = [ChatMessageContent(role=AuthorRole.SYSTEM, content=self.system_message)]
+        summary = self._summary_message()
+        if summary:
+            messages.append(summary)
+        messages.extend(message for turn in self.turns for message in turn)
+        return messages
+
+    def _tokens(self):
+        return sum(message_tokens(message) for message in self._messages())
+
+    def _drop_oldest_summary(self):
+        self.summaries.pop(0)
+        self.dropped_summaries += 1
+
+    def _cap_summaries(self):
+        # Old summaries must not crowd out recent turns
+        while self.summaries and message_tokens(self._summary_message()) > self.max_tokens * SUMMARY_SHARE:
+            self._drop_oldest_summary()
+
+    def for_prompt(self):
+        """A ChatHistory for the next model call, compacted to the budget, and this turn's stats."""
+        summarized = len(self.summaries) + self.dropped_summaries
+        while len(self.turns) > self.keep_turns:
+            self._summarize_oldest()
+        self._cap_summaries()
+        # Over budget: summarize more turns, but never the one being answered
+        while len(self.turns) > 1 and self._tokens() > self.max_tokens:
+            self._summarize_oldest()
+            self._cap_summaries()
+        # Still over: forget the oldest summaries
+        while self.summaries and self._tokens() > self.max_tokens:
+            self._drop_oldest_summary()
+        messages = self._messages()
+        prompt_tokens = sum(message_tokens(message) for message in messages)
+        self.last_stats = {
+            "turn": self.turn_count,
+            "messages": len(messages),
+            "prompt_tokens": prompt_tokens,
+            "full_history_tokens": self.full_tokens,
+            "saved_tokens": max(0, self.full_tokens - prompt_tokens),
+            "recent_turns": len(self.turns),
+            "summarized_turns": len(self.summaries) + self.dropped_summaries,
+            "newly_summarized": len(self.summaries) + self.dropped_summaries - summarized,
+            "trimmed_tool_results": self.trimmed_tool_results,
+            "over_budget": prompt_tokens > self.max_tokens,
+        }
+        return ChatHistory(messages=messages)
+
+    def stats(self):
+        return self.last_stats
+
+    def report(self, file=sys.stderr):
+        """Print the last turn's prompt size (CHAT_HISTORY_STATS=0 turns this off)."""
+        if not STATS_ENABLED or not self.last_stats:
+            return
+        s = self.last_stats
+        print(f"[history] turn {s['turn']}: ~{s['prompt_tokens']} prompt tokens in {s['messages']} messages "
+              f"(full history ~{s['full_history_tokens']}), {s['recent_turns']} recent turns, "
+              f"{s['summarized_turns']} summarized, {s['trimmed_tool_results']} tool results trimmed"
+              f"{', over budget' if s['over_budget'] else ''}", file=file, flush=True)
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# Fast JSON encoding/decoding shared by the REST API and the MCP servers.
+#
+# Uses orjson when it is installed and falls back to the standard library
+# otherwise. Set FAST_JSON=0 to force the standard library path. Both paths
+# produce the same text: datetimes and dataclasses go through `default` as
+# they would with json, UUIDs are written as their string on both, and values
+# orjson refuses (non-str dict keys, Decimal without a default) are encoded by
+# the standard library.
+
+import json
+import os
+import uuid
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+if os.getenv("FAST_JSON", "1").lower() in ("0", "false", "no"):
+    orjson = None
+
+BACKEND = "orjson" if orjson else "json"
+
+
+def _stdlib_default(default):
+    # orjson writes UUIDs natively, so the stdlib path does too
+    def convert(value):
+        if isinstance(value, uuid.UUID):
+            return str(value)
+        if default is None:
+            raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+        return default(value)
+    return convert
+
+
+def _stdlib_dumps(obj, default=None):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"),
+                      default=_stdlib_default(default)).encode("utf-8")
+
+
+if orjson:
+    _PASSTHROUGH = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(obj, default=None):
+        """Serialize `obj` to compact UTF-8 JSON bytes; `default` converts types JSON has no form for."""
+        try:
+            # Datetimes and dataclasses reach `default` as they do with json, not orjson's own format
+            return orjson.dumps(obj, default=default, option=_PASSTHROUGH)
+        except orjson.JSONEncodeError:
+            return _stdlib_dumps(obj, default)
+
+    def loads(data):
+        """Parse JSON from bytes or str."""
+        return orjson.loads(data)
+else:
+    def dumps(obj, default=None):
+        """Serialize `obj` to compact UTF-8 JSON bytes; `default` converts types JSON has no form for."""
+        return _stdlib_dumps(obj, default)
+
+    def loads(data):
+        """Parse JSON from bytes or str."""
+        return json.loads(data)
+
+
+def dumps_str(obj, default=None):
+    """Serialize `obj` to a compact JSON string (e.g. for MCP text content)."""
+    return dumps(obj, default).decode("utf-8")
@@ -0,0 +1,282 @@
+#!/usr/bin/env python3
+# Shared, pooled HTTP client for talking to the mocked REST API
+
+import asyncio
+import os
+import threading
+
+import httpx
+import requests
+
+import fast_json
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
+
+# Configuration for the mocked REST API (override through the environment)
+REST_API_BASE_URL = os.getenv("REST_API_BASE_URL", "http://127.0.0.1:5000")
+POOL_CONNECTIONS = int(os.getenv("REST_API_POOL_CONNECTIONS", "4"))    # number of per-host pools kept
+POOL_MAXSIZE = int(os.getenv("REST_API_POOL_MAXSIZE", "16"))           # keep-alive connections per host
+POOL_BLOCK = os.getenv("REST_API_POOL_BLOCK", "true").lower() in ("1", "true", "yes")
+CONNECT_TIMEOUT = float(os.getenv("REST_API_CONNECT_TIMEOUT", "3.05"))
+READ_TIMEOUT = float(os.getenv("REST_API_READ_TIMEOUT", "10"))
+MAX_RETRIES = int(os.getenv("REST_API_MAX_RETRIES", "3"))
+BACKOFF_FACTOR = float(os.getenv("REST_API_BACKOFF_FACTOR", "0.2"))
+
+RETRY_STATUSES = (502, 503, 504)
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Largest batch sent in one request (must not exceed MOCK_API_MAX_BATCH_SIZE on the API side)
+BATCH_SIZE = int(os.getenv("REST_API_BATCH_SIZE", "100"))
+
+
+def drop_none(params):
+    """Remove unset optional query parameters (httpx would send them as empty strings)."""
+    if params is None:
+        return None
+    return {key: value for key, value in params.items() if value is not None}
+
+
+def decode(response, raw=False):
+    """Parse a JSON response with fast_json; `raw` returns the body text as sent."""
+    if raw:
+        return response.text
+    return fast_json.loads(response.content)
+
+
+def chunked(items, size=BATCH_SIZE):
+    """Split a list into request-sized batches."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+class PoolStats:
+    """Thread-safe counters describing how the connection pool is used."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.checkouts = 0
+        self.new_connections = 0
+        self.waits = 0
+        self.retries = 0
+
+    def incr(self, name, amount=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "checkouts": self.checkouts,
+                # A checkout that did not need a new socket reused a keep-alive connection
+                "hits": max(self.checkouts - self.new_connections, 0),
+                "new_connections": self.new_connections,
+                "waits": self.waits,
+                "retries": self.retries,
+            }
+
+
+def _instrumented_pool(base_cls, stats):
+    # urllib3 builds one pool per host; subclass it so every pool reports into `stats`
+    class CountingConnection(base_cls.ConnectionCls):
+        def connect(self):
+            # Also called when urllib3 reopens a dropped keep-alive socket in an existing connection
+            stats.incr("new_connections")
+            return super().connect()
+
+    class InstrumentedPool(base_cls):
+        ConnectionCls = CountingConnection
+
+        def _get_conn(self, timeout=None):
+            stats.incr("checkouts")
+            # An empty queue in blocking mode means every connection is busy and we have to wait
+            if self.block and self.pool is not None and self.pool.empty():
+                stats.incr("waits")
+            return super()._get_conn(timeout=timeout)
+
+    return InstrumentedPool
+
+
+class _CountingRetry(Retry):
+    stats = None
+
+    def increment(self, *args, **kwargs):
+        if self.stats is not None:
+            self.stats.incr("retries")
+        new_retry = super().increment(*args, **kwargs)
+        new_retry.stats = self.stats
+        return new_retry
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose per-host connection pools report usage into a PoolStats."""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _instrumented_pool(HTTPConnectionPool, self.stats),
+            "https": _instrumented_pool(HTTPSConnectionPool, self.stats),
+        }
+
+
+class RestClient:
+    """Keep-alive client with pooling, timeouts and retry-with-backoff.
+
+    One instance is meant to be shared by every tool in the process so that
+    consecutive tool calls reuse the same TCP connections.
+    """
+
+    def __init__(
+        self,
+        base_url=REST_API_BASE_URL,
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=POOL_BLOCK,
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT,
+        max_retries=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self._stats = PoolStats()
+
+        # Connection errors are always safe to retry; read errors and 5xx only for
+        # idempotent methods, so a POST /orders is never submitted twice.
+        retry = _CountingRetry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries,
+            status=max_retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            raise_on_status=False,
+        )
+        retry.stats = self._stats
+
+        adapter = PooledHTTPAdapter(
+            self._stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.pool_config = {
+            "pool_connections": pool_connections,
+            "pool_maxsize": pool_maxsize,
+            "pool_block": pool_block,
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+            "max_retries": max_retries,
+            "backoff_factor": backoff_factor,
+        }
+
+    def request(self, method, path, **kwargs):
+        self._stats.incr("requests")
+        kwargs.setdefault("timeout", self.timeout)
+        response = self.session.request(method, f"{self.base_url}{path}", **kwargs)
+        response.raise_for_status()
+        return response
+
+    def get(self, path, params=None, raw=False):
+        """Decoded JSON body, or the body text untouched when `raw` is set."""
+        return decode(self.request("GET", path, params=drop_none(params)), raw)
+
+    def post(self, path, payload, raw=False):
+        return decode(self.request("POST", path, data=fast_json.dumps(payload), headers=JSON_HEADERS), raw)
+
+    def stats(self):
+        return {**self._stats.snapshot(), "config": self.pool_config}
+
+    def close(self):
+        self.session.close()
+
+
+class AsyncRestClient:
+    """asyncio counterpart of RestClient built on a shared httpx.AsyncClient pool.
+
+    Concurrent awaits overlap their I/O on up to `pool_maxsize` keep-alive
+    connections; further requests queue inside the pool and are counted as waits.
+    """
+
+    def __init__(
+        self,
+        base_url=REST_API_BASE_URL,
+        pool_maxsize=POOL_MAXSIZE,
+        connect_timeout=CONNECT_TIMEOUT,
+        read_timeout=READ_TIMEOUT,
+        max_retries=MAX_RETRIES,
+        backoff_factor=BACKOFF_FACTOR,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.pool_maxsize = pool_maxsize
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self._stats = PoolStats()
+        self._in_flight = 0
+
+        # httpx retries connection failures itself; status retries are handled in request()
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+            retries=max_retries,
+        )
+        self.session = httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+        )
+        self.pool_config = {
+            "pool_maxsize": pool_maxsize,
+            "connect_timeout": connect_timeout,
+            "read_timeout": read_timeout,
+            "max_retries": max_retries,
+            "backoff_factor": backoff_factor,
+        }
+
+    async def request(self, method, path, **kwargs):
+        self._stats.incr("requests")
+        idempotent = method.upper() in Retry.DEFAULT_ALLOWED_METHODS
+        attempt = 0
+        while True:
+            self._stats.incr("checkouts")
+            if self._in_flight >= self.pool_maxsize:
+                self._stats.incr("waits")
+            self._in_flight += 1
+            try:
+                response = await self.session.request(method, path, extensions={"trace": self._trace}, **kwargs)
+            finally:
+                self._in_flight -= 1
+            if response.status_code in RETRY_STATUSES and idempotent and attempt < self.max_retries:
+                self._stats.incr("retries")
+                await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                attempt += 1
+                continue
+            response.raise_for_status()
+            return response
+
+    async def _trace(self, event, info):
+        # httpx's "trace" request extension reports each new TCP connection the pool opens
+        if event == "connection.connect_tcp.complete":
+            self._stats.incr("new_connections")
+
+    async def get(self, path, params=None, raw=False):
+        return decode(await self.request("GET", path, params=drop_none(params)), raw)
+
+    async def post(self, path, payload, raw=False):
+        return decode(await self.request("POST", path, content=fast_json.dumps(payload), headers=JSON_HEADERS), raw)
+
+    def stats(self):
+        return {**self._stats.snapshot(), "config": self.pool_config}
+
+    async def aclose(self):
+        await self.session.aclose()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# Load test for an MCP server on a network transport: tool calls/s and p50/p99
+# latency as the number of concurrent clients grows.
+#
+# Start a server, then point the test at it, e.g.
+#   python src/mcp_server.py --transport streamable-http --port 8000 --workers 4
+#   python src/load_test_mcp_server.py --url http://127.0.0.1:8000/mcp --clients 1,4,16,64 --processes 4
+#
+# Each client holds its own MCP session (initialize once, then call the tool in a
+# loop), like one agent would. URLs ending in /sse use the SSE transport. The
+# default tool, get_server_stats, never leaves the server, so it measures the
+# transport and FastMCP overhead; pick a REST-backed one with --tool/--arguments.
+# As with load_test_rest_api.py, use --processes so the client is not the bottleneck.
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+from collections import Counter
+from datetime import timedelta
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from load_test_rest_api import percentile
+
+# A call that takes longer counts as failed, so a dead server cannot hang the test
+CALL_TIMEOUT = timedelta(seconds=10)
+
+
+def transport_client(url):
+    if url.rstrip("/").endswith("/sse"):
+        return sse_client(url)
+    return streamablehttp_client(url)
+
+
+async def run_client(url, tool, arguments, deadline, latencies, outcomes):
+    try:
+        async with transport_client(url) as streams:
+            async with ClientSession(streams[0], streams[1], read_timeout_seconds=CALL_TIMEOUT) as session:
+                await session.initialize()
+                while time.perf_counter() < deadline:
+                    start = time.perf_counter()
+                    try:
+                        result = await session.call_tool(tool, arguments)
+                        outcome = "tool error" if result.isError else "ok"
+                    except Exception as e:
+                        outcome = type(e).__name__
+                    latencies.append(time.perf_counter() - start)
+                    outcomes[outcome] += 1
+    except Exception as e:
+        # The session itself failed (refused, or dropped under load)
+        outcomes[f"session {type(e).__name__}"] += 1
+
+
+def run_clients(url, tool, arguments, clients, duration):
+    """Run `clients` concurrent sessions for `duration` seconds; returns (latencies, outcomes)."""
+    latencies = []
+    outcomes = Counter()
+    deadline = time.perf_counter() + duration
+
+    async def main():
+        await asyncio.gather(*(run_client(url, tool, arguments, deadline, latencies, outcomes)
+                               for _ in range(clients)))
+
+    asyncio.run(main())
+    return latencies, outcomes
+
+
+def run_level(url, tool, arguments, clients, duration, processes):
+    # Split the clients over several processes so one event loop does not cap the load
+    processes = min(processes, clients)
+    shares = [clients // processes + (1 if i < clients % processes else 0) for i in range(processes)]
+    jobs = [(url, tool, arguments, share, duration) for share in shares if share]
+    start = time.perf_counter()
+    if len(jobs) == 1:
+        results = [run_clients(*jobs[0])]
+    else:
+        with multiprocessing.Pool(len(jobs)) as pool:
+            results = pool.starmap(run_clients, jobs)
+    elapsed = time.perf_counter() - start
+    latencies = [latency for result in results for latency in result[0]]
+    outcomes = sum((result[1] for result in results), Counter())
+    return {
+        "calls": len(latencies),
+        "calls_per_s": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else 0.0,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else 0.0,
+        "outcomes": dict(outcomes),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test an MCP server over streamable HTTP or SSE.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000/mcp")
+    parser.add_argument("--tool", default="get_server_stats")
+    parser.add_argument("--arguments", type=json.loads, default={}, help="tool arguments as JSON")
+    parser.add_argument("--clients", default="1,2,4,8,16,32",
+                        help="comma-separated concurrent client counts, run in turn")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per client count")
+    parser.add_argument("--processes", type=int, default=1, help="client processes sharing the clients")
+    args = parser.parse_args()
+
+    print(f"{args.url}: {args.tool}({json.dumps(args.arguments)}) from up to {args.processes} process(es), "
+          f"{args.duration:.0f}s per level")
+    print(f"{'clients':>7} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8}  outcomes")
+    for clients in (int(value) for value in args.clients.split(",")):
+        result = run_level(args.url, args.tool, args.arguments, clients, args.duration, args.processes)
+        outcomes = ", ".join(f"{outcome}: {count}" for outcome, count in sorted(result["outcomes"].items()))
+        print(f"{clients:>7} {result['calls_per_s']:>9.0f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}  {outcomes}")
+
+
+if __name__ == "__main__":
+    main()
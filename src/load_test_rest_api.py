@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# Load test for the mock REST API: requests/s and p50/p99 latency per endpoint.
+#
+# Point it at any running instance to compare the Flask dev server with the
+# production entry point, e.g.
+#   python src/mock_rest_api.py                      # dev server
+#   python src/serve_rest_api.py --workers 4         # gunicorn
+#   python src/load_test_rest_api.py --concurrency 32 --duration 10 --processes 4
+#
+# A single Python client process tops out at a few hundred to a few thousand
+# requests/s, so use --processes on multi-core machines to avoid measuring the client.
+
+import argparse
+import multiprocessing
+import threading
+import time
+from collections import Counter
+
+import requests
+
+from http_client import REST_API_BASE_URL
+
+ENDPOINTS = [
+    ("GET /products", "GET", "/products", None),
+    ("GET /products/<id>", "GET", "/products/1", None),
+    ("GET /orders?limit=50", "GET", "/orders?limit=50", None),
+    ("GET /orders/<id>", "GET", "/orders/1", None),
+    ("POST /products/batch", "POST", "/products/batch", {"ids": ["1", "2", "3"]}),
+    # Stock runs out quickly, so most of these measure the rejected-order path (400)
+    ("POST /orders", "POST", "/orders", {"product_id": "2", "quantity": 1}),
+]
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_threads(base_url, method, path, payload, concurrency, duration):
+    """Hammer one endpoint from `concurrency` threads; returns (latencies, statuses)."""
+    latencies = []
+    statuses = Counter()
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker():
+        # One keep-alive session per thread, like a pooled client would use
+        session = requests.Session()
+        local_latencies = []
+        local_statuses = Counter()
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                status = session.request(method, f"{base_url}{path}", json=payload, timeout=10).status_code
+            except requests.RequestException:
+                status = "error"
+            local_latencies.append(time.perf_counter() - start)
+            local_statuses[status] += 1
+        with lock:
+            latencies.extend(local_latencies)
+            statuses.update(local_statuses)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, statuses
+
+
+def run_endpoint(base_url, method, path, payload, concurrency, duration, processes):
+    # Split the clients over several processes so the GIL does not cap the load
+    shares = [concurrency // processes + (1 if i < concurrency % processes else 0) for i in range(processes)]
+    jobs = [(base_url, method, path, payload, share, duration) for share in shares if share]
+    start = time.perf_counter()
+    if len(jobs) == 1:
+        results = [run_threads(*jobs[0])]
+    else:
+        with multiprocessing.Pool(len(jobs)) as pool:
+            results = pool.starmap(run_threads, jobs)
+    elapsed = time.perf_counter() - start
+    latencies = [latency for result in results for latency in result[0]]
+    statuses = sum((result[1] for result in results), Counter())
+    return {
+        "requests": len(latencies),
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000 if latencies else 0.0,
+        "p99_ms": percentile(latencies, 99) * 1000 if latencies else 0.0,
+        "statuses": dict(statuses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the mock REST API.")
+    parser.add_argument("--base-url", default=REST_API_BASE_URL)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per endpoint")
+    parser.add_argument("--processes", type=int, default=1, help="client processes sharing the concurrency")
+    args = parser.parse_args()
+
+    print(f"{args.base_url}: {args.concurrency} concurrent clients in {args.processes} process(es), "
+          f"{args.duration:.0f}s per endpoint")
+    print(f"{'endpoint':<24} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}  statuses")
+    for name, method, path, payload in ENDPOINTS:
+        result = run_endpoint(args.base_url, method, path, payload, args.concurrency, args.duration, args.processes)
+        statuses = ", ".join(f"{status}: {count}" for status, count in sorted(result["statuses"].items(), key=str))
+        print(f"{name:<24} {result['rps']:>9.0f} {result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f}  {statuses}")
+
+
+if __name__ == "__main__":
+    main()
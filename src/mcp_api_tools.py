@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# The REST API tools served by mcp_server.py (sync) and mcp_server_async.py.
+#
+# Each tool is written once, as a generator that yields the REST calls it needs
+# and receives their results; a yielded list of calls may run concurrently. A
+# driver runs the generators over the blocking RestClient or the asyncio
+# AsyncRestClient, so both servers share their tools, docstrings and caching.
+
+import asyncio
+import functools
+import logging
+import os
+from typing import NamedTuple
+
+from mcp.server.fastmcp import FastMCP
+import fast_json
+from http_client import AsyncRestClient, RestClient, chunked
+from response_cache import ResponseCache
+
+# Page size used by the list tools unless the model asks for more (the API caps it at 1000)
+DEFAULT_PAGE_SIZE = int(os.getenv("MCP_DEFAULT_PAGE_SIZE", "50"))
+
+# Pass-through mode: read tools return the REST body text as-is instead of decoding it
+# here and having FastMCP encode it again (MCP_PASSTHROUGH=1)
+PASSTHROUGH = os.getenv("MCP_PASSTHROUGH", "0").lower() in ("1", "true", "yes")
+
+
+class Call(NamedTuple):
+    """One REST call, made as client.get(path, data) or client.post(path, data)."""
+    method: str
+    path: str
+    data: dict | None = None   # query parameters for get, JSON body for post
+    raw: bool = False
+
+
+def sync_driver(client):
+    """Decorator turning a generator tool into a function that makes its calls one after another."""
+    def perform(call):
+        return getattr(client, call.method)(call.path, call.data, raw=call.raw)
+
+    def driver(tool):
+        @functools.wraps(tool)
+        def run(*args, **kwargs):
+            steps = tool(*args, **kwargs)
+            reply = None
+            while True:
+                try:
+                    request = steps.send(reply)
+                except StopIteration as done:
+                    return done.value
+                reply = [perform(call) for call in request] if isinstance(request, list) else perform(request)
+        return run
+    return driver
+
+
+def async_driver(client):
+    """Decorator turning a generator tool into a coroutine; a list of calls goes out concurrently."""
+    async def perform(call):
+        return await getattr(client, call.method)(call.path, call.data, raw=call.raw)
+
+    def driver(tool):
+        @functools.wraps(tool)
+        async def run(*args, **kwargs):
+            steps = tool(*args, **kwargs)
+            reply = None
+            while True:
+                try:
+                    request = steps.send(reply)
+                except StopIteration as done:
+                    return done.value
+                if isinstance(request, list):
+                    reply = list(await asyncio.gather(*(perform(call) for call in request)))
+                else:
+                    reply = await perform(request)
+        return run
+    return driver
+
+
+def create_server(mode="sync"):
+    """The API MCP server; mode "async" serves the tools as coroutines over AsyncRestClient."""
+    # Instantiate an MCP server instance with a name
+    mcp = FastMCP("APIMCPServer")
+
+    # One pooled, keep-alive client shared by every tool (configured via REST_API_* env vars)
+    if mode == "async":
+        # httpx logs every request at INFO, which FastMCP's handler would render for each tool call
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+        client = AsyncRestClient()
+        run = async_driver(client)
+    else:
+        client = RestClient()
+        run = sync_driver(client)
+
+    # Bounded TTL + LRU cache for the read-only tools (configured via MCP_CACHE_* env vars)
+    cache = ResponseCache()
+
+    def invalidate_order_caches(product_ids):
+        # New orders change the products' stock and the order list
+        for product_id in set(product_ids):
+            cache.invalidate("get_product_by_id", product_id)
+        cache.invalidate("get_all_products")
+        cache.invalidate("get_all_orders")
+
+    def as_result(value):
+        # Results built here are encoded compactly in pass-through mode as well
+        return fast_json.dumps_str(value) if PASSTHROUGH else value
+
+    def as_item(value):
+        # Per-id cache entries hold body text when they were stored by a pass-through tool
+        return fast_json.loads(value) if isinstance(value, str) else value
+
+    # Define a tool function using a decorator
+    @mcp.tool()
+    @cache.cached("get_all_products")
+    @run
+    def get_all_products(limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None, fields: str | None = None,
+                         min_price: float | None = None, max_price: float | None = None):
+        """List products one page at a time, optionally filtered by price range.
+
+        `fields` is a comma-separated projection such as "id,name,price". Pass the
+        returned `next_cursor` back as `cursor` to read the next page.
+        """
+        params = {"limit": limit, "cursor": cursor, "fields": fields,
+                  "min_price": min_price, "max_price": max_price}
+        return (yield Call("get", "/products", params, PASSTHROUGH))
+
+    @mcp.tool()
+    @cache.cached("get_product_by_id")
+    @run
+    def get_product_by_id(product_id: str):
+        return (yield Call("get", f"/products/{product_id}", raw=PASSTHROUGH))
+
+    @mcp.tool()
+    @cache.cached("get_all_orders")
+    @run
+    def get_all_orders(limit: int = DEFAULT_PAGE_SIZE, cursor: str | None = None, fields: str | None = None,
+                       status: str | None = None, product_id: str | None = None,
+                       min_total: float | None = None, max_total: float | None = None):
+        """List orders one page at a time, optionally filtered by status, product or total price range.
+
+        `fields` is a comma-separated projection such as "id,status,total_price". Pass
+        the returned `next_cursor` back as `cursor` to read the next page.
+        """
+        params = {"limit": limit, "cursor": cursor, "fields": fields, "status": status,
+                  "product_id": product_id, "min_total": min_total, "max_total": max_total}
+        return (yield Call("get", "/orders", params, PASSTHROUGH))
+
+    @mcp.tool()
+    @run
+    def create_order(product_id: str, quantity: int):
+        payload = {"product_id": product_id, "quantity": quantity}
+        order = yield Call("post", "/orders", payload, PASSTHROUGH)
+        invalidate_order_caches([product_id])
+        return order
+
+    @mcp.tool()
+    @cache.cached("get_order_by_id")
+    @run
+    def get_order_by_id(order_id: str):
+        return (yield Call("get", f"/orders/{order_id}", raw=PASSTHROUGH))
+
+    def fetch_batch(namespace, ids, path, item_key):
+        # Serve what we can from the per-id cache and fetch the rest in as few round trips as possible
+        hits, misses = cache.lookup_many(namespace, ids)
+        responses = yield [Call("post", path, {"ids": chunk}) for chunk in chunked(misses)]
+        fetched = {}
+        for response in responses:
+            for result in response["results"]:
+                fetched[result["id"]] = result
+                if result["ok"]:
+                    cache.store(namespace, (result["id"],), result[item_key])
+        return as_result({"results": [
+            {"id": item_id, "ok": True, item_key: as_item(hits[item_id])} if item_id in hits else fetched[item_id]
+            for item_id in ids
+        ]})
+
+    @mcp.tool()
+    @run
+    def get_products_by_ids(product_ids: list[str]):
+        """Fetch several products in one call; results keep the request order and report errors per item."""
+        return (yield from fetch_batch("get_product_by_id", product_ids, "/products/batch", "product"))
+
+    @mcp.tool()
+    @run
+    def get_orders_by_ids(order_ids: list[str]):
+        """Fetch several orders in one call; results keep the request order and report errors per item."""
+        return (yield from fetch_batch("get_order_by_id", order_ids, "/orders/batch", "order"))
+
+    @mcp.tool()
+    @run
+    def create_orders(orders: list[dict]):
+        """Place several orders ({"product_id", "quantity"} items) in one call; each item reports its own result."""
+        # Chunks go out one after another so stock is consumed in request order
+        results = []
+        for chunk in chunked(orders):
+            results.extend((yield Call("post", "/orders/bulk", {"orders": chunk}))["results"])
+        invalidate_order_caches([result["order"]["product_id"] for result in results if result["ok"]])
+        return as_result({"results": results})
+
+    @mcp.tool()
+    def get_server_stats():
+        """Report connection pool and response cache statistics for sizing."""
+        return {"http_pool": client.stats(), "cache": cache.stats()}
+
+    return mcp
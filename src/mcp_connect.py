@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# Connect a Semantic Kernel agent to an MCP server, preferring a shared pool.
+#
+# When the URL variable (MCP_SERVER_URLS by default, as printed by
+# mcp_server_pool.py) lists streamable-HTTP servers, the agent attaches to one of
+# them, picked at random to spread agents over the workers, and tries the next if
+# it is down. Without the variable, or when every URL fails, it falls back to
+# spawning its own server over stdio as before.
+
+import os
+import random
+import sys
+from contextlib import AsyncExitStack, asynccontextmanager
+
+import anyio
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+from semantic_kernel.connectors.mcp import MCPStdioPlugin, MCPStreamableHttpPlugin
+
+CONNECT_TIMEOUT = float(os.getenv("MCP_CONNECT_TIMEOUT", "5"))  # seconds per pooled server
+
+
+def pool_urls(urls_env="MCP_SERVER_URLS"):
+    return [url.strip() for url in os.getenv(urls_env, "").split(",") if url.strip()]
+
+
+async def connect_http(name, url, stack):
+    """A plugin attached to `url`, whose session is closed by `stack`."""
+    plugin = MCPStreamableHttpPlugin(name=name, url=url)
+    # The plugin's own connect() never returns when the server cannot be reached, and
+    # cannot be cancelled from outside. So the session is opened and initialized here,
+    # under a timeout, and handed to the plugin, which then only loads the tools.
+    # A failed attempt unwinds here, where the transport turns its errors into an exception
+    async with AsyncExitStack() as attempt:
+        read, write, _ = await attempt.enter_async_context(streamablehttp_client(url))
+        session = await attempt.enter_async_context(ClientSession(
+            read, write, message_handler=plugin.message_handler,
+            logging_callback=plugin.logging_callback, sampling_callback=plugin.sampling_callback))
+        with anyio.fail_after(CONNECT_TIMEOUT):
+            await session.initialize()
+        plugin.session = session
+        await plugin.connect()
+        attempt.push_async_callback(plugin.close)
+        stack.push_async_exit(attempt.pop_all())
+    return plugin
+
+
+@asynccontextmanager
+async def connect_mcp_plugin(name, script, urls_env="MCP_SERVER_URLS"):
+    """Yield a connected MCP plugin: a pooled server if one answers, otherwise `script` over stdio."""
+    urls = pool_urls(urls_env)
+    random.shuffle(urls)
+    async with AsyncExitStack() as stack:
+        plugin = None
+        for url in urls:
+            try:
+                plugin = await connect_http(name, url, stack)
+            except Exception as e:
+                while isinstance(e, ExceptionGroup) and len(e.exceptions) == 1:
+                    e = e.exceptions[0]  # the MCP client's task group wraps the connection error
+                print(f"MCP server at {url} is unavailable: {str(e) or type(e).__name__}", file=sys.stderr)
+                continue
+            break
+        if plugin is None:
+            if urls:
+                print(f"No pooled MCP server answered; starting {script} over stdio", file=sys.stderr)
+            plugin = MCPStdioPlugin(name=name, command=sys.executable, args=[str(script)])
+            await plugin.connect()
+            stack.push_async_callback(plugin.close)
+        yield plugin
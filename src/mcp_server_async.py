@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# Async variant of mcp_server.py: every tool is a coroutine backed by a shared httpx pool,
+# so several tool calls sent in one agent turn overlap their HTTP round trips.
+# The tools are the ones in mcp_api_tools.py, run through its async driver.
+
+from mcp_api_tools import create_server
+from mcp_transport import run_server
+
+mcp = create_server("async")
+
+if __name__ == "__main__":
+    # stdio by default; see src/mcp_transport.py for --transport streamable-http|sse
+    run_server(mcp)
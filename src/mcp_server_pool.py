@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+# Long-lived pool of MCP server processes shared by many agents over streamable HTTP.
+#
+# Every agent run used to spawn its own `python mcp_server.py` over stdio, paying
+# interpreter start-up, imports and the handshake per conversation, with cold
+# HTTP pools and caches each time. This supervisor keeps `--workers` copies of a
+# server running on consecutive ports. It health-checks each one with a real
+# MCP initialize + list_tools every few seconds and restarts a worker that
+# exits or keeps failing its checks.
+#
+# Agents connect through mcp_connect.py when MCP_SERVER_URLS lists the workers:
+#
+#   python src/mcp_server_pool.py --workers 4
+#   export MCP_SERVER_URLS=http://127.0.0.1:8100/mcp,...   (printed once the pool is ready)
+#
+# A small status endpoint answers GET /health (200 while any worker is healthy),
+# GET /ready (200 once all are) and GET /servers (healthy URLs, comma-separated).
+
+import argparse
+import asyncio
+import json
+import os
+import pathlib
+import signal
+import sys
+import time
+
+import anyio
+from mcp import ClientSession
+from mcp.client.streamable_http import streamablehttp_client
+
+SRC_DIR = pathlib.Path(__file__).parent
+
+# Pool configuration (override through the environment or the command line)
+POOL_WORKERS = int(os.getenv("MCP_POOL_WORKERS", "2"))
+POOL_HOST = os.getenv("MCP_POOL_HOST", "127.0.0.1")
+POOL_BASE_PORT = int(os.getenv("MCP_POOL_BASE_PORT", "8100"))          # workers use base, base + 1, ...
+POOL_STATUS_PORT = int(os.getenv("MCP_POOL_STATUS_PORT", "8099"))
+CHECK_INTERVAL = float(os.getenv("MCP_POOL_CHECK_INTERVAL", "5"))      # seconds between health checks
+CHECK_TIMEOUT = float(os.getenv("MCP_POOL_CHECK_TIMEOUT", "5"))        # per check
+MAX_FAILURES = int(os.getenv("MCP_POOL_MAX_FAILURES", "3"))            # failed checks in a row before a restart
+START_TIMEOUT = float(os.getenv("MCP_POOL_START_TIMEOUT", "30"))       # seconds for a worker to answer
+
+
+def log(message):
+    print(f"[mcp-pool] {message}", file=sys.stderr, flush=True)
+
+
+class Worker:
+    """One server process on its own port, with its health state."""
+
+    def __init__(self, script, host, port):
+        self.script = script
+        self.url = f"http://{host}:{port}/mcp"
+        self.host = host
+        self.port = port
+        self.process = None
+        self.healthy = False
+        self.failures = 0
+        self.restarts = 0
+        self.tools = None
+        self.last_check_ms = None
+        self.started_at = None
+
+    async def start(self):
+        env = {
+            **os.environ,
+            "MCP_TRANSPORT": "streamable-http",
+            "MCP_HOST": self.host,
+            "MCP_PORT": str(self.port),
+            # uvicorn and FastMCP would otherwise log every request of every worker
+            "MCP_LOG_LEVEL": os.getenv("MCP_LOG_LEVEL", "WARNING"),
+        }
+        # Worker logs go to our stderr; stdout is kept for the MCP_SERVER_URLS line
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, str(self.script), cwd=str(self.script.parent), env=env,
+            stdout=asyncio.subprocess.DEVNULL)
+        self.started_at = time.monotonic()
+        self.healthy = False
+        self.failures = 0
+
+    async def stop(self):
+        if self.process and self.process.returncode is None:
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 5)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+
+    async def check(self):
+        """Open an MCP session, initialize and list the tools; True when that works in time."""
+        start = time.perf_counter()
+        try:
+            with anyio.fail_after(CHECK_TIMEOUT):
+                async with streamablehttp_client(self.url) as (read, write, _):
+                    async with ClientSession(read, write) as session:
+                        await session.initialize()
+                        self.tools = len((await session.list_tools()).tools)
+        except Exception:
+            return False
+        self.last_check_ms = round((time.perf_counter() - start) * 1000, 1)
+        return True
+
+    async def wait_ready(self):
+        # Poll with backoff until the first successful check, failing fast if the process exits
+        delay = 0.05
+        while not await self.check():
+            if self.process.returncode is not None:
+                raise RuntimeError(f"worker on port {self.port} exited with code {self.process.returncode}")
+            if time.monotonic() - self.started_at > START_TIMEOUT:
+                raise RuntimeError(f"worker on port {self.port} did not answer within {START_TIMEOUT:.0f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+        self.healthy = True
+        return time.monotonic() - self.started_at
+
+    def status(self):
+        return {
+            "url": self.url,
+            "pid": self.process.pid if self.process else None,
+            "healthy": self.healthy,
+            "failures": self.failures,
+            "restarts": self.restarts,
+            "tools": self.tools,
+            "last_check_ms": self.last_check_ms,
+        }
+
+
+class ServerPool:
+    def __init__(self, script, workers, host, base_port):
+        self.workers = [Worker(script, host, base_port + i) for i in range(workers)]
+
+    async def start(self):
+        await asyncio.gather(*(worker.start() for worker in self.workers))
+        try:
+            seconds = await asyncio.gather(*(worker.wait_ready() for worker in self.workers))
+        except Exception:
+            await self.stop()
+            raise
+        for worker, ready in zip(self.workers, seconds):
+            log(f"{worker.url} ready in {ready:.2f}s ({worker.tools} tools)")
+
+    async def restart(self, worker, reason):
+        log(f"restarting {worker.url}: {reason}")
+        worker.healthy = False
+        await worker.stop()
+        try:
+            await worker.start()
+        except Exception as e:
+            log(f"could not start {worker.url}: {e}")  # the exited process triggers the next try
+            return
+        worker.restarts += 1
+        try:
+            await worker.wait_ready()
+            log(f"{worker.url} is back")
+        except RuntimeError as e:
+            log(str(e))  # the next round tries again
+
+    async def supervise(self, worker):
+        while True:
+            await asyncio.sleep(CHECK_INTERVAL)
+            if worker.process.returncode is not None:
+                await self.restart(worker, f"exited with code {worker.process.returncode}")
+                continue
+            if await worker.check():
+                worker.healthy, worker.failures = True, 0
+                continue
+            worker.failures += 1
+            worker.healthy = False
+            log(f"{worker.url} failed its health check ({worker.failures}/{MAX_FAILURES})")
+            if worker.failures >= MAX_FAILURES:
+                await self.restart(worker, "health checks failing")
+
+    async def stop(self):
+        await asyncio.gather(*(worker.stop() for worker in self.workers))
+
+    def healthy_urls(self):
+        return [worker.url for worker in self.workers if worker.healthy]
+
+    async def serve_status(self, reader, writer):
+        # Just enough HTTP for health probes: GET /health, /ready or /servers
+        try:
+            request_line = (await reader.readline()).decode(errors="replace").split()
+            while (await reader.readline()).strip():
+                pass  # skip the headers
+            path = request_line[1].split("?", 1)[0] if len(request_line) > 1 else "/"
+            healthy = self.healthy_urls()
+            if path == "/servers":
+                status, body, content_type = 200, ",".join(healthy), "text/plain"
+            elif path in ("/health", "/ready"):
+                ok = len(healthy) == len(self.workers) if path == "/ready" else bool(healthy)
+                status, content_type = (200 if ok else 503), "application/json"
+                body = json.dumps({"healthy": len(healthy), "workers": [w.status() for w in self.workers]})
+            else:
+                status, body, content_type = 404, "not found", "text/plain"
+            reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[status]
+            payload = body.encode()
+            writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n"
+                         f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode() + payload)
+            await writer.drain()
+        finally:
+            writer.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run a supervised pool of MCP servers over streamable HTTP.")
+    parser.add_argument("--server", type=pathlib.Path, default=SRC_DIR / "mcp_server.py",
+                        help="MCP server script to run (default: src/mcp_server.py)")
+    parser.add_argument("--workers", type=int, default=POOL_WORKERS)
+    parser.add_argument("--host", default=POOL_HOST)
+    parser.add_argument("--base-port", type=int, default=POOL_BASE_PORT)
+    parser.add_argument("--status-port", type=int, default=POOL_STATUS_PORT)
+    args = parser.parse_args()
+
+    pool = ServerPool(args.server.resolve(), args.workers, args.host, args.base_port)
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stopping.set)
+
+    start = time.perf_counter()
+    try:
+        await pool.start()
+    except RuntimeError as e:
+        log(f"error: {e}")
+        sys.exit(1)
+    status_server = await asyncio.start_server(pool.serve_status, args.host, args.status_port)
+    log(f"{len(pool.workers)} workers ready in {time.perf_counter() - start:.2f}s; "
+        f"status on http://{args.host}:{args.status_port}/health")
+    # The one line on stdout, ready to be exported by a wrapper script
+    print(f"MCP_SERVER_URLS={','.join(pool.healthy_urls())}", flush=True)
+
+    supervisors = [asyncio.create_task(pool.supervise(worker)) for worker in pool.workers]
+    await stopping.wait()
+    log("shutting down")
+    for task in supervisors:
+        task.cancel()
+    await asyncio.gather(*supervisors, return_exceptions=True)
+    status_server.close()
+    await pool.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# Command-line transport selection shared by the MCP servers.
+#
+#   python src/mcp_server.py                                        # stdio, spawned by an agent
+#   python src/mcp_server.py --transport streamable-http --port 8000  # http://127.0.0.1:8000/mcp
+#   python src/mcp_server.py --transport sse --port 8000            # GET /sse + POST /messages/
+#   python src/mcp_server.py --transport streamable-http --workers 4
+#
+# Every flag defaults to an environment variable (MCP_TRANSPORT, MCP_HOST, MCP_PORT,
+# MCP_WORKERS, MCP_STATELESS, MCP_LOG_LEVEL), which is how mcp_server_pool.py
+# configures its workers.
+#
+# With --workers N the parent binds the port once and starts N copies of the
+# server on the shared socket, so the kernel spreads connections over them
+# (as gunicorn does). Streamable HTTP then runs stateless, since consecutive
+# requests of one client may reach different workers. The workers share no
+# memory, so this only suits servers whose tools do not depend on earlier calls
+# answered by the same process: caches are per worker (a write through one
+# worker does not invalidate another's entries before their TTL), and a server
+# that keeps per-client state between calls passes run_server(mcp,
+# single_process="...") to refuse --workers. SSE keeps a session open on a
+# single process and cannot be spread this way either.
+
+import argparse
+import logging
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+TRANSPORTS = ("stdio", "streamable-http", "sse")
+LISTEN_FD_ENV = "MCP_LISTEN_FD"      # set in the workers started by --workers
+RESTART_DELAY = 1.0                  # seconds before a crashed worker is started again
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+
+
+def parse_args(argv=None, single_process=None):
+    parser = argparse.ArgumentParser(description="Run the MCP server over stdio, streamable HTTP or SSE.")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=os.getenv("MCP_TRANSPORT", "stdio"))
+    parser.add_argument("--host", default=os.getenv("MCP_HOST", "127.0.0.1"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("MCP_PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("MCP_WORKERS", "1")),
+                        help="server processes sharing the port (streamable-http only)")
+    parser.add_argument("--stateless", action="store_true",
+                        default=os.getenv("MCP_STATELESS", "0").lower() in ("1", "true", "yes"),
+                        help="no per-client session state (implied by --workers > 1)")
+    parser.add_argument("--log-level", choices=("DEBUG", "INFO", "WARNING", "ERROR"),
+                        default=os.getenv("MCP_LOG_LEVEL", "INFO").upper(),
+                        help="WARNING drops the per-request log lines, which cost throughput under load")
+    args = parser.parse_args(argv)
+    if args.workers > 1 and single_process:
+        parser.error(f"--workers must be 1 for this server: {single_process} live in one process")
+    if args.workers > 1 and args.transport != "streamable-http":
+        parser.error("--workers needs --transport streamable-http; SSE sessions live in one process")
+    return args
+
+
+def configure(mcp, args):
+    # FastMCP fixes its log level when the server object is created, so FASTMCP_LOG_LEVEL has no effect
+    mcp.settings.log_level = args.log_level
+    logging.getLogger().setLevel(args.log_level)
+    mcp.settings.host = args.host
+    mcp.settings.port = args.port
+    mcp.settings.stateless_http = args.stateless or args.workers > 1
+    if args.host not in LOOPBACK_HOSTS:
+        # FastMCP only allows localhost Host headers when it was created for 127.0.0.1;
+        # drop that check, as it would for a server created for this host
+        mcp.settings.transport_security = None
+
+
+def serve_socket(mcp, transport, fd):
+    """Serve on the listening socket inherited from the parent (one worker of --workers)."""
+    import anyio
+    import uvicorn
+
+    app = mcp.streamable_http_app() if transport == "streamable-http" else mcp.sse_app()
+    sock = socket.socket(fileno=fd)
+    config = uvicorn.Config(app, log_level=mcp.settings.log_level.lower())
+    anyio.run(uvicorn.Server(config).serve, [sock])
+
+
+def run_workers(args, argv):
+    """Bind the port, start args.workers copies of this script on it and keep them running."""
+    family = socket.AF_INET6 if ":" in args.host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((args.host, args.port))
+    sock.listen(2048)
+    fd = sock.fileno()
+    env = {**os.environ, LISTEN_FD_ENV: str(fd)}
+    command = [sys.executable, sys.argv[0], *argv]
+
+    def spawn():
+        return subprocess.Popen(command, env=env, pass_fds=[fd])
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+    workers = [spawn() for _ in range(args.workers)]
+    print(f"Serving http://{args.host}:{args.port}{'/mcp' if args.transport == 'streamable-http' else '/sse'} "
+          f"with {args.workers} workers", file=sys.stderr, flush=True)
+    while not stopping:
+        time.sleep(0.2)
+        for i, worker in enumerate(workers):
+            if worker.poll() is not None and not stopping:
+                print(f"Worker {worker.pid} exited with code {worker.returncode}; restarting",
+                      file=sys.stderr, flush=True)
+                time.sleep(RESTART_DELAY)
+                workers[i] = spawn()
+    for worker in workers:
+        if worker.poll() is None:
+            worker.terminate()
+    for worker in workers:
+        try:
+            worker.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            worker.kill()
+    sock.close()
+
+
+def run_server(mcp, argv=None, single_process=None):
+    """Run `mcp` with the transport chosen on the command line (stdio by default).
+
+    `single_process` names the per-process state a server's tools rely on between
+    calls; when set, --workers above 1 is refused.
+    """
+    argv = sys.argv[1:] if argv is None else argv
+    args = parse_args(argv, single_process)
+    if args.transport == "stdio":
+        mcp.run(transport="stdio")
+        return
+    configure(mcp, args)
+    if os.getenv(LISTEN_FD_ENV):
+        serve_socket(mcp, args.transport, int(os.environ[LISTEN_FD_ENV]))
+    elif args.workers > 1:
+        run_workers(args, argv)
+    else:
+        mcp.run(transport=args.transport)
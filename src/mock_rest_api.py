@@ -1,70 +1,247 @@
 from flask import Flask, jsonify, request
-import uuid
+from flask.json.provider import DefaultJSONProvider, JSONProvider
+from storage import InsufficientStock, ProductNotFound, create_store
+import atexit
+import base64
+import fast_json
+import os
+import time
+
+class FastJSONProvider(JSONProvider):
+    """jsonify() through fast_json (orjson when installed), always compact."""
+
+    def dumps(self, obj, **kwargs):
+        return fast_json.dumps_str(obj, DefaultJSONProvider.default)
+
+    def loads(self, s, **kwargs):
+        return fast_json.loads(s)
+
+    def response(self, *args, **kwargs):
+        # jsonify(value), jsonify(a, b) for a list or jsonify(key=value) for an object
+        if args and kwargs:
+            raise TypeError("jsonify() takes either args or kwargs, not both")
+        obj = args[0] if len(args) == 1 else list(args) if args else kwargs or None
+        # Hand the encoded bytes straight to the response instead of going through a str
+        return self._app.response_class(fast_json.dumps(obj, DefaultJSONProvider.default),
+                                        mimetype="application/json")
 
 app = Flask(__name__)
+# Set MOCK_API_FAST_JSON=0 to serve responses with Flask's default (stdlib) encoder
+if os.getenv("MOCK_API_FAST_JSON", "1").lower() not in ("0", "false", "no"):
+    app.json = FastJSONProvider(app)
+
+# Optional artificial backend latency (milliseconds) so benchmarks can model a real service
+SIMULATED_LATENCY_MS = float(os.getenv("MOCK_API_LATENCY_MS", "0"))
+
+@app.before_request
+def simulate_latency():
+    # The health probe is answered straight away so readiness checks stay cheap
+    if SIMULATED_LATENCY_MS and request.path != "/health":
+        time.sleep(SIMULATED_LATENCY_MS / 1000.0)
+
+@app.route('/health', methods=['GET'])
+def health():
+    # Readiness probe used by extras/demo.py and other orchestrators
+    return jsonify({"status": "ok"})
+
+# Upper bound on the number of items accepted by a single batch request
+MAX_BATCH_SIZE = int(os.getenv("MOCK_API_MAX_BATCH_SIZE", "100"))
+
+# Largest page a list endpoint returns when the client asks for `limit`
+MAX_PAGE_SIZE = int(os.getenv("MOCK_API_MAX_PAGE_SIZE", "1000"))
+
+PRODUCT_FIELDS = ("id", "name", "price", "stock")
+ORDER_FIELDS = ("id", "product_id", "product_name", "quantity", "total_price", "status")
+
+# Storage backend (MOCK_API_STORE=memory|sqlite, see storage.py)
+store = create_store()
+atexit.register(store.close)
+
+class InvalidQuery(ValueError):
+    """A list endpoint received a malformed query parameter."""
+
+@app.errorhandler(InvalidQuery)
+def invalid_query(error):
+    return jsonify({"error": str(error)}), 400
+
+def number_arg(name, cast=float):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except ValueError:
+        raise InvalidQuery(f"Query parameter {name} must be a number") from None
+
+def encode_cursor(position):
+    return base64.urlsafe_b64encode(str(position).encode()).decode()
+
+def decode_cursor(cursor):
+    try:
+        position = int(base64.urlsafe_b64decode(cursor.encode()).decode())
+    except ValueError:
+        raise InvalidQuery("Invalid cursor") from None
+    if position < 0:
+        # Cursors count rows from the start; a negative one would index from the end
+        raise InvalidQuery("Invalid cursor")
+    return position
+
+def list_response(fetch_page, allowed_fields):
+    """Serve a store listing with `fields=` projection and cursor pagination.
+
+    Without `limit` or `cursor` the response is the plain JSON list the API has
+    always returned. With them it is {"items": [...], "next_cursor": ...}, where
+    next_cursor is null on the last page.
+    """
+    limit = number_arg('limit', int)
+    if limit is not None and not 1 <= limit <= MAX_PAGE_SIZE:
+        raise InvalidQuery(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    cursor = request.args.get('cursor')
+
+    fields = None
+    if request.args.get('fields'):
+        fields = [field.strip() for field in request.args['fields'].split(',') if field.strip()]
+        unknown = [field for field in fields if field not in allowed_fields]
+        if unknown:
+            raise InvalidQuery(f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(allowed_fields)}")
 
-# In-memory data store
-products = {
-    "1": {"id": "1", "name": "Laptop", "price": 1200.00, "stock": 10},
-    "2": {"id": "2", "name": "Mouse", "price": 25.00, "stock": 50},
-    "3": {"id": "3", "name": "Keyboard", "price": 75.00, "stock": 30},
-}
+    items, next_cursor = fetch_page(cursor=decode_cursor(cursor) if cursor else None, limit=limit)
+    if fields:
+        items = [{field: item[field] for field in fields} for item in items]
 
-orders = {
-    # order_id: {order_details}
-    "1": {"id": "1", "product_id": "1", "product_name": "Laptop", "quantity": 2, "total_price": 2400.00, "status": "pending"},
-    "2": {"id": "2", "product_id": "2", "product_name": "Mouse", "quantity": 1, "total_price": 25.00, "status": "shipped"},     
-}
+    if limit is None and cursor is None:
+        return jsonify(items)
+    return jsonify({"items": items, "next_cursor": None if next_cursor is None else encode_cursor(next_cursor)})
 
 @app.route('/products', methods=['GET'])
 def get_products():
-    return jsonify(list(products.values()))
+    min_price = number_arg('min_price')
+    max_price = number_arg('max_price')
+    return list_response(
+        lambda cursor, limit: store.list_products(min_price, max_price, cursor=cursor, limit=limit),
+        PRODUCT_FIELDS,
+    )
 
 @app.route('/products/<product_id>', methods=['GET'])
 def get_product(product_id):
-    product = products.get(product_id)
+    product = store.get_product(product_id)
     if product:
         return jsonify(product)
     return jsonify({"error": "Product not found"}), 404
 
+def order_filters():
+    """Parse the order filter parameters shared by the order list endpoints."""
+    return {
+        "status": request.args.get('status'),
+        "product_id": request.args.get('product_id'),
+        "min_total": number_arg('min_total'),
+        "max_total": number_arg('max_total'),
+    }
+
+def list_orders(filters):
+    """List orders matching `filters`; the store serves them from its indexes."""
+    return list_response(lambda cursor, limit: store.list_orders(**filters, cursor=cursor, limit=limit), ORDER_FIELDS)
+
 @app.route('/orders', methods=['GET'])
 def get_orders():
-    return jsonify(list(orders.values()))
+    return list_orders(order_filters())
 
-@app.route('/orders', methods=['POST'])
-def create_order():
-    data = request.get_json()
+@app.route('/products/<product_id>/orders', methods=['GET'])
+def get_product_orders(product_id):
+    if store.get_product(product_id) is None:
+        return jsonify({"error": "Product not found"}), 404
+    return list_orders({**order_filters(), "product_id": product_id})
+
+@app.route('/orders/stats', methods=['GET'])
+def get_order_stats():
+    return jsonify(store.order_stats(number_arg('min_total'), number_arg('max_total')))
+
+def place_order(data):
+    """Validate and place a single order; returns (body, status_code)."""
     if not data or 'product_id' not in data or 'quantity' not in data:
-        return jsonify({"error": "Missing product_id or quantity"}), 400
+        return {"error": "Missing product_id or quantity"}, 400
 
     product_id = data['product_id']
     quantity = data['quantity']
 
-    product = products.get(product_id)
-    if not product:
-        return jsonify({"error": "Product not found"}), 404
-    if product['stock'] < quantity:
-        return jsonify({"error": f"Not enough stock for product {product['name']}. Available: {product['stock']}"}), 400
-
-    order_id = str(uuid.uuid4())
-    order = {
-        "id": order_id,
-        "product_id": product_id,
-        "product_name": product['name'],
-        "quantity": quantity,
-        "total_price": product['price'] * quantity,
-        "status": "pending"
-    }
-    orders[order_id] = order
-    product['stock'] -= quantity # Deduct stock
-    return jsonify(order), 201
+    if isinstance(quantity, bool) or not isinstance(quantity, int) or quantity < 1:
+        return {"error": "quantity must be a positive integer"}, 400
+
+    try:
+        return store.create_order(product_id, quantity), 201
+    except ProductNotFound:
+        return {"error": "Product not found"}, 404
+    except InsufficientStock as e:
+        return {"error": str(e)}, 400
+
+@app.route('/orders', methods=['POST'])
+def create_order():
+    body, status = place_order(request.get_json())
+    return jsonify(body), status
 
 @app.route('/orders/<order_id>', methods=['GET'])
 def get_order(order_id):
-    order = orders.get(order_id)
+    order = store.get_order(order_id)
     if order:
         return jsonify(order)
     return jsonify({"error": "Order not found"}), 404
 
+def batch_items(key):
+    """Read and validate the list under `key` in a batch request body."""
+    data = request.get_json(silent=True) or {}
+    ids = data.get(key)
+    if not isinstance(ids, list):
+        return None, (jsonify({"error": f"Body must contain a list of {key}"}), 400)
+    if len(ids) > MAX_BATCH_SIZE:
+        return None, (jsonify({"error": f"At most {MAX_BATCH_SIZE} {key} per batch"}), 400)
+    return ids, None
+
+# Batch endpoints: one round trip for many items. Results come back in request
+# order, each one carrying its own ok/error status instead of failing the batch.
+@app.route('/products/batch', methods=['POST'])
+def get_products_batch():
+    ids, error = batch_items('ids')
+    if error:
+        return error
+    found = store.get_products_by_ids([str(product_id) for product_id in ids])
+    results = []
+    for product_id in ids:
+        product = found.get(str(product_id))
+        if product:
+            results.append({"id": product_id, "ok": True, "product": product})
+        else:
+            results.append({"id": product_id, "ok": False, "status": 404, "error": "Product not found"})
+    return jsonify({"results": results})
+
+@app.route('/orders/batch', methods=['POST'])
+def get_orders_batch():
+    ids, error = batch_items('ids')
+    if error:
+        return error
+    found = store.get_orders_by_ids([str(order_id) for order_id in ids])
+    results = []
+    for order_id in ids:
+        order = found.get(str(order_id))
+        if order:
+            results.append({"id": order_id, "ok": True, "order": order})
+        else:
+            results.append({"id": order_id, "ok": False, "status": 404, "error": "Order not found"})
+    return jsonify({"results": results})
+
+@app.route('/orders/bulk', methods=['POST'])
+def create_orders_bulk():
+    # Each order is placed independently; one failing item does not roll back the others
+    items, error = batch_items('orders')
+    if error:
+        return error
+    results = []
+    for item in items:
+        body, status = place_order(item if isinstance(item, dict) else None)
+        if status == 201:
+            results.append({"ok": True, "order": body})
+        else:
+            results.append({"ok": False, "status": status, "error": body["error"]})
+    return jsonify({"results": results})
+
 if __name__ == '__main__':
     app.run(port=5000, debug=True)
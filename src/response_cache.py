@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# Bounded TTL + LRU cache for read-only MCP tool results
+
+import functools
+import inspect
+import os
+import threading
+import time
+from collections import OrderedDict
+
+CACHE_MAXSIZE = int(os.getenv("MCP_CACHE_MAXSIZE", "1024"))
+
+# Default time-to-live (seconds) per cached tool; override with MCP_CACHE_TTL_<TOOL_NAME>,
+# e.g. MCP_CACHE_TTL_GET_ALL_PRODUCTS=5. A TTL of 0 disables caching for that tool.
+DEFAULT_TTLS = {
+    "get_all_products": 30.0,
+    "get_product_by_id": 30.0,
+    "get_all_orders": 10.0,
+    "get_order_by_id": 60.0,
+}
+
+
+def ttls_from_env(defaults=DEFAULT_TTLS):
+    return {
+        name: float(os.getenv(f"MCP_CACHE_TTL_{name.upper()}", ttl))
+        for name, ttl in defaults.items()
+    }
+
+
+class ResponseCache:
+    """Thread-safe LRU cache whose entries also expire after a per-namespace TTL.
+
+    Entries are keyed by (namespace, call arguments); the namespace is the tool
+    name, so writes can drop a single entry or everything a tool has cached.
+    """
+
+    def __init__(self, maxsize=CACHE_MAXSIZE, ttls=None):
+        self.maxsize = maxsize
+        self.ttls = ttls if ttls is not None else ttls_from_env()
+        self._entries = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self._counters = {}             # namespace -> {"hits", "misses", ...}
+        self.evictions = 0
+
+    def _count(self, namespace, name):
+        counters = self._counters.setdefault(
+            namespace, {"hits": 0, "misses": 0, "expired": 0, "invalidations": 0}
+        )
+        counters[name] += 1
+
+    def lookup(self, namespace, args):
+        """Return (True, value) for a fresh entry, else (False, None)."""
+        key = (namespace, args)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._count(namespace, "hits")
+                    return True, value
+                del self._entries[key]
+                self._count(namespace, "expired")
+            self._count(namespace, "misses")
+            return False, None
+
+    def store(self, namespace, args, value):
+        ttl = self.ttls.get(namespace, 0)
+        if ttl <= 0:
+            return
+        key = (namespace, args)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def lookup_many(self, namespace, ids):
+        """Look up single-argument entries for many ids at once.
+
+        Returns ({id: value} for the fresh entries, [ids still to fetch]); the
+        miss list is de-duplicated and keeps the request order.
+        """
+        hits = {}
+        misses = []
+        for item_id in dict.fromkeys(ids):
+            found, value = self.lookup(namespace, (item_id,))
+            if found:
+                hits[item_id] = value
+            else:
+                misses.append(item_id)
+        return hits, misses
+
+    def invalidate(self, namespace, *args):
+        """Drop one entry (when args are given) or every entry of a namespace."""
+        with self._lock:
+            if args:
+                removed = self._entries.pop((namespace, args), None) is not None
+            else:
+                stale = [key for key in self._entries if key[0] == namespace]
+                for key in stale:
+                    del self._entries[key]
+                removed = bool(stale)
+            if removed:
+                self._count(namespace, "invalidations")
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def cached(self, namespace):
+        """Decorate a sync or async tool so its results are served from the cache."""
+
+        def decorator(fn):
+            signature = inspect.signature(fn)
+
+            def cache_args(args, kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                return tuple(bound.arguments.values())
+
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    key_args = cache_args(args, kwargs)
+                    found, value = self.lookup(namespace, key_args)
+                    if found:
+                        return value
+                    value = await fn(*args, **kwargs)
+                    self.store(namespace, key_args, value)
+                    return value
+
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                key_args = cache_args(args, kwargs)
+                found, value = self.lookup(namespace, key_args)
+                if found:
+                    return value
+                value = fn(*args, **kwargs)
+                self.store(namespace, key_args, value)
+                return value
+
+            return wrapper
+
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            per_tool = {name: dict(counters) for name, counters in self._counters.items()}
+            hits = sum(c["hits"] for c in per_tool.values())
+            misses = sum(c["misses"] for c in per_tool.values())
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": hits,
+                "misses": misses,
+                "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+                "evictions": self.evictions,
+                "ttls": dict(self.ttls),
+                "tools": per_tool,
+            }
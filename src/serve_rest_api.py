@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+# Production entry point for the mock REST API.
+#
+# `python src/mock_rest_api.py` runs Flask's single-process dev server with the
+# reloader and debugger. This script serves the same app through gunicorn
+# instead: several worker processes with a thread pool each, no debug hooks, and
+# a configurable bind address and listen backlog. With more than one worker the
+# SQLite store is used so that every worker sees the same products and orders.
+#
+# Usage: python src/serve_rest_api.py [--bind 127.0.0.1:5000] [--workers 4] [--threads 8]
+
+import argparse
+import multiprocessing
+import os
+import sys
+
+from gunicorn.app.base import BaseApplication
+
+
+class RestApiApplication(BaseApplication):
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        # Imported in each worker (no preload), so every worker opens its own store connections
+        from mock_rest_api import app
+        return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve mock_rest_api.py with gunicorn.")
+    parser.add_argument("--bind", default=os.getenv("MOCK_API_BIND", "127.0.0.1:5000"))
+    parser.add_argument("--workers", type=int,
+                        default=int(os.getenv("MOCK_API_WORKERS", min(multiprocessing.cpu_count(), 4))))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("MOCK_API_THREADS", "8")))
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("MOCK_API_BACKLOG", "2048")))
+    parser.add_argument("--keepalive", type=int, default=5, help="seconds to hold idle keep-alive connections")
+    args = parser.parse_args()
+
+    # In-memory state would diverge between worker processes
+    if args.workers > 1 and os.getenv("MOCK_API_STORE", "memory") != "sqlite":
+        print("Using the sqlite store so state is shared across workers", file=sys.stderr)
+        os.environ["MOCK_API_STORE"] = "sqlite"
+
+    # Make `import mock_rest_api` resolve when started from the repository root
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    RestApiApplication({
+        "bind": args.bind,
+        "workers": args.workers,
+        "threads": args.threads,
+        "worker_class": "gthread",
+        "backlog": args.backlog,
+        "keepalive": args.keepalive,
+        "accesslog": None,
+        "loglevel": "warning",
+    }).run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,608 @@
+#!/usr/bin/env python3
+# Pluggable storage backends for mock_rest_api.py
+#
+# MOCK_API_STORE selects the backend:
+#   memory  - Python dicts with secondary indexes (default; lost on restart)
+#   sqlite  - embedded SQLite database in WAL mode at MOCK_API_DB_PATH (durable)
+#
+# Load a large synthetic catalog into the SQLite store with:
+#   python src/storage.py --db mock_store.db --products 1000000
+
+import abc
+import argparse
+import bisect
+import itertools
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+
+STORE_BACKEND = os.getenv("MOCK_API_STORE", "memory")
+DB_PATH = os.getenv("MOCK_API_DB_PATH", "mock_store.db")
+STOCK_LOCK_STRIPES = int(os.getenv("MOCK_API_STOCK_LOCK_STRIPES", "64"))
+
+SEED_PRODUCTS = [
+    {"id": "1", "name": "Laptop", "price": 1200.00, "stock": 10},
+    {"id": "2", "name": "Mouse", "price": 25.00, "stock": 50},
+    {"id": "3", "name": "Keyboard", "price": 75.00, "stock": 30},
+]
+
+SEED_ORDERS = [
+    {"id": "1", "product_id": "1", "product_name": "Laptop", "quantity": 2, "total_price": 2400.00, "status": "pending"},
+    {"id": "2", "product_id": "2", "product_name": "Mouse", "quantity": 1, "total_price": 25.00, "status": "shipped"},
+]
+
+
+class ProductNotFound(LookupError):
+    """The product an order refers to does not exist."""
+
+
+class InsufficientStock(Exception):
+    """The product does not have enough stock left for the order."""
+
+    def __init__(self, name, available):
+        super().__init__(f"Not enough stock for product {name}. Available: {available}")
+        self.name = name
+        self.available = available
+
+
+def new_order(product, quantity):
+    return {
+        "id": str(uuid.uuid4()),
+        "product_id": product["id"],
+        "product_name": product["name"],
+        "quantity": quantity,
+        "total_price": product["price"] * quantity,
+        "status": "pending",
+    }
+
+
+class Store(abc.ABC):
+    """Interface every backend implements.
+
+    List methods return (items, next_cursor). The cursor is an opaque integer
+    that is only meaningful to the backend that produced it; pass it back
+    unchanged to continue. next_cursor is None on the last page. Listings are
+    in insertion order, except orders filtered by a total range alone, which
+    come by total_price (then insertion order) so they can page through the
+    total index.
+    """
+
+    @abc.abstractmethod
+    def get_product(self, product_id):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_products_by_ids(self, product_ids):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list_products(self, min_price=None, max_price=None, cursor=None, limit=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def set_stock(self, product_id, stock):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def create_order(self, product_id, quantity):
+        """Atomically reserve stock and record the order; raises ProductNotFound or InsufficientStock."""
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_order(self, order_id):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def get_orders_by_ids(self, order_ids):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def list_orders(self, status=None, product_id=None, min_total=None, max_total=None, cursor=None, limit=None):
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def order_stats(self, min_total=None, max_total=None):
+        raise NotImplementedError
+
+    def close(self):
+        """Release the backend's resources; the store must not be used afterwards."""
+
+
+def page(values, predicate, start, limit, lookup=None):
+    """Scan `values` from position `start`; the cursor is the position to resume at.
+
+    When `lookup` is given, `values` holds keys and items are resolved lazily, so
+    a page only touches the items it scans.
+    """
+    items = []
+    next_cursor = None
+    # The length is read once, so items appended while we page are left for the next call
+    for position in range(start or 0, len(values)):
+        item = values[position] if lookup is None else lookup(values[position])
+        if predicate is not None and not predicate(item):
+            continue
+        if limit is not None and len(items) == limit:
+            next_cursor = position
+            break
+        items.append(item)
+    return items, next_cursor
+
+
+class SortedBuckets:
+    """Sorted container stored as a list of short sorted buckets.
+
+    A single sorted list would move O(n) elements on every insort; bucketing keeps
+    inserts at O(log n + bucket size) while range scans stay O(log n + k).
+    """
+
+    def __init__(self, load=1000):
+        self.load = load
+        self.buckets = []   # sorted lists, each at most 2 * load long
+        self.maxes = []     # last value of each bucket
+        self.size = 0
+
+    def add(self, value):
+        self.size += 1
+        if not self.buckets:
+            self.buckets.append([value])
+            self.maxes.append(value)
+            return
+        i = bisect.bisect_left(self.maxes, value)
+        if i == len(self.maxes):
+            i -= 1
+            self.buckets[i].append(value)
+            self.maxes[i] = value
+        else:
+            bisect.insort(self.buckets[i], value)
+        bucket = self.buckets[i]
+        if len(bucket) > 2 * self.load:
+            self.buckets[i:i + 1] = [bucket[:self.load], bucket[self.load:]]
+            self.maxes[i:i + 1] = [bucket[self.load - 1], bucket[-1]]
+
+    def rank(self, value, inclusive=False):
+        """Number of values below `value` (or at most `value` when inclusive)."""
+        find = bisect.bisect_right if inclusive else bisect.bisect_left
+        i = find(self.maxes, value)
+        below = sum(len(bucket) for bucket in self.buckets[:i])
+        if i < len(self.buckets):
+            below += find(self.buckets[i], value)
+        return below
+
+    def count(self, low, high):
+        """Number of values v with low <= v <= high, without visiting them."""
+        return max(0, self.rank(high, inclusive=True) - self.rank(low))
+
+    def irange(self, low, high):
+        """Yield values v with low <= v <= high, in sorted order."""
+        i = bisect.bisect_left(self.maxes, low)
+        for bucket in self.buckets[i:]:
+            start = bisect.bisect_left(bucket, low)
+            for value in bucket[start:]:
+                if value > high:
+                    return
+                yield value
+
+    def __len__(self):
+        return self.size
+
+
+class OrderIndexes:
+    """Secondary indexes over the orders, maintained on every insert.
+
+    Orders are append-only, so by_product and by_status map a key to the list
+    of matching order ids in insertion order, and all_ids lists every order.
+    Listings page through these lists by position without copying them. by_total
+    keeps (total_price, seq, order_id) sorted, so total ranges are listed by
+    keyset and counted by bisection.
+    Writers, sorted-range readers and counts() serialize on a lock; list readers do not
+    need it because appends are atomic.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.all_ids = []
+        self.by_product = defaultdict(list)
+        self.by_status = defaultdict(list)
+        self.by_total = SortedBuckets()
+
+    def add(self, order):
+        order_id = order['id']
+        with self._lock:
+            seq = len(self.all_ids)
+            self.all_ids.append(order_id)
+            self.by_product[order['product_id']].append(order_id)
+            self.by_status[order['status']].append(order_id)
+            self.by_total.add((order['total_price'], seq, order_id))
+
+    def for_product(self, product_id):
+        return self.by_product.get(product_id, [])
+
+    def for_status(self, status):
+        return self.by_status.get(status, [])
+
+    def counts(self):
+        """(orders per status, orders per product), read under the lock so no key is added mid-iteration."""
+        with self._lock:
+            return ({status: len(ids) for status, ids in self.by_status.items() if ids},
+                    {product_id: len(ids) for product_id, ids in self.by_product.items() if ids})
+
+    @staticmethod
+    def _total_bounds(min_total, max_total):
+        low = (float('-inf'),) if min_total is None else (min_total,)
+        high = (float('inf'),) if max_total is None else (max_total, float('inf'))
+        return low, high
+
+    def total_range(self, min_total, max_total, after=None, limit=None):
+        """Up to `limit` (total_price, seq, order_id) entries in the range, after the (total_price, seq) `after`."""
+        low, high = self._total_bounds(min_total, max_total)
+        if after is not None:
+            low = max(low, (after[0], after[1] + 1))
+        with self._lock:
+            return list(itertools.islice(self.by_total.irange(low, high), limit))
+
+    def count_total_range(self, min_total, max_total):
+        with self._lock:
+            return self.by_total.count(*self._total_bounds(min_total, max_total))
+
+
+class MemoryStore(Store):
+    """In-process dicts with secondary indexes and lock-striped stock reservation."""
+
+    def __init__(self, stripes=STOCK_LOCK_STRIPES):
+        self.products = {}
+        self.product_ids = []     # append-only, like OrderIndexes.all_ids, so pages slice it by position
+        for product in SEED_PRODUCTS:
+            self._insert_product(dict(product))
+        self.orders = {}
+        self.indexes = OrderIndexes()
+        for order in SEED_ORDERS:
+            self._insert_order(dict(order))
+        # Stock reservations lock one of a fixed set of stripes chosen by product id:
+        # check-and-decrement on a product is atomic, while orders for products on
+        # other stripes proceed in parallel.
+        self.stock_locks = [threading.Lock() for _ in range(stripes)]
+
+    def stock_lock(self, product_id):
+        return self.stock_locks[hash(product_id) % len(self.stock_locks)]
+
+    def _insert_product(self, product):
+        self.products[product["id"]] = product
+        self.product_ids.append(product["id"])
+
+    def _insert_order(self, order):
+        self.orders[order["id"]] = order
+        self.indexes.add(order)
+
+    def get_product(self, product_id):
+        return self.products.get(product_id)
+
+    def get_products_by_ids(self, product_ids):
+        return {product_id: self.products[product_id] for product_id in product_ids if product_id in self.products}
+
+    def list_products(self, min_price=None, max_price=None, cursor=None, limit=None):
+        def matches(product):
+            return ((min_price is None or product['price'] >= min_price)
+                    and (max_price is None or product['price'] <= max_price))
+
+        has_filter = min_price is not None or max_price is not None
+        return page(self.product_ids, matches if has_filter else None, cursor, limit,
+                    lookup=self.products.__getitem__)
+
+    def set_stock(self, product_id, stock):
+        with self.stock_lock(product_id):
+            self.products[product_id]["stock"] = stock
+
+    def create_order(self, product_id, quantity):
+        product = self.products.get(product_id)
+        if not product:
+            raise ProductNotFound(product_id)
+        with self.stock_lock(product_id):
+            available = product['stock']
+            if available < quantity:
+                raise InsufficientStock(product['name'], available)
+            product['stock'] = available - quantity # Deduct stock
+        order = new_order(product, quantity)
+        self._insert_order(order)
+        return order
+
+    def get_order(self, order_id):
+        return self.orders.get(order_id)
+
+    def get_orders_by_ids(self, order_ids):
+        return {order_id: self.orders[order_id] for order_id in order_ids if order_id in self.orders}
+
+    def list_orders(self, status=None, product_id=None, min_total=None, max_total=None, cursor=None, limit=None):
+        # Fixed plan order (product, status, total range, full scan) so that a cursor
+        # always resumes against the same candidate sequence.
+        if product_id is not None:
+            candidate_ids = self.indexes.for_product(product_id)
+        elif status is not None:
+            candidate_ids = self.indexes.for_status(status)
+        elif min_total is not None or max_total is not None:
+            return self._list_by_total(min_total, max_total, cursor, limit)
+        else:
+            candidate_ids = self.indexes.all_ids
+
+        def matches(order):
+            return ((status is None or order['status'] == status)
+                    and (product_id is None or order['product_id'] == product_id)
+                    and (min_total is None or order['total_price'] >= min_total)
+                    and (max_total is None or order['total_price'] <= max_total))
+
+        has_filter = any(value is not None for value in (status, product_id, min_total, max_total))
+        return page(candidate_ids, matches if has_filter else None, cursor, limit, lookup=self.orders.__getitem__)
+
+    def _list_by_total(self, min_total, max_total, cursor, limit):
+        # Keyset pagination in (total_price, seq) order; the cursor is one past the
+        # seq of the last order returned, so a page costs O(log n + limit)
+        after = None
+        if cursor:
+            if cursor > len(self.indexes.all_ids):
+                return [], None
+            seq = cursor - 1
+            after = (self.orders[self.indexes.all_ids[seq]]['total_price'], seq)
+        entries = self.indexes.total_range(min_total, max_total, after, None if limit is None else limit + 1)
+        next_cursor = None
+        if limit is not None and len(entries) > limit:
+            entries = entries[:limit]
+            next_cursor = entries[-1][1] + 1
+        return [self.orders[order_id] for _, _, order_id in entries], next_cursor
+
+    def order_stats(self, min_total=None, max_total=None):
+        # Counts come from index sizes, and the total range is counted by bisection
+        # in the sorted total index; no order is visited
+        by_status, by_product = self.indexes.counts()
+        stats = {
+            "total": len(self.orders),
+            "by_status": by_status,
+            "by_product": by_product,
+        }
+        if min_total is not None or max_total is not None:
+            stats["in_total_range"] = self.indexes.count_total_range(min_total, max_total)
+        return stats
+
+
+class SQLiteStore(Store):
+    """Durable store in an embedded SQLite database.
+
+    The database runs in WAL mode so readers never block the writer, and every
+    thread gets its own connection (closed once its thread has exited, or by close()). Queries are fixed, parameterized SQL strings,
+    so sqlite3's per-connection statement cache keeps them prepared. Stock is
+    reserved with a single compare-and-decrement UPDATE inside an IMMEDIATE
+    transaction, which stays correct across threads and worker processes.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            name TEXT NOT NULL,
+            price REAL NOT NULL,
+            stock INTEGER NOT NULL CHECK (stock >= 0)
+        );
+        CREATE TABLE IF NOT EXISTS orders (
+            seq INTEGER PRIMARY KEY,
+            id TEXT NOT NULL UNIQUE,
+            product_id TEXT NOT NULL,
+            product_name TEXT NOT NULL,
+            quantity INTEGER NOT NULL,
+            total_price REAL NOT NULL,
+            status TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS products_price ON products (price, seq);
+        CREATE INDEX IF NOT EXISTS orders_product ON orders (product_id, seq);
+        CREATE INDEX IF NOT EXISTS orders_status ON orders (status, seq);
+        CREATE INDEX IF NOT EXISTS orders_total ON orders (total_price, seq);
+    """
+
+    PRODUCT_COLUMNS = "seq, id, name, price, stock"
+    ORDER_COLUMNS = "seq, id, product_id, product_name, quantity, total_price, status"
+    INSERT_PRODUCT = "INSERT INTO products (id, name, price, stock) VALUES (:id, :name, :price, :stock)"
+    INSERT_ORDER = ("INSERT INTO orders (id, product_id, product_name, quantity, total_price, status) "
+                    "VALUES (:id, :product_id, :product_name, :quantity, :total_price, :status)")
+
+    def __init__(self, path=DB_PATH, busy_timeout=5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._connections = []   # (thread, connection) for every open per-thread connection
+        self._connections_lock = threading.Lock()
+        # Several worker processes may open the database at once; one transaction
+        # makes schema creation and seeding happen exactly once.
+        with self._transaction() as conn:
+            for statement in self.SCHEMA.split(";"):
+                if statement.strip():
+                    conn.execute(statement)
+            if conn.execute("SELECT COUNT(*) FROM products").fetchone()[0] == 0:
+                conn.executemany(self.INSERT_PRODUCT, SEED_PRODUCTS)
+                conn.executemany(self.INSERT_ORDER, SEED_ORDERS)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Autocommit mode; transactions are opened explicitly where needed
+            conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                                   check_same_thread=False, cached_statements=256)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                # A threaded server starts a thread per request; close what finished threads left open
+                finished = [old for thread, old in self._connections if not thread.is_alive()]
+                self._connections = [(thread, old) for thread, old in self._connections if thread.is_alive()]
+                self._connections.append((threading.current_thread(), conn))
+            for old in finished:
+                old.close()
+        return conn
+
+    def close(self):
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for _, conn in connections:
+            conn.close()
+
+    class _Transaction:
+        def __init__(self, conn):
+            self.conn = conn
+
+        def __enter__(self):
+            # Take the write lock up front so concurrent writers queue instead of deadlocking
+            self.conn.execute("BEGIN IMMEDIATE")
+            return self.conn
+
+        def __exit__(self, exc_type, exc, tb):
+            self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
+
+    def _transaction(self):
+        return self._Transaction(self._conn())
+
+    @staticmethod
+    def _item(row):
+        item = dict(row)
+        item.pop("seq", None)
+        return item
+
+    def _page(self, sql, params, cursor, limit):
+        # Keyset pagination on seq: the cursor is the last seq returned
+        return self._fetch_page(sql + " AND seq > ? ORDER BY seq", [*params, cursor or 0], limit)
+
+    def _fetch_page(self, sql, params, limit):
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit + 1)
+        rows = self._conn().execute(sql, params).fetchall()
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = rows[-1]["seq"]
+        return [self._item(row) for row in rows], next_cursor
+
+    def load_products(self, products):
+        """Bulk insert products in one transaction."""
+        with self._transaction() as conn:
+            conn.executemany(self.INSERT_PRODUCT, products)
+
+    def get_product(self, product_id):
+        row = self._conn().execute(
+            f"SELECT {self.PRODUCT_COLUMNS} FROM products WHERE id = ?", (product_id,)
+        ).fetchone()
+        return self._item(row) if row else None
+
+    def get_products_by_ids(self, product_ids):
+        placeholders = ",".join("?" * len(product_ids))
+        rows = self._conn().execute(
+            f"SELECT {self.PRODUCT_COLUMNS} FROM products WHERE id IN ({placeholders})", list(product_ids)
+        ).fetchall() if product_ids else []
+        return {row["id"]: self._item(row) for row in rows}
+
+    def list_products(self, min_price=None, max_price=None, cursor=None, limit=None):
+        sql = f"SELECT {self.PRODUCT_COLUMNS} FROM products WHERE 1 = 1"
+        params = []
+        if min_price is not None:
+            sql += " AND price >= ?"
+            params.append(min_price)
+        if max_price is not None:
+            sql += " AND price <= ?"
+            params.append(max_price)
+        return self._page(sql, params, cursor, limit)
+
+    def set_stock(self, product_id, stock):
+        self._conn().execute("UPDATE products SET stock = ? WHERE id = ?", (stock, product_id))
+
+    def create_order(self, product_id, quantity):
+        with self._transaction() as conn:
+            reserved = conn.execute(
+                "UPDATE products SET stock = stock - ? WHERE id = ? AND stock >= ?",
+                (quantity, product_id, quantity),
+            ).rowcount
+            row = conn.execute(
+                f"SELECT {self.PRODUCT_COLUMNS} FROM products WHERE id = ?", (product_id,)
+            ).fetchone()
+            if row is None:
+                raise ProductNotFound(product_id)
+            if not reserved:
+                raise InsufficientStock(row["name"], row["stock"])
+            order = new_order(self._item(row), quantity)
+            conn.execute(self.INSERT_ORDER, order)
+        return order
+
+    def get_order(self, order_id):
+        row = self._conn().execute(
+            f"SELECT {self.ORDER_COLUMNS} FROM orders WHERE id = ?", (order_id,)
+        ).fetchone()
+        return self._item(row) if row else None
+
+    def get_orders_by_ids(self, order_ids):
+        placeholders = ",".join("?" * len(order_ids))
+        rows = self._conn().execute(
+            f"SELECT {self.ORDER_COLUMNS} FROM orders WHERE id IN ({placeholders})", list(order_ids)
+        ).fetchall() if order_ids else []
+        return {row["id"]: self._item(row) for row in rows}
+
+    def list_orders(self, status=None, product_id=None, min_total=None, max_total=None, cursor=None, limit=None):
+        if status is None and product_id is None and (min_total is not None or max_total is not None):
+            return self._list_orders_by_total(min_total, max_total, cursor, limit)
+        sql = f"SELECT {self.ORDER_COLUMNS} FROM orders WHERE 1 = 1"
+        params = []
+        for clause, value in (("status = ?", status), ("product_id = ?", product_id),
+                              ("total_price >= ?", min_total), ("total_price <= ?", max_total)):
+            if value is not None:
+                sql += f" AND {clause}"
+                params.append(value)
+        return self._page(sql, params, cursor, limit)
+
+    def _list_orders_by_total(self, min_total, max_total, cursor, limit):
+        # Keyset pagination in (total_price, seq) order along orders_total, as the
+        # memory store does; the cursor is the seq of the last order returned
+        sql = f"SELECT {self.ORDER_COLUMNS} FROM orders WHERE total_price >= ? AND total_price <= ?"
+        params = [float("-inf") if min_total is None else min_total,
+                  float("inf") if max_total is None else max_total]
+        if cursor:
+            sql += " AND (total_price, seq) > ((SELECT total_price FROM orders WHERE seq = ?), ?)"
+            params += [cursor, cursor]
+        return self._fetch_page(sql + " ORDER BY total_price, seq", params, limit)
+
+    def order_stats(self, min_total=None, max_total=None):
+        conn = self._conn()
+        stats = {
+            "total": conn.execute("SELECT COUNT(*) FROM orders").fetchone()[0],
+            "by_status": dict(conn.execute("SELECT status, COUNT(*) FROM orders GROUP BY status").fetchall()),
+            "by_product": dict(conn.execute("SELECT product_id, COUNT(*) FROM orders GROUP BY product_id").fetchall()),
+        }
+        if min_total is not None or max_total is not None:
+            stats["in_total_range"] = conn.execute(
+                "SELECT COUNT(*) FROM orders WHERE total_price >= ? AND total_price <= ?",
+                (float("-inf") if min_total is None else min_total,
+                 float("inf") if max_total is None else max_total),
+            ).fetchone()[0]
+        return stats
+
+
+def create_store(backend=STORE_BACKEND):
+    if backend == "memory":
+        return MemoryStore()
+    if backend == "sqlite":
+        return SQLiteStore()
+    raise ValueError(f"Unknown MOCK_API_STORE backend: {backend}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load synthetic products into the SQLite store.")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=50_000)
+    args = parser.parse_args()
+
+    store = SQLiteStore(args.db)
+    first = store._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM products").fetchone()[0] + 1
+    start = time.perf_counter()
+    for offset in range(0, args.products, args.batch):
+        store.load_products(
+            {"id": f"p{n}", "name": f"Product {n}", "price": round(1 + (n * 7919) % 100000 / 100, 2), "stock": 100}
+            for n in range(first + offset, first + min(offset + args.batch, args.products))
+        )
+    print(f"Loaded {args.products} products into {args.db} in {time.perf_counter() - start:.1f}s")
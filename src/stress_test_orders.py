@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# Multithreaded stress test for order creation in mock_rest_api.py.
+#
+# Many threads race to order the same few products through POST /orders and
+# POST /orders/bulk. Afterwards every product's stock must equal its starting
+# stock minus the quantities of the orders that were accepted, and never drop
+# below zero. Exits with status 1 if any stock was oversold.
+#
+# Usage: python src/stress_test_orders.py [--threads 32] [--orders 200] [--stock 500] [--store sqlite]
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+
+def worker(app, product_ids, orders_per_thread, barrier, accepted, errors):
+    client = app.test_client()
+    barrier.wait()
+    for i in range(orders_per_thread):
+        product_id = product_ids[i % len(product_ids)]
+        try:
+            if i % 10 == 0:
+                # Mix in bulk requests so both creation paths race each other
+                response = client.post("/orders/bulk", json={"orders": [
+                    {"product_id": product_id, "quantity": 1},
+                    {"product_id": product_id, "quantity": 2},
+                ]})
+                for result in response.get_json()["results"]:
+                    if result["ok"]:
+                        accepted.append(result["order"])
+            else:
+                response = client.post("/orders", json={"product_id": product_id, "quantity": 1 + i % 3})
+                if response.status_code == 201:
+                    accepted.append(response.get_json())
+                elif response.status_code != 400:
+                    errors.append(f"unexpected status {response.status_code}")
+        except Exception as e:  # surface anything that escapes the handler
+            errors.append(repr(e))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stress test concurrent order creation for overselling.")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--orders", type=int, default=200, help="orders attempted per thread")
+    parser.add_argument("--stock", type=int, default=500, help="starting stock of each product")
+    parser.add_argument("--store", choices=("memory", "sqlite"), default="memory")
+    args = parser.parse_args()
+
+    # The store is chosen when mock_rest_api is imported; SQLite runs use a scratch database
+    os.environ["MOCK_API_STORE"] = args.store
+    os.environ["MOCK_API_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "stress.db")
+    import mock_rest_api
+    store = mock_rest_api.store
+
+    # Switch threads as often as possible to widen every check-then-act window
+    sys.setswitchinterval(1e-6)
+
+    product_ids = [product["id"] for product in store.list_products()[0]]
+    for product_id in product_ids:
+        store.set_stock(product_id, args.stock)
+    initial_orders = store.order_stats()["total"]
+
+    accepted, errors = [], []
+    barrier = threading.Barrier(args.threads)
+    threads = [
+        threading.Thread(target=worker, args=(mock_rest_api.app, product_ids, args.orders, barrier, accepted, errors))
+        for _ in range(args.threads)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    failures = list(errors)
+    for product_id in product_ids:
+        sold = sum(order["quantity"] for order in accepted if order["product_id"] == product_id)
+        stock = store.get_product(product_id)["stock"]
+        print(f"product {product_id}: sold {sold}, stock left {stock}")
+        if stock < 0 or sold + stock != args.stock:
+            failures.append(f"product {product_id} oversold: sold {sold} + left {stock} != {args.stock}")
+    stats = store.order_stats()
+    if stats["total"] - initial_orders != len(accepted):
+        failures.append("order store does not match the accepted orders")
+    if sum(stats["by_status"].values()) != stats["total"]:
+        failures.append("order indexes do not match the order store")
+
+    attempts = args.threads * args.orders
+    print(f"{attempts} requests from {args.threads} threads in {elapsed:.2f}s "
+          f"({attempts / elapsed:.0f} req/s), {len(accepted)} orders accepted")
+    if failures:
+        for failure in failures:
+            print(f"FAIL: {failure}")
+        sys.exit(1)
+    print("OK: no stock oversold")
+
+
+if __name__ == "__main__":
+    main()